@@ -0,0 +1,357 @@
+"""Running the benchmarks of the MdBOM pipeline.
+
+Every stage of the pipeline is timed separately on synthetic BOMs of
+different sizes and its peak memory usage is recorded. The results can
+be stored as baseline and later runs compared against it:
+
+    python -m benchmarks.run --components 1000 10000 --save
+    python -m benchmarks.run --components 1000 10000
+
+Timings depend on the machine, so they are stored relative to a fixed
+reference workload, which is timed within the same run, and the baseline
+can be compared on any machine. The peak memory usage depends on the
+Python version and the JSON backend instead, so the baseline should be
+regenerated with `--save` using the same ones as the comparing runs, as
+well as after intended changes of the pipeline.
+
+The startup of the CLI is benchmarked as well, by importing it in a new
+interpreter via `python -X importtime`.
+"""
+
+import argparse
+import json
+import logging
+import os
+import subprocess  # noqa: S404
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence, Tuple
+
+from benchmarks.synthetic import generate_bom, write_bom
+from mdbom.bom.processor import filter_packages_by_type, get_packages_from_bom
+from mdbom.bom.purl import parse_purl
+from mdbom.md.md import generate_markdown
+from mdbom.stats import (
+    EXTRACT_STAGE,
+    LOAD_STAGE,
+    URLS_STAGE,
+    Stats,
+    collect_stats,
+)
+
+BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+TEMPLATE = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "examples",
+    "template.md.jinja",
+)
+TOLERANCE = 0.5
+STARTUP = "startup"
+CLI_MODULE = "mdbom.mdbom"
+REFERENCE_COMPONENTS = 2000
+
+# The stages of extracting the packages, as recorded by their statistics.
+PACKAGE_STAGES = (LOAD_STAGE, EXTRACT_STAGE, URLS_STAGE)
+
+
+class StageResult(NamedTuple):
+    """The result of a single benchmarked stage."""
+
+    seconds: float
+    peak_bytes: int
+
+
+def run_benchmarks(
+    components: int,
+    repeat: int = 3,
+) -> Dict[str, StageResult]:
+    """Benchmark all stages of the pipeline.
+
+    Args:
+        components: The number of components of the synthetic BOM.
+        repeat: The number of runs per stage, the fastest one counts.
+
+    Returns:
+        The results per stage.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bom_file = os.path.join(temp_dir, "bom.json")
+        write_bom(bom_file, components=components)
+        results = _measure_packages(bom_file, repeat)
+        context: Dict[str, Any] = {
+            "packages": get_packages_from_bom(filepath=bom_file),
+            "dir": temp_dir,
+        }
+        for name, stage in _get_stages():
+            results[name] = _measure(stage, context, repeat)
+    return results
+
+
+def run_reference(repeat: int = 3) -> float:
+    """Time the reference workload, decoding and sorting a synthetic BOM.
+
+    The workload only depends on the machine and the Python interpreter,
+    not on MdBOM, so the timings of the stages relative to it can be
+    compared across machines.
+
+    Args:
+        repeat: The number of runs, the fastest one counts.
+
+    Returns:
+        The time of the workload in seconds.
+    """
+    content = json.dumps(generate_bom(REFERENCE_COMPONENTS))
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        components = json.loads(content)["components"]
+        sorted(
+            (component["name"].casefold(), component["version"])
+            for component in components
+        )
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def get_startup_imports(
+    arguments: Sequence[str] = ("--help",),
+) -> Dict[str, float]:
+    """Run the CLI in a new interpreter and record what it imports.
+
+    Args:
+        arguments: The command line arguments of the CLI.
+
+    Returns:
+        The cumulative import time in seconds per imported module.
+    """
+    code = "import sys; from {0} import cli; cli(sys.argv[1:])".format(
+        CLI_MODULE,
+    )
+    completed = subprocess.run(  # noqa: S603
+        [sys.executable, "-X", "importtime", "-c", code, *arguments],
+        capture_output=True,
+        text=True,
+    )
+    imports = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            imports[name.strip()] = int(cumulative) / 1e6
+    return imports
+
+
+def run_startup_benchmark(repeat: int = 3) -> Dict[str, StageResult]:
+    """Benchmark the import of the CLI.
+
+    Args:
+        repeat: The number of runs, the fastest one counts.
+
+    Returns:
+        The result of the import stage.
+    """
+    seconds = min(get_startup_imports()[CLI_MODULE] for _ in range(repeat))
+    return {"import": StageResult(seconds, 0)}
+
+
+def normalize(
+    results: Dict[str, Dict[str, StageResult]],
+    reference: float,
+) -> Dict[str, Dict[str, Dict[str, float]]]:
+    """Convert results into the machine independent form of the baseline.
+
+    Args:
+        results: The results per number of components and stage.
+        reference: The time of the reference workload in seconds, see
+            `run_reference`.
+
+    Returns:
+        The time of each stage relative to the reference workload and
+        its peak memory usage, per number of components and stage.
+    """
+    return {
+        components: {
+            name: {
+                "relative": result.seconds / reference,
+                "peak_bytes": result.peak_bytes,
+            }
+            for name, result in stages.items()
+        }
+        for components, stages in results.items()
+    }
+
+
+def compare(
+    results: Dict[str, Dict[str, Dict[str, float]]],
+    baseline: Dict[str, Dict[str, Dict[str, float]]],
+    tolerance: float = TOLERANCE,
+) -> List[str]:
+    """Compare normalized results against a baseline.
+
+    Args:
+        results: The results per number of components and stage, see
+            `normalize`.
+        baseline: The baseline in the same structure.
+        tolerance: The accepted relative slowdown or memory growth.
+
+    Returns:
+        A description of each regression.
+    """
+    regressions = []
+    for components, stages in results.items():
+        for name, result in stages.items():
+            expected = baseline.get(components, {}).get(name, {})
+            for field, actual in result.items():
+                limit = expected.get(field)
+                if limit is not None and actual > limit * (1 + tolerance):
+                    regressions.append(
+                        "{0} components, {1}: {2} {3:.4g} > {4:.4g}".format(
+                            components,
+                            name,
+                            field,
+                            actual,
+                            limit,
+                        ),
+                    )
+    return regressions
+
+
+def main(arguments: List[str]) -> int:
+    """Run the benchmarks from the command line.
+
+    Args:
+        arguments: The command line arguments.
+
+    Returns:
+        The exit code, non zero if a regression was detected.
+    """
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--components", type=int, nargs="+", default=[1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument(
+        "--save",
+        action="store_true",
+        help="Store the results as new baseline.",
+    )
+    options = parser.parse_args(arguments)
+    # Warnings are still created, but not printed in between the results.
+    logger = logging.getLogger("MdBOM")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+
+    reference = run_reference(options.repeat)
+    print(  # noqa: WPS421
+        "{0:>8} {1:<8} {2:>10.4f}s".format("", "reference", reference),
+    )
+    results = {}
+    for components in options.components:
+        results[str(components)] = run_benchmarks(components, options.repeat)
+    results[STARTUP] = run_startup_benchmark(options.repeat)
+    for components, stages in results.items():
+        for name, result in stages.items():
+            print(  # noqa: WPS421
+                "{0:>8} {1:<8} {2:>10.4f}s {3:>8.2f}x {4:>12,} bytes".format(
+                    components,
+                    name,
+                    result.seconds,
+                    result.seconds / reference,
+                    result.peak_bytes,
+                ),
+            )
+
+    normalized = normalize(results, reference)
+    if options.save:
+        baseline = _read_baseline(options.baseline)
+        baseline.update(normalized)
+        with open(options.baseline, "w") as baseline_file:
+            json.dump(baseline, baseline_file, indent=2, sort_keys=True)
+        return 0
+
+    regressions = compare(
+        normalized,
+        _read_baseline(options.baseline),
+        options.tolerance,
+    )
+    for regression in regressions:
+        print("Regression: {0}".format(regression))  # noqa: WPS421
+    return 1 if regressions else 0
+
+
+def _get_stages() -> List[Tuple[str, Callable[[Dict[str, Any]], Any]]]:
+    return [
+        (
+            "filter",
+            lambda context: filter_packages_by_type(
+                context["packages"],
+                "npm",
+            ),
+        ),
+        ("render", _render),
+    ]
+
+
+def _get_packages(bom_file: str, stats: Stats) -> Any:
+    # Every run resolves the URLs of all purls instead of the cached ones.
+    parse_purl.cache_clear()
+    return get_packages_from_bom(filepath=bom_file, stats=stats)
+
+
+def _measure_packages(bom_file: str, repeat: int) -> Dict[str, StageResult]:
+    timings: Dict[str, List[float]] = {name: [] for name in PACKAGE_STAGES}
+    for _ in range(repeat):
+        stats = Stats()
+        _get_packages(bom_file, stats)
+        for name in PACKAGE_STAGES:
+            timings[name].append(stats.stages[name].wall_seconds)
+    stats = Stats()
+    with collect_stats(stats):
+        _get_packages(bom_file, stats)
+    return {
+        name: StageResult(min(timings[name]), stats.stages[name].peak_bytes)
+        for name in PACKAGE_STAGES
+    }
+
+
+def _render(context: Dict[str, Any]) -> Any:
+    generate_markdown(
+        template=TEMPLATE,
+        file_name=os.path.join(context["dir"], "3rd-party.md"),
+        packages=context["packages"],
+        cache_dir="",
+    )
+
+
+def _measure(
+    stage: Callable[[Dict[str, Any]], Any],
+    context: Dict[str, Any],
+    repeat: int,
+) -> StageResult:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        stage(context)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        stage(context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return StageResult(min(timings), peak)
+
+
+def _read_baseline(filename: str) -> Dict[str, Any]:
+    try:
+        with open(filename, "r") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
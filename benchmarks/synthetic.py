@@ -0,0 +1,148 @@
+"""Generating synthetic CycloneDX BOMs.
+
+The generated BOMs mimic real world SBOMs: a mix of ecosystems and
+licenses, hashes for every component, a few components without purl or
+license information and a dependency graph.
+"""
+
+import json
+import random
+from typing import Any, Dict, Iterator, List, Tuple
+
+SEED = 87
+
+# Weighted purl types together with the purl pattern of the type.
+PURL_TYPES: List[Tuple[str, int, str]] = [
+    ("npm", 40, "pkg:npm/{name}@{version}"),
+    ("pypi", 20, "pkg:pypi/{name}@{version}"),
+    ("golang", 15, "pkg:golang/github.com/{name}/{name}@v{version}"),
+    ("maven", 15, "pkg:maven/org.{name}/{name}@{version}"),
+    ("cargo", 5, "pkg:cargo/{name}@{version}"),
+    ("generic", 4, "pkg:generic/{name}@{version}?download_url=x"),
+    ("", 1, ""),
+]
+
+# Weighted licenses, None stands for a component without license.
+LICENSES: List[Tuple[Any, int]] = [
+    ({"id": "MIT"}, 40),
+    ({"id": "Apache-2.0"}, 25),
+    ({"id": "BSD-3-Clause"}, 10),
+    ({"id": "ISC"}, 8),
+    ({"id": "GPL-3.0-only"}, 4),
+    ({"name": "Apache Software License"}, 5),
+    ({"name": "Mozilla Public License 2.0 (MPL 2.0)"}, 3),
+    (None, 5),
+]
+
+_HEADER = {
+    "bomFormat": "CycloneDX",
+    "specVersion": "1.4",
+    "version": 1,
+    "metadata": {"component": {"bom-ref": "root", "name": "root"}},
+}
+
+
+def generate_bom(components: int, seed: int = SEED) -> Dict[str, Any]:
+    """Generate a synthetic BOM.
+
+    Args:
+        components: The number of components of the BOM.
+        seed: The seed for the random generator, the same seed always
+            results in the same BOM.
+
+    Returns:
+        The BOM.
+    """
+    bom = dict(_HEADER)
+    bom["components"] = list(iter_components(components, seed))
+    bom["dependencies"] = list(iter_dependencies(components, seed))
+    return bom
+
+
+def write_bom(filename: str, components: int, seed: int = SEED) -> None:
+    """Write a synthetic BOM to a file, one component at a time.
+
+    Args:
+        filename: The file to write the BOM to.
+        components: The number of components of the BOM.
+        seed: The seed for the random generator.
+    """
+    with open(filename, "w") as bom_file:
+        bom_file.write(json.dumps(_HEADER)[:-1])
+        for key, values in (
+            ("components", iter_components(components, seed)),
+            ("dependencies", iter_dependencies(components, seed)),
+        ):
+            bom_file.write(', "{0}": ['.format(key))
+            for index, value in enumerate(values):
+                if index:
+                    bom_file.write(", ")
+                bom_file.write(json.dumps(value))
+            bom_file.write("]")
+        bom_file.write("}")
+
+
+def iter_components(components: int, seed: int = SEED) -> Iterator[Any]:
+    """Generate synthetic components.
+
+    Args:
+        components: The number of components.
+        seed: The seed for the random generator.
+
+    Yields:
+        One component at a time.
+    """
+    rng = random.Random(seed)
+    purl_weights = [weight for _, weight, _ in PURL_TYPES]
+    license_weights = [weight for _, weight in LICENSES]
+    for index in range(components):
+        name = "package-{0}".format(index)
+        version = "{0}.{1}.{2}".format(
+            rng.randrange(10),
+            rng.randrange(30),
+            rng.randrange(100),
+        )
+        component: Dict[str, Any] = {
+            "bom-ref": name,
+            "type": "library",
+            "name": name,
+            "version": version,
+            "hashes": [
+                {"alg": alg, "content": "{0:064x}".format(rng.getrandbits(256))}
+                for alg in ("SHA-256", "SHA-512")
+            ],
+        }
+        pattern = rng.choices(PURL_TYPES, weights=purl_weights)[0][2]
+        if pattern:
+            component["purl"] = pattern.format(name=name, version=version)
+        license_entry = rng.choices(LICENSES, weights=license_weights)[0][0]
+        if license_entry is not None:
+            component["licenses"] = [{"license": license_entry}]
+        yield component
+
+
+def iter_dependencies(components: int, seed: int = SEED) -> Iterator[Any]:
+    """Generate a synthetic dependency graph.
+
+    Args:
+        components: The number of components.
+        seed: The seed for the random generator.
+
+    Yields:
+        The dependencies of one component at a time.
+    """
+    rng = random.Random(seed + 1)
+    yield {
+        "ref": "root",
+        "dependsOn": [
+            "package-{0}".format(index) for index in range(min(components, 10))
+        ],
+    }
+    for index in range(components):
+        yield {
+            "ref": "package-{0}".format(index),
+            "dependsOn": [
+                "package-{0}".format(rng.randrange(components))
+                for _ in range(rng.randrange(4))
+            ],
+        }
@@ -0,0 +1,299 @@
+"""Handling batches of generation jobs.
+
+A manifest lists many jobs, each rendering a template for a BOM, which
+are run within a single process or a pool of worker processes. Every
+worker keeps the compiled templates in memory, so templates shared by
+several jobs are only compiled once per worker, and the jobs do not pay
+the startup of a new process each.
+"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Any, Iterator, List, NamedTuple
+
+from jinja2 import TemplateError
+
+from mdbom.bom.bom import ProcessingError
+from mdbom.bom.decoding import AUTO_BACKEND
+from mdbom.bom.diagnostics import Diagnostics, collect_diagnostics
+from mdbom.bom.processor import (
+    deduplicate_packages,
+    filter_packages_by_type,
+    get_packages_from_bom,
+)
+from mdbom.md.md import GeneratingError, generate_markdown
+
+JOBS_ID = "jobs"
+INPUT_ID = "input"
+TEMPLATE_ID = "template"
+OUTPUT_ID = "output"
+TYPE_ID = "type"
+DEDUPLICATE_ID = "deduplicate"
+YAML_EXTENSIONS = frozenset((".yaml", ".yml"))
+
+_REQUIRED_KEYS = (INPUT_ID, TEMPLATE_ID, OUTPUT_ID)
+_KNOWN_KEYS = frozenset((*_REQUIRED_KEYS, TYPE_ID, DEDUPLICATE_ID))
+# The expected errors of a job, reported by their message only.
+_JOB_ERRORS = (GeneratingError, ProcessingError, OSError, TemplateError)
+
+logger = logging.getLogger("MdBOM")
+
+
+class BatchJob(NamedTuple):
+    """A single job of a batch."""
+
+    input_path: str
+    template: str
+    output: str
+    package_type: str = ""
+    deduplicate: bool = False
+
+
+class JobResult(NamedTuple):
+    """The outcome of a single job of a batch."""
+
+    job: BatchJob
+    error: str = ""
+    skipped: int = 0
+    seconds: float = 0
+    issues: int = 0
+
+    @property
+    def failed(self) -> bool:
+        """Whether the job failed.
+
+        Returns:
+            True if the output could not be generated.
+        """
+        return bool(self.error)
+
+
+def load_manifest(filename: str) -> List[BatchJob]:
+    """Load the jobs of a manifest.
+
+    The manifest is a JSON or YAML file, based on its extension, which
+    contains a list of jobs, optionally as `jobs` of a mapping. Each job
+    has an `input`, a `template` and an `output` as well as an optional
+    `type` filter and a `deduplicate` flag. Relative paths are relative
+    to the directory of the manifest.
+
+    Args:
+        filename: The path to the manifest.
+
+    Returns:
+        The jobs.
+
+    Raises:
+        ProcessingError: If the manifest cannot be read or is invalid.
+    """
+    try:
+        with open(filename, "rb") as read_file:
+            content = _decode_manifest(read_file.read(), filename)
+    except OSError as error:
+        raise ProcessingError(
+            "Cannot read manifest: {0}".format(error.strerror),
+            source=filename,
+        )
+    except ValueError as error:
+        raise ProcessingError(
+            "Invalid manifest: {0}".format(error),
+            source=filename,
+        )
+    if isinstance(content, dict):
+        content = content.get(JOBS_ID)
+    if not isinstance(content, list):
+        raise ProcessingError("Manifest contains no jobs", source=filename)
+    base_dir = os.path.dirname(os.path.abspath(filename))
+    return [
+        _create_job(entry, position, base_dir, filename)
+        for position, entry in enumerate(content, start=1)
+    ]
+
+
+def run_jobs(
+    jobs: List[BatchJob],
+    workers: int = 1,
+    json_backend: str = AUTO_BACKEND,
+) -> Iterator[JobResult]:
+    """Run the jobs of a batch.
+
+    Failing jobs do not stop the others, their error is reported as part
+    of their result instead.
+
+    Args:
+        jobs: The jobs to run.
+        workers: The number of worker processes, jobs are run within this
+            process if only one is requested.
+        json_backend: The backend decoding the BOM files.
+
+    Yields:
+        The result of each job, in the order of the jobs.
+    """
+    run = partial(run_job, json_backend=json_backend)
+    if workers <= 1 or len(jobs) <= 1:
+        yield from map(run, jobs)
+        return
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(run, jobs)
+
+
+def run_job(job: BatchJob, json_backend: str = AUTO_BACKEND) -> JobResult:
+    """Run a single job of a batch.
+
+    Errors of the job are reported as part of its result instead of
+    being raised.
+
+    Args:
+        job: The job to run.
+        json_backend: The backend decoding the BOM files.
+
+    Returns:
+        The result of the job.
+    """
+    start = time.perf_counter()
+    errors: List[ProcessingError] = []
+    error = ""
+    diagnostics = Diagnostics()
+    try:
+        with collect_diagnostics(diagnostics):
+            _generate(job, errors, json_backend)
+    except _JOB_ERRORS as job_error:
+        error = str(job_error) or repr(job_error)
+    except Exception as job_error:
+        # Any other error only fails its job as well, but is logged in full.
+        logger.exception("Job for %s failed", job.output)
+        error = repr(job_error)
+    return JobResult(
+        job,
+        error,
+        len(errors),
+        time.perf_counter() - start,
+        diagnostics.total,
+    )
+
+
+def format_result(result: JobResult) -> str:
+    """Format the result of a job as a single line.
+
+    Args:
+        result: The result of the job.
+
+    Returns:
+        The status and output of the job, followed by its error if any.
+    """
+    line = "{0:<6} {1} ({2:.2f}s)".format(
+        "FAILED" if result.failed else "OK",
+        result.job.output,
+        result.seconds,
+    )
+    if result.skipped:
+        line = "{0}, skipped {1} BOM file(s)".format(line, result.skipped)
+    if result.issues:
+        line = "{0}, {1} purl issue(s)".format(line, result.issues)
+    if result.failed:
+        line = "{0}: {1}".format(line, result.error)
+    return line
+
+
+def format_summary(results: List[JobResult]) -> str:
+    """Summarize the results of a batch.
+
+    Args:
+        results: The results of the jobs.
+
+    Returns:
+        The number of succeeded and failed jobs.
+    """
+    failed = sum(1 for result in results if result.failed)
+    return "{0} of {1} jobs succeeded, {2} failed".format(
+        len(results) - failed,
+        len(results),
+        failed,
+    )
+
+
+def _generate(
+    job: BatchJob,
+    errors: List[ProcessingError],
+    json_backend: str,
+) -> None:
+    packages = get_packages_from_bom(
+        filepath=job.input_path,
+        errors=errors,
+        json_backend=json_backend,
+    )
+    if job.deduplicate:
+        packages = deduplicate_packages(packages)
+    generate_markdown(
+        template=job.template,
+        file_name=job.output,
+        packages=filter_packages_by_type(packages, job.package_type),
+    )
+
+
+def _decode_manifest(content: bytes, filename: str) -> Any:
+    if os.path.splitext(filename)[1].lower() not in YAML_EXTENSIONS:
+        return json.loads(content)
+    try:
+        import yaml  # noqa: WPS433
+    except ImportError:
+        raise ProcessingError(
+            "Reading YAML manifests requires the PyYAML package",
+            source=filename,
+        )
+    try:
+        return yaml.safe_load(content)
+    except yaml.YAMLError as error:
+        raise ValueError(str(error))
+
+
+def _create_job(
+    entry: Any,
+    position: int,
+    base_dir: str,
+    filename: str,
+) -> BatchJob:
+    if not isinstance(entry, dict):
+        raise ProcessingError(
+            "Job {0} is not a mapping".format(position),
+            source=filename,
+        )
+    missing = [key for key in _REQUIRED_KEYS if not entry.get(key)]
+    unknown = sorted(set(entry) - _KNOWN_KEYS)
+    if missing or unknown:
+        raise ProcessingError(
+            "Job {0} has {1}".format(
+                position,
+                _describe_keys(missing, unknown),
+            ),
+            source=filename,
+        )
+    deduplicate = entry.get(DEDUPLICATE_ID, False)
+    if not isinstance(deduplicate, bool):
+        raise ProcessingError(
+            "Job {0} has a non-boolean deduplicate".format(position),
+            source=filename,
+        )
+    package_type = entry.get(TYPE_ID) or ""
+    if isinstance(package_type, list):
+        package_type = ",".join(package_type)
+    return BatchJob(
+        input_path=os.path.join(base_dir, str(entry[INPUT_ID])),
+        template=os.path.join(base_dir, str(entry[TEMPLATE_ID])),
+        output=os.path.join(base_dir, str(entry[OUTPUT_ID])),
+        package_type=str(package_type),
+        deduplicate=deduplicate,
+    )
+
+
+def _describe_keys(missing: List[str], unknown: List[str]) -> str:
+    descriptions: List[str] = []
+    if missing:
+        descriptions.append("no {0}".format(", ".join(missing)))
+    if unknown:
+        descriptions.append("unknown keys {0}".format(", ".join(unknown)))
+    return " and ".join(descriptions)
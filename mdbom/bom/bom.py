@@ -1,11 +1,28 @@
 """General stuff for handling BOM files."""
 
-from typing import NamedTuple
+from typing import NamedTuple, Optional, Tuple, Union
+
+from mdbom.bom.purl import PURL, parse_purl
+
+Buffer = Union[bytes, memoryview]
 
 
 class ProcessingError(RuntimeError):
     """Processing error for raising processing specific errors."""
 
+    def __init__(self, message: str = "", source: str = "") -> None:
+        """Create a new processing error.
+
+        Args:
+            message: The error message.
+            source: The BOM file the error is related to, if any.
+        """
+        super().__init__(message)
+        self.source = source
+
+    def __reduce__(self):
+        return (self.__class__, (str(self), self.source))
+
 
 class Package(NamedTuple):
     """A representation of a package."""
@@ -16,3 +33,48 @@ class Package(NamedTuple):
     licenses: str
     purl: str
     url: str
+    sources: Tuple[str, ...] = ()
+    depth: Optional[int] = None
+
+    @property
+    def direct(self) -> bool:
+        """Whether the package is a direct dependency.
+
+        Returns:
+            True if the package has a depth of 1 in the dependency graph.
+        """
+        return self.depth == 1
+
+    @property
+    def parsed_purl(self) -> Optional[PURL]:
+        """The parsed purl of the package.
+
+        Returns:
+            The parsed purl or None if the package has no valid purl.
+        """
+        return parse_purl(self.purl)
+
+    @property
+    def purl_type(self) -> str:
+        """The type of the package according to its purl.
+
+        Returns:
+            The purl type or an empty string if the purl is not valid.
+        """
+        parsed_purl = parse_purl(self.purl)
+        return parsed_purl.kind if parsed_purl is not None else ""
+
+
+def get_name_key(package: Package) -> Tuple[str, str, str]:
+    """Get the key sorting packages by name and version.
+
+    Names are sorted case-insensitively, like by the `sort` filter of
+    Jinja, and names only differing in case by their exact spelling.
+
+    Args:
+        package: The package.
+
+    Returns:
+        The key of the package.
+    """
+    return package.name.casefold(), package.name, package.version
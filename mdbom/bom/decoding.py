@@ -0,0 +1,98 @@
+"""Handling the JSON decoding of BOM files.
+
+BOM files are decoded from bytes by one of several backends. Faster
+third party decoders are used if they are installed, otherwise the
+`json` module of the standard library is used. Backends which accept
+any buffer, like a memory mapped file, decode it without a copy.
+"""
+
+import codecs
+from functools import lru_cache, partial
+from importlib import import_module
+from typing import Any, Callable, Dict
+
+from mdbom.bom.bom import Buffer, ProcessingError
+
+AUTO_BACKEND = "auto"
+STDLIB_BACKEND = "json"
+
+# The backends in the order of preference, mapped to their modules.
+json_backends: Dict[str, str] = {
+    "orjson": "orjson",
+    "ujson": "ujson",
+    "simdjson": "simdjson",
+    STDLIB_BACKEND: "json",
+}
+# The backends decoding a memoryview without converting it to bytes.
+buffer_backends = frozenset(("orjson",))
+
+
+def decode_json(content: Buffer, backend: str = AUTO_BACKEND) -> Any:
+    """Decode a JSON document.
+
+    Args:
+        content: The UTF-8 encoded document, optionally starting with a
+            byte order mark.
+        backend: The name of the backend or "auto" for the fastest one
+            available.
+
+    Returns:
+        The decoded document.
+
+    Raises:
+        ValueError: If the document is not valid JSON.
+    """
+    if content[: len(codecs.BOM_UTF8)] == codecs.BOM_UTF8:
+        content = content[len(codecs.BOM_UTF8) :]
+    return get_json_decoder(backend)(content)
+
+
+@lru_cache(maxsize=None)
+def get_json_decoder(backend: str = AUTO_BACKEND) -> Callable[[Buffer], Any]:
+    """Get the decoding function of a backend.
+
+    Args:
+        backend: The name of the backend or "auto" for the fastest one
+            available.
+
+    Returns:
+        A function decoding a JSON document from bytes or a buffer.
+
+    Raises:
+        ProcessingError: If the backend is unknown or not installed.
+    """
+    if backend == AUTO_BACKEND:
+        for name in json_backends:
+            if is_json_backend_available(name):
+                return get_json_decoder(name)
+    if backend not in json_backends:
+        raise ProcessingError("Unknown JSON backend: {0}".format(backend))
+    try:
+        module = import_module(json_backends[backend])
+    except ImportError:
+        raise ProcessingError(
+            "JSON backend {0} is not installed".format(backend),
+        )
+    if backend in buffer_backends:
+        return module.loads
+    return partial(_decode_bytes, module.loads)
+
+
+def is_json_backend_available(backend: str) -> bool:
+    """Check whether a backend is installed.
+
+    Args:
+        backend: The name of the backend.
+
+    Returns:
+        True if the backend can be used.
+    """
+    try:
+        get_json_decoder(backend)
+    except ProcessingError:
+        return False
+    return True
+
+
+def _decode_bytes(loads: Callable[[bytes], Any], content: Buffer) -> Any:
+    return loads(bytes(content))
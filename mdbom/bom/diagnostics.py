@@ -0,0 +1,237 @@
+"""Handling the diagnostics of purls.
+
+Issues with the purls of components, like invalid purls or purl types
+without URL support, are reported per component. While a `Diagnostics`
+collector is active, the issues are counted by category and purl type
+instead of being logged one by one. Only the first few issues of each
+kind are logged, and the collector summarizes all of them at the end of
+a run. Without an active collector, every issue is logged.
+
+Messages are only formatted when they are logged or summarized, so the
+issues of tens of thousands of components cost little more than a count.
+"""
+
+import logging
+import sys
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+INVALID_PURL = "invalid_purl"
+INCOMPLETE_PURL = "incomplete_purl"
+UNSUPPORTED_TYPE = "unsupported_type"
+
+# Warnings are attributed to the module reporting the issue, which needs
+# the stacklevel of Python 3.8, otherwise they are attributed to this one.
+_CALLER_OPTIONS: Dict[str, Any] = (
+    {"stacklevel": 2} if sys.version_info >= (3, 8) else {}
+)
+
+WARNING_LIMIT = 3
+EXAMPLE_LIMIT = 5
+
+# The descriptions of the categories within the summary.
+categories = {
+    INVALID_PURL: "invalid purl",
+    INCOMPLETE_PURL: "purl without name or version",
+    UNSUPPORTED_TYPE: "purl type without URL support",
+}
+
+logger = logging.getLogger("MdBOM")
+
+_Key = Tuple[str, str]
+
+_active: List["Diagnostics"] = []
+_active_lock = threading.Lock()
+
+
+class Diagnostics(object):
+    """Counts the purl issues of a run by category and purl type."""
+
+    def __init__(
+        self,
+        warning_limit: int = WARNING_LIMIT,
+        example_limit: Optional[int] = EXAMPLE_LIMIT,
+    ) -> None:
+        """Create an empty collector.
+
+        Args:
+            warning_limit: The number of issues logged per category and
+                purl type, further issues are only counted.
+            example_limit: The number of purls kept per category and purl
+                type, None keeps all of them.
+        """
+        self.warning_limit = warning_limit
+        self.example_limit = example_limit
+        self.counts: Dict[_Key, int] = {}
+        self.examples: Dict[_Key, List[str]] = {}
+        self._lock = threading.Lock()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state.pop("_lock")
+        return state
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    @property
+    def total(self) -> int:
+        """The number of issues.
+
+        Returns:
+            The number of issues of all categories and purl types.
+        """
+        return sum(self.counts.values())
+
+    def spawn(self) -> "Diagnostics":
+        """Create an empty collector with the same limits.
+
+        Returns:
+            The new collector, e.g. for a worker process.
+        """
+        return Diagnostics(self.warning_limit, self.example_limit)
+
+    def add(self, category: str, purl: str, purl_type: str = "") -> bool:
+        """Count an issue.
+
+        Args:
+            category: The category of the issue, e.g. "invalid_purl".
+            purl: The purl of the component.
+            purl_type: The type of the purl, if it is valid.
+
+        Returns:
+            True if the issue should still be logged.
+        """
+        key = (category, purl_type)
+        with self._lock:
+            issues = self.counts.get(key, 0) + 1
+            self.counts[key] = issues
+            examples = self.examples.setdefault(key, [])
+            if self.example_limit is None or len(examples) < self.example_limit:
+                examples.append(purl)
+        return issues <= self.warning_limit
+
+    def merge(self, other: "Diagnostics") -> None:
+        """Add the issues collected by another collector.
+
+        Args:
+            other: The collector, e.g. of a worker process.
+        """
+        with self._lock:
+            for key, issues in other.counts.items():
+                self.counts[key] = self.counts.get(key, 0) + issues
+                examples = self.examples.setdefault(key, [])
+                examples.extend(other.examples.get(key, []))
+                if self.example_limit is not None:
+                    del examples[self.example_limit :]  # noqa: WPS420
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the issues into a JSON serializable report.
+
+        Returns:
+            The total number of issues and the issues per category and
+            purl type, sorted by their number.
+        """
+        return {
+            "total": self.total,
+            "issues": [
+                {
+                    "category": category,
+                    "purl_type": purl_type,
+                    "count": issues,
+                    "purls": self.examples.get((category, purl_type), []),
+                }
+                for (category, purl_type), issues in self._sorted_counts()
+            ],
+        }
+
+    def format(self, example_limit: int = EXAMPLE_LIMIT) -> str:
+        """Summarize the issues.
+
+        Args:
+            example_limit: The number of purls listed per category and
+                purl type.
+
+        Returns:
+            One line per category and purl type, or an empty string if
+            there are no issues.
+        """
+        if not self.counts:
+            return ""
+        lines = ["{0} purl issue(s):".format(self.total)]
+        for (category, purl_type), issues in self._sorted_counts():
+            examples = self.examples.get((category, purl_type), [])
+            line = "  {0:>7} {1}{2}".format(
+                issues,
+                categories.get(category, category),
+                " ({0})".format(purl_type) if purl_type else "",
+            )
+            if examples and example_limit > 0:
+                line = "{0}, e.g. {1}".format(
+                    line,
+                    ", ".join(repr(purl) for purl in examples[:example_limit]),
+                )
+            lines.append(line)
+        return "\n".join(lines)
+
+    def _sorted_counts(self) -> List[Tuple[_Key, int]]:
+        return sorted(self.counts.items(), key=lambda item: (-item[1], item[0]))
+
+
+@contextmanager
+def collect_diagnostics(
+    diagnostics: Optional[Diagnostics],
+) -> Iterator[Optional[Diagnostics]]:
+    """Collect the purl issues reported within the context.
+
+    Args:
+        diagnostics: The collector, nothing is collected if it is None.
+
+    Yields:
+        The collector.
+    """
+    if diagnostics is None:
+        yield None
+        return
+    with _active_lock:
+        _active.append(diagnostics)
+    try:
+        yield diagnostics
+    finally:
+        with _active_lock:
+            _active.remove(diagnostics)
+
+
+def get_diagnostics() -> Optional[Diagnostics]:
+    """Get the active collector.
+
+    Returns:
+        The most recently activated collector or None.
+    """
+    return _active[-1] if _active else None
+
+
+def report_issue(
+    category: str,
+    message: str,
+    purl: str,
+    purl_type: str = "",
+) -> None:
+    """Report an issue with the purl of a component.
+
+    Args:
+        category: The category of the issue, e.g. "invalid_purl".
+        message: The warning to log, which can refer to `%(purl)s` and
+            `%(purl_type)s`. It is only formatted if it is logged.
+        purl: The purl of the component.
+        purl_type: The type of the purl, if it is valid.
+    """
+    diagnostics = get_diagnostics()
+    if diagnostics is None or diagnostics.add(category, purl, purl_type):
+        logger.warning(
+            message,
+            {"purl": purl, "purl_type": purl_type},
+            **_CALLER_OPTIONS,
+        )
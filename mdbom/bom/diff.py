@@ -0,0 +1,162 @@
+"""Handling the differences between two sets of packages.
+
+Packages are matched by their identity, which is the purl type and the
+package of their purl without the version, or the kind and name of the
+package without a valid purl. Both sets are indexed by hash instead of
+comparing every pair of packages. The old packages and the packages
+which differ are kept in memory, while only the identity and version of
+every other new package are kept, so the new packages can be streamed
+from very large BOMs, though the memory still grows with their number.
+"""
+
+from typing import Dict, Iterable, List, NamedTuple, Set, Tuple
+
+from mdbom.bom.bom import Package, get_name_key
+from mdbom.bom.licenses import split_licenses
+
+_Identity = Tuple[str, str]
+
+
+class PackageChange(NamedTuple):
+    """A package which is part of both sets, but changed."""
+
+    old: Package
+    new: Package
+
+    @property
+    def name(self) -> str:
+        """The name of the package.
+
+        Returns:
+            The name within the new set.
+        """
+        return self.new.name
+
+    @property
+    def version_changed(self) -> bool:
+        """Whether the version changed.
+
+        Returns:
+            True if the package was upgraded or downgraded.
+        """
+        return self.old.version != self.new.version
+
+    @property
+    def licenses_changed(self) -> bool:
+        """Whether the licenses changed.
+
+        Returns:
+            True if a license was added or removed, regardless of their
+            order.
+        """
+        return set(split_licenses(self.old.licenses)) != set(
+            split_licenses(self.new.licenses),
+        )
+
+
+class PackageDiff(NamedTuple):
+    """The differences between two sets of packages."""
+
+    added: List[Package]
+    removed: List[Package]
+    changed: List[PackageChange]
+
+    @property
+    def upgraded(self) -> List[PackageChange]:
+        """The packages whose version changed.
+
+        Returns:
+            The changes of the packages with a new version.
+        """
+        return [change for change in self.changed if change.version_changed]
+
+    @property
+    def license_changed(self) -> List[PackageChange]:
+        """The packages whose licenses changed.
+
+        Returns:
+            The changes of the packages with new licenses.
+        """
+        return [change for change in self.changed if change.licenses_changed]
+
+
+def diff_packages(
+    old_packages: Iterable[Package],
+    new_packages: Iterable[Package],
+) -> PackageDiff:
+    """Compare two sets of packages.
+
+    A package of the new set is added if no package with its identity is
+    part of the old set, and removed the other way round. If exactly one
+    version of an identity only occurs in each set, both are paired as an
+    upgrade, e.g. if a package is updated from 1.0 to 2.0. Otherwise the
+    versions cannot be paired reliably, so they count as added or
+    removed. Packages with the same identity and version have changed if
+    their licenses differ. Each identity and version is only considered
+    once per set.
+
+    Args:
+        old_packages: The packages of the old set, which are indexed.
+        new_packages: The packages of the new set, which are iterated
+            once, e.g. lazily from a BOM.
+
+    Returns:
+        The added, removed and changed packages, sorted by name and
+        version.
+    """
+    old_index: Dict[_Identity, Dict[str, Package]] = {}
+    for package in old_packages:
+        versions = old_index.setdefault(_get_identity(package), {})
+        versions.setdefault(package.version, package)
+
+    seen: Set[Tuple[_Identity, str]] = set()
+    unmatched: Dict[_Identity, Dict[str, Package]] = {}
+    changed: List[PackageChange] = []
+    for package in new_packages:
+        identity = _get_identity(package)
+        if (identity, package.version) in seen:
+            continue
+        seen.add((identity, package.version))
+        old_package = old_index.get(identity, {}).get(package.version)
+        if old_package is None:
+            unmatched.setdefault(identity, {})[package.version] = package
+        elif PackageChange(old_package, package).licenses_changed:
+            changed.append(PackageChange(old_package, package))
+
+    added: List[Package] = []
+    removed: List[Package] = []
+    for identity, old_versions in old_index.items():
+        old_remaining = [
+            old_versions[version]
+            for version in sorted(old_versions)
+            if (identity, version) not in seen
+        ]
+        new_remaining = _pop_sorted(unmatched, identity)
+        if len(old_remaining) == 1 and len(new_remaining) == 1:
+            changed.append(PackageChange(old_remaining[0], new_remaining[0]))
+        else:
+            removed.extend(old_remaining)
+            added.extend(new_remaining)
+    for identity in list(unmatched):
+        added.extend(_pop_sorted(unmatched, identity))
+
+    return PackageDiff(
+        sorted(added, key=get_name_key),
+        sorted(removed, key=get_name_key),
+        sorted(changed, key=lambda change: get_name_key(change.new)),
+    )
+
+
+def _get_identity(package: Package) -> _Identity:
+    parsed_purl = package.parsed_purl
+    if parsed_purl is not None:
+        return parsed_purl.kind, parsed_purl.package
+    return package.kind, package.name
+
+
+def _pop_sorted(
+    packages: Dict[_Identity, Dict[str, Package]],
+    identity: _Identity,
+) -> List[Package]:
+    versions = packages.pop(identity, {})
+    return [versions[version] for version in sorted(versions)]
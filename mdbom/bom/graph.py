@@ -0,0 +1,82 @@
+"""Handling the structure of BOM components.
+
+Components can be nested within other components and are related by
+the dependency graph of the BOM. Both are traversed iteratively, so
+arbitrarily deep structures do not hit the recursion limit.
+"""
+
+from collections import deque
+from typing import Any, Dict, Iterable, Iterator, List
+
+COMPONENTS_ID = "components"
+DEPENDENCIES_ID = "dependencies"
+DEPENDS_ON_ID = "dependsOn"
+METADATA_ID = "metadata"
+COMPONENT_ID = "component"
+BOM_REF_ID = "bom-ref"
+REF_ID = "ref"
+
+
+def iter_nested_components(
+    components: Iterable[Dict[Any, Any]],
+) -> Iterator[Dict[Any, Any]]:
+    """Iterate over components including their nested components.
+
+    Every component is followed by its nested components, before its
+    next sibling, i.e. the components are returned in document order.
+
+    Args:
+        components: The top level components.
+
+    Yields:
+        All components.
+    """
+    pending: List[Iterator[Dict[Any, Any]]] = [iter(components)]
+    while pending:
+        for component in pending[-1]:
+            yield component
+            nested = component.get(COMPONENTS_ID)
+            if nested:
+                pending.append(iter(nested))
+                break
+        else:
+            pending.pop()
+
+
+def get_dependency_depths(content: Dict[Any, Any]) -> Dict[str, int]:
+    """Get the depth of each component within the dependency graph.
+
+    The depth is the length of the shortest path from the root of the
+    graph, which is the component described by the metadata of the BOM.
+    Its direct dependencies have a depth of 1, transitive dependencies a
+    larger one. If the root is not part of the graph, components no
+    other component depends on are considered direct dependencies.
+
+    Args:
+        content: The BOM.
+
+    Returns:
+        The depths by the reference of the components, components which
+        are not reachable are missing.
+    """
+    graph: Dict[str, List[str]] = {}
+    for dependency in content.get(DEPENDENCIES_ID) or []:
+        graph[dependency[REF_ID]] = dependency.get(DEPENDS_ON_ID) or []
+    if not graph:
+        return {}
+    metadata = content.get(METADATA_ID) or {}
+    root = (metadata.get(COMPONENT_ID) or {}).get(BOM_REF_ID)
+    if root in graph:
+        depths = {root: 0}
+    else:
+        dependents = {ref for refs in graph.values() for ref in refs}
+        depths = {ref: 1 for ref in graph if ref not in dependents}
+    pending = deque(depths)
+    while pending:
+        ref = pending.popleft()
+        depth = depths[ref] + 1
+        for dependency_ref in graph.get(ref, ()):
+            if dependency_ref not in depths:
+                depths[dependency_ref] = depth
+                pending.append(dependency_ref)
+    return depths
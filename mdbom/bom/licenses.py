@@ -0,0 +1,202 @@
+"""Handling the licenses of packages.
+
+The licenses of a package are kept as a single string, joining the SPDX
+ids or names of its licenses by commas. The joined strings are interned
+while extracting the packages, so thousands of packages sharing licenses
+share a single string. Splitting them again into interned license keys
+is cached per distinct string.
+
+A `LicenseIndex` maps each license to the packages using it, e.g. for a
+NOTICE listing every license text only once. The texts are read from a
+directory containing one file per license, named after its SPDX id or
+name, e.g. `MIT.txt` or `Apache-2.0`.
+"""
+
+import os
+import sys
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+from mdbom.bom.bom import Package, ProcessingError, get_name_key
+
+UNKNOWN_LICENSE = "unknown"
+LICENSES_SEPARATOR = ","
+LICENSES_CACHE_SIZE = 1 << 12
+
+
+class License(NamedTuple):
+    """A license together with the packages using it."""
+
+    key: str
+    packages: List[Package]
+    text: str = ""
+
+
+class LicenseTexts(object):
+    """Reads the texts of licenses from a directory."""
+
+    def __init__(self, directory: str) -> None:
+        """Index the license files of a directory.
+
+        Args:
+            directory: The directory containing one file per license,
+                named after the license with an optional extension.
+
+        Raises:
+            ProcessingError: If the directory cannot be read.
+        """
+        try:
+            file_names = sorted(os.listdir(directory))
+        except OSError as error:
+            raise ProcessingError(
+                "Cannot read license texts: {0}".format(error.strerror),
+                source=directory,
+            )
+        self.directory = directory
+        self._files: Dict[str, str] = {}
+        for file_name in file_names:
+            path = os.path.join(directory, file_name)
+            if os.path.isfile(path):
+                # SPDX ids like Apache-2.0 look like having an extension.
+                for key in (file_name, os.path.splitext(file_name)[0]):
+                    self._files.setdefault(key, path)
+                    self._files.setdefault(key.casefold(), path)
+        self._texts: Dict[str, str] = {}
+
+    @property
+    def files(self) -> List[str]:
+        """The license files.
+
+        Returns:
+            The paths to the license files, sorted.
+        """
+        return sorted(set(self._files.values()))
+
+    def get(self, key: str) -> str:
+        """Get the text of a license.
+
+        Each file is only read once.
+
+        Args:
+            key: The SPDX id or name of the license, matched exactly or
+                case-insensitively.
+
+        Returns:
+            The text or an empty string if there is no file for the
+            license.
+
+        Raises:
+            ProcessingError: If the file cannot be read.
+        """
+        path = self._files.get(key) or self._files.get(key.casefold())
+        if path is None:
+            return ""
+        if path not in self._texts:
+            try:
+                with open(
+                    path,
+                    "r",
+                    encoding="utf-8",
+                    errors="replace",
+                ) as read_file:
+                    self._texts[path] = read_file.read()
+            except OSError as error:
+                raise ProcessingError(
+                    "Cannot read license text: {0}".format(error.strerror),
+                    source=path,
+                )
+        return self._texts[path]
+
+
+class LicenseIndex(object):
+    """Maps licenses to the packages using them, indexed on first access.
+
+    Iterating the index yields a `License` per license, sorted by key.
+    """
+
+    def __init__(
+        self,
+        packages: Iterable[Package],
+        texts: Optional[LicenseTexts] = None,
+    ) -> None:
+        """Create the index.
+
+        Args:
+            packages: The packages.
+            texts: The texts of the licenses, if any.
+        """
+        self._packages = packages
+        self._texts = texts
+        self._licenses: Optional[Dict[str, License]] = None
+
+    def __getitem__(self, key: str) -> License:
+        return self._load()[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._load()
+
+    def __iter__(self) -> Iterator[License]:
+        return iter(self._load().values())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def keys(self) -> List[str]:
+        """Get the licenses.
+
+        Returns:
+            The SPDX ids or names of the licenses, sorted
+            case-insensitively.
+        """
+        return list(self._load())
+
+    def _load(self) -> Dict[str, License]:
+        if self._licenses is None:
+            packages_by_key: Dict[str, List[Package]] = {}
+            for package in self._packages:
+                for key in split_licenses(package.licenses):
+                    packages_by_key.setdefault(key, []).append(package)
+            self._licenses = {
+                key: License(
+                    key,
+                    sorted(packages_by_key[key], key=get_name_key),
+                    self._texts.get(key) if self._texts is not None else "",
+                )
+                for key in sorted(packages_by_key, key=_get_license_key)
+            }
+        return self._licenses
+
+
+def join_licenses(licenses: Iterable[str]) -> str:
+    """Join the licenses of a package.
+
+    Args:
+        licenses: The SPDX ids or names of the licenses.
+
+    Returns:
+        The licenses joined by commas, interned.
+    """
+    return sys.intern(LICENSES_SEPARATOR.join(licenses))
+
+
+@lru_cache(maxsize=LICENSES_CACHE_SIZE)
+def split_licenses(licenses: str) -> Tuple[str, ...]:
+    """Split the licenses of a package.
+
+    Args:
+        licenses: The licenses joined by commas.
+
+    Returns:
+        The distinct, interned SPDX ids or names of the licenses.
+    """
+    return tuple(
+        dict.fromkeys(
+            sys.intern(key.strip())
+            for key in licenses.split(LICENSES_SEPARATOR)
+            if key.strip()
+        ),
+    )
+
+
+def _get_license_key(key: str) -> Tuple[str, str]:
+    return key.casefold(), key
@@ -1,11 +1,68 @@
 """Handling BOM processing."""
 
-import json
 import os
-from typing import Any, Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import chain, islice
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+)
 
 from mdbom.bom.bom import Package, ProcessingError
-from mdbom.bom.urls import get_purl_type, get_url
+from mdbom.bom.decoding import AUTO_BACKEND, decode_json, get_json_decoder
+from mdbom.bom.diagnostics import (
+    Diagnostics,
+    collect_diagnostics,
+    get_diagnostics,
+)
+from mdbom.bom.graph import (
+    BOM_REF_ID,
+    get_dependency_depths,
+    iter_nested_components,
+)
+from mdbom.bom.licenses import UNKNOWN_LICENSE, join_licenses
+from mdbom.bom.sources import (
+    READ_ERRORS,
+    Buffer,
+    find_bom_files,
+    is_archive,
+    iter_bom_documents,
+    open_bom,
+)
+from mdbom.bom.store import PackageStore
+from mdbom.bom.stream import get_bom_format, iter_components
+from mdbom.bom.urls import describe_resolvers, get_url, resolve_urls
+from mdbom.cache import (
+    get_version,
+    hash_file,
+    hash_values,
+    load_packages,
+    store_packages,
+)
+from mdbom.stats import (
+    BOM_FILES_COUNTER,
+    COMPONENTS_COUNTER,
+    EXTRACT_STAGE,
+    LOAD_STAGE,
+    SKIPPED_FILES_COUNTER,
+    URLS_STAGE,
+    Stats,
+    collect_stats,
+    count,
+    measure,
+)
+
+Result = Tuple[List[Package], Optional[ProcessingError]]
 
 COMPONENTS_ID = "components"
 LICENSE_ID = "license"
@@ -15,13 +72,67 @@ ID_ID = "id"
 TYPE_ID = "type"
 VERSION_ID = "version"
 PURL_ID = "purl"
+BOM_FORMAT_ID = "bomFormat"
+CYCLONEDX_FORMAT = "CycloneDX"
+STREAM_BATCH_SIZE = 256
+
+# The errors of reading a BOM file or archive.
+_READ_FILE_ERRORS: Tuple[Type[BaseException], ...] = (OSError, *READ_ERRORS)
+# The errors of an archive, which are reported with the archive as source.
+_ARCHIVE_ERRORS: Tuple[Type[BaseException], ...] = (
+    ProcessingError,
+    *_READ_FILE_ERRORS,
+)
+# The errors of a single BOM file, which are reported with its source.
+_BOM_ERRORS: Tuple[Type[BaseException], ...] = (
+    KeyError,
+    TypeError,
+    ValueError,
+    *_ARCHIVE_ERRORS,
+)
 
 
-def get_packages_from_bom(filepath: str = "") -> List[Package]:
+def get_packages_from_bom(
+    filepath: str = "",
+    jobs: int = 1,
+    errors: Optional[List[ProcessingError]] = None,
+    cache_dir: str = "",
+    stats: Optional[Stats] = None,
+    json_backend: str = AUTO_BACKEND,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> List[Package]:
     """Get a list of packages from the BOM.
 
+    If a directory is provided, it is searched recursively for BOM files,
+    which are processed in sorted order, using a pool of `jobs` processes
+    if more than one job is requested. The packages are always merged in
+    the same order. JSON files within a directory which are not CycloneDX
+    BOMs are skipped, based on their `bomFormat`.
+
+    BOM files can be compressed via gzip, bzip2, xz or zstd and can be
+    contained in tar or zip archives, which are handled like directories.
+
+    Nested components are returned after the component containing them.
+    The depth of each package is taken from the dependency graph of its
+    BOM, see `mdbom.bom.graph.get_dependency_depths`.
+
     Args:
-        filepath: The path to the BOM file(s).
+        filepath:   The path to the BOM file(s).
+        jobs:       The number of processes used for a directory.
+        errors:     Collects the errors of single BOM files within a
+                    directory or archive instead of raising them.
+        cache_dir:  If provided, the packages extracted from each BOM
+                    file are cached, keyed on the content of the file,
+                    so only new or changed BOM files are parsed.
+        stats:      Records the load, extract and URL resolution stages,
+                    the stages of worker processes are summed up.
+        json_backend:   The backend decoding the BOM files, see
+                        `mdbom.bom.decoding`.
+        include:        Patterns of the files to process within a
+                        directory, see `mdbom.bom.sources.find_bom_files`.
+        exclude:        Patterns of the files and directories to skip
+                        within a directory.
 
     Returns:
         A list of packages.
@@ -29,72 +140,599 @@ def get_packages_from_bom(filepath: str = "") -> List[Package]:
     Raises:
         ProcessingError: In case invalid input is provided.
     """
-    packages = []
-    if filepath:
-        if os.path.isdir(filepath):
-            for filename in os.listdir(filepath):
-                if filename.endswith(".json"):
-                    packages.extend(
-                        _extract_packages(
-                            _load_bom(
-                                filename=os.path.join(filepath, filename),
-                            ),
-                        ),
-                    )
-        else:
-            packages.extend(_extract_packages(_load_bom(filename=filepath)))
+    # Fails early instead of once per BOM file if the backend is missing.
+    get_json_decoder(json_backend)
+    process_bom_file = partial(
+        _process_bom_file,
+        cache_dir=cache_dir,
+        stats=stats,
+        json_backend=json_backend,
+    )
+    if filepath and not os.path.isdir(filepath) and not is_archive(filepath):
+        count(stats, BOM_FILES_COUNTER)
+        [(packages, error)] = process_bom_file(str(filepath))
+        if error is not None:
+            raise error
+        return packages
+    filenames = get_bom_files(
+        filepath=filepath,
+        include=include,
+        exclude=exclude,
+    )
+    count(stats, BOM_FILES_COUNTER, len(filenames))
+    process_bom_file = partial(process_bom_file, sniff=True)
+    if jobs > 1 and len(filenames) > 1:
+        results = _process_bom_files(
+            filenames,
+            jobs,
+            partial(
+                _process_bom_file,
+                cache_dir=cache_dir,
+                json_backend=json_backend,
+                sniff=True,
+            ),
+            stats,
+        )
     else:
-        raise ProcessingError("No file provided")
+        results = [process_bom_file(filename) for filename in filenames]
+    packages = []
+    for file_packages, error in chain.from_iterable(results):
+        if error is not None:
+            if errors is None:
+                raise error
+            errors.append(error)
+        packages.extend(file_packages)
     return packages
 
 
+def get_packages_from_content(
+    content: Buffer,
+    source: str = "",
+    json_backend: str = AUTO_BACKEND,
+) -> List[Package]:
+    """Get a list of packages from a BOM which is already in memory.
+
+    Args:
+        content: The JSON encoded BOM.
+        source: The name recorded as source of the packages, if any.
+        json_backend: The backend decoding the BOM.
+
+    Returns:
+        A list of packages.
+
+    Raises:
+        ProcessingError: If the content is not a valid BOM.
+    """
+    try:
+        return _extract_bom_packages(decode_json(content, json_backend), source)
+    except (KeyError, TypeError, ValueError) as error:
+        raise _get_processing_error(error, source)
+
+
+def iter_packages_from_bom(
+    filepath: str = "",
+    stats: Optional[Stats] = None,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+    errors: Optional[List[ProcessingError]] = None,
+) -> Iterator[Package]:
+    """Iterate over the packages of the BOM without loading it completely.
+
+    Only the components of the BOM are decoded, one at a time, while
+    all other parts of the document are skipped. This keeps the memory
+    usage flat even for very large BOM files. As the dependency graph is
+    skipped as well, the depth of the packages is not known.
+
+    Like `get_packages_from_bom`, invalid BOM files within a directory or
+    archive can be skipped. As the packages are streamed, those read from
+    such a file before the error was detected are kept.
+
+    Args:
+        filepath: The path to the BOM file(s).
+        stats: Records the load, extract and URL resolution stages while
+            the packages are iterated.
+        include: Patterns of the files to process within a directory.
+        exclude: Patterns of the files and directories to skip within a
+            directory.
+        errors: Collects the errors of single BOM files within a
+            directory or archive while the packages are iterated, instead
+            of raising them.
+
+    Returns:
+        An iterator over the packages.
+
+    Raises:
+        ProcessingError: In case invalid input is provided.
+    """
+    filenames = get_bom_files(
+        filepath=filepath,
+        include=include,
+        exclude=exclude,
+    )
+    for filename in filenames:
+        if not os.path.exists(filename):
+            raise ProcessingError("Provided file does not exist")
+    count(stats, BOM_FILES_COUNTER, len(filenames))
+    sniff = os.path.isdir(filepath)
+    if not sniff and not is_archive(filepath):
+        # A single BOM file fails like in get_packages_from_bom.
+        errors = None
+    return _stream_packages(filenames, sniff, stats, errors)
+
+
 def filter_packages_by_type(
-    packages: List[Package],
+    packages: Iterable[Package],
     package_type: str,
 ) -> List[Package]:
     """Filter a list of packages based on type.
 
+    Multiple types can be provided as comma separated list, in which case
+    the packages are grouped by type in the order the types are listed.
+
     Args:
-        packages:       The list of packages to filter.
-        package_type:   The packages type to apply as filter.
+        packages:       The packages to filter, a `PackageStore` is
+                        filtered into a store again.
+        package_type:   The packages type(s) to apply as filter.
 
     Returns:
         A filtered list of packages.
     """
-    if not package_type:
-        return packages
-    return list(
-        filter(
-            lambda package: get_purl_type(package.purl) == package_type,
-            packages,
-        ),
+    package_types = split_package_types(package_type)
+    if isinstance(packages, PackageStore):
+        if package_types:
+            packages = packages.filter_by_type(package_types)
+        return packages  # type: ignore
+    if not package_types:
+        return list(packages)
+    index = index_packages_by_type(packages)
+    return [
+        package
+        for purl_type in package_types
+        for package in index.get(purl_type, [])
+    ]
+
+
+def iter_packages_by_type(
+    packages: Iterable[Package],
+    package_type: str,
+) -> Iterator[Package]:
+    """Lazily filter packages based on type.
+
+    Multiple types are grouped like by `filter_packages_by_type`. The
+    packages of the first type are passed on as they come, while only
+    the packages of the further types are kept until all packages were
+    read.
+
+    Args:
+        packages:       The packages to filter.
+        package_type:   The packages type(s) to apply as filter.
+
+    Yields:
+        The packages matching the type(s).
+    """
+    package_types = split_package_types(package_type)
+    if not package_types:
+        yield from packages
+        return
+    first_type = package_types[0]
+    later_packages: Dict[str, List[Package]] = {
+        purl_type: [] for purl_type in package_types[1:]
+    }
+    for package in packages:
+        purl_type = package.purl_type
+        if purl_type == first_type:
+            yield package
+        elif purl_type in later_packages:
+            later_packages[purl_type].append(package)
+    for purl_type in package_types[1:]:
+        yield from later_packages[purl_type]
+
+
+def index_packages_by_type(
+    packages: Iterable[Package],
+) -> Dict[str, List[Package]]:
+    """Bucket packages by their purl type.
+
+    Args:
+        packages: The packages to index.
+
+    Returns:
+        The packages per purl type, packages without a valid purl are
+        collected under an empty type.
+    """
+    index: Dict[str, List[Package]] = {}
+    for package in packages:
+        index.setdefault(package.purl_type, []).append(package)
+    return index
+
+
+def split_package_types(package_type: str) -> List[str]:
+    """Split a comma separated list of package types.
+
+    Args:
+        package_type: The package types, e.g. "pypi,npm".
+
+    Returns:
+        The distinct package types in the provided order.
+    """
+    package_types = (purl_type.strip() for purl_type in package_type.split(","))
+    return list(dict.fromkeys(filter(None, package_types)))
+
+
+def deduplicate_packages(packages: Iterable[Package]) -> List[Package]:
+    """Merge packages which occur multiple times into a single package.
+
+    Packages are considered equal if they share the same purl or, if no
+    purl is available, the same name, version and type. The first
+    occurrence is kept and the sources of all occurrences are merged
+    into it, in the order they were encountered. The depth is the
+    smallest known depth of all occurrences.
+
+    Args:
+        packages: The packages to deduplicate.
+
+    Returns:
+        A list of unique packages.
+    """
+    index: Dict[Tuple[str, ...], Tuple[Package, Dict[str, None]]] = {}
+    depths: Dict[Tuple[str, ...], Optional[int]] = {}
+    for package in packages:
+        key = _get_package_key(package)
+        if key in index:
+            index[key][1].update(dict.fromkeys(package.sources))
+            depths[key] = _get_min_depth(depths[key], package.depth)
+        else:
+            index[key] = (package, dict.fromkeys(package.sources))
+            depths[key] = package.depth
+    return [
+        package._replace(sources=tuple(sources), depth=depths[key])
+        for key, (package, sources) in index.items()
+    ]
+
+
+def _get_min_depth(
+    depth: Optional[int],
+    other_depth: Optional[int],
+) -> Optional[int]:
+    if depth is None:
+        return other_depth
+    if other_depth is None:
+        return depth
+    return min(depth, other_depth)
+
+
+def _get_package_key(package: Package) -> Tuple[str, ...]:
+    if package.purl:
+        return (package.purl,)
+    return ("", package.name, package.version, package.kind)
+
+
+def get_bom_files(
+    filepath: str = "",
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> List[str]:
+    """Get the BOM files to process.
+
+    Args:
+        filepath:   The path to a BOM file or a directory of BOM files.
+        include:    Patterns of the files to return for a directory,
+                    by default JSON files, optionally compressed, and
+                    archives are returned.
+        exclude:    Patterns of the files and directories to skip.
+
+    Returns:
+        The BOM files of a directory and its subdirectories, sorted by
+        their path, or the provided file.
+
+    Raises:
+        ProcessingError: In case no path is provided.
+    """
+    if not filepath:
+        raise ProcessingError("No file provided")
+    if os.path.isdir(filepath):
+        return find_bom_files(
+            os.fspath(filepath),
+            include=include,
+            exclude=exclude,
+        )
+    return [filepath]
+
+
+def _process_bom_files(
+    filenames: List[str],
+    jobs: int,
+    process_bom_file: Callable[..., Any],
+    stats: Optional[Stats],
+) -> List[List[Result]]:
+    chunksize = max(1, len(filenames) // (jobs * 4))
+    diagnostics = get_diagnostics()
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        if stats is None and diagnostics is None:
+            return list(
+                executor.map(process_bom_file, filenames, chunksize=chunksize),
+            )
+        results = []
+        for file_results, file_stats, file_diagnostics in executor.map(
+            partial(
+                _process_collected_bom_file,
+                process_bom_file,
+                stats is not None,
+                diagnostics.spawn() if diagnostics is not None else None,
+            ),
+            filenames,
+            chunksize=chunksize,
+        ):
+            if stats is not None and file_stats is not None:
+                stats.merge(file_stats)
+            if diagnostics is not None and file_diagnostics is not None:
+                diagnostics.merge(file_diagnostics)
+            results.append(file_results)
+        return results
+
+
+def _process_collected_bom_file(
+    process_bom_file: Callable[..., Any],
+    measured: bool,
+    diagnostics: Optional[Diagnostics],
+    filename: str,
+) -> Tuple[List[Result], Optional[Stats], Optional[Diagnostics]]:
+    stats = Stats() if measured else None
+    with collect_stats(stats), collect_diagnostics(diagnostics):
+        if stats is None:
+            results = process_bom_file(filename)
+        else:
+            results = process_bom_file(filename, stats=stats)
+    return results, stats, diagnostics
+
+
+def _process_bom_file(
+    filename: str,
+    cache_dir: str = "",
+    stats: Optional[Stats] = None,
+    json_backend: str = AUTO_BACKEND,
+    sniff: bool = False,
+) -> List[Result]:
+    if is_archive(filename):
+        return _process_archive(filename, stats, json_backend)
+    if sniff:
+        try:
+            if not _is_cyclonedx_file(filename):
+                count(stats, SKIPPED_FILES_COUNTER)
+                return []
+        except _BOM_ERRORS as error:
+            return [([], _get_processing_error(error, filename))]
+    return [_process_document_file(filename, cache_dir, stats, json_backend)]
+
+
+def _process_archive(
+    filename: str,
+    stats: Optional[Stats] = None,
+    json_backend: str = AUTO_BACKEND,
+) -> List[Result]:
+    results: List[Result] = []
+    try:
+        for source, stream in iter_bom_documents(filename):
+            try:
+                with measure(stats, LOAD_STAGE):
+                    content = decode_json(stream.read(), json_backend)
+                if not _is_cyclonedx(content):
+                    count(stats, SKIPPED_FILES_COUNTER)
+                    continue
+                packages = _extract_bom_packages(content, source, stats)
+            except _BOM_ERRORS as error:
+                results.append(([], _get_processing_error(error, source)))
+            else:
+                results.append((packages, None))
+    except _ARCHIVE_ERRORS as error:
+        results.append(([], _get_processing_error(error, filename)))
+    return results
+
+
+def _process_document_file(
+    filename: str,
+    cache_dir: str = "",
+    stats: Optional[Stats] = None,
+    json_backend: str = AUTO_BACKEND,
+) -> Result:
+    try:
+        if cache_dir:
+            packages = _process_cached_bom_file(
+                filename,
+                cache_dir,
+                stats,
+                json_backend,
+            )
+            return packages, None
+        with measure(stats, LOAD_STAGE):
+            content = _load_bom(filename=filename, json_backend=json_backend)
+        return _extract_bom_packages(content, filename, stats), None
+    except _BOM_ERRORS as error:
+        return [], _get_processing_error(error, filename)
+
+
+def _is_cyclonedx_file(filename: str) -> bool:
+    with open_bom(filename) as stream:
+        return get_bom_format(stream) == CYCLONEDX_FORMAT
+
+
+def _is_cyclonedx(content: Any) -> bool:
+    return (
+        isinstance(content, dict)
+        and content.get(BOM_FORMAT_ID) == CYCLONEDX_FORMAT
     )
 
 
-def _load_bom(filename: str = "") -> Dict[Any, Any]:
+def _get_processing_error(error: BaseException, source: str) -> ProcessingError:
+    if isinstance(error, ProcessingError):
+        return ProcessingError(str(error), source=source)
+    return ProcessingError("Invalid BOM: {0!r}".format(error), source=source)
+
+
+def _process_cached_bom_file(
+    filename: str,
+    cache_dir: str,
+    stats: Optional[Stats] = None,
+    json_backend: str = AUTO_BACKEND,
+) -> List[Package]:
+    if not os.path.exists(filename):
+        raise ProcessingError("Provided file does not exist")
+    with measure(stats, LOAD_STAGE):
+        # Cached packages contain their URL, which depends on the resolvers.
+        key = hash_values(
+            [get_version(), hash_file(filename), describe_resolvers()],
+        )
+        packages = load_packages(cache_dir=cache_dir, key=key, source=filename)
+    if packages is None:
+        with measure(stats, LOAD_STAGE):
+            content = _load_bom(filename=filename, json_backend=json_backend)
+        packages = _extract_bom_packages(content, filename, stats)
+        store_packages(cache_dir=cache_dir, key=key, packages=packages)
+    else:
+        count(stats, COMPONENTS_COUNTER, len(packages))
+    return packages
+
+
+def _stream_packages(
+    filenames: List[str],
+    sniff: bool = False,
+    stats: Optional[Stats] = None,
+    errors: Optional[List[ProcessingError]] = None,
+) -> Iterator[Package]:
+    for filename in filenames:
+        try:
+            for source, stream in _iter_bom_documents(filename, sniff):
+                try:
+                    yield from _stream_document(source, stream, stats)
+                except _BOM_ERRORS as error:
+                    processing_error = _get_processing_error(error, source)
+                    if errors is None:
+                        raise processing_error
+                    errors.append(processing_error)
+        except ProcessingError as error:
+            if errors is None:
+                raise
+            errors.append(error)
+
+
+def _stream_document(
+    source: str,
+    stream: BinaryIO,
+    stats: Optional[Stats] = None,
+) -> Iterator[Package]:
+    components = iter_nested_components(iter_components(stream))
+    if stats is None:
+        sources = (source,)
+        for component in components:
+            yield _extract_package(component, sources)
+        return
+    # The components are measured in batches, as measuring every single
+    # component would cost more than processing it.
+    while True:  # noqa: WPS457
+        with stats.stage(LOAD_STAGE):
+            batch = list(islice(components, STREAM_BATCH_SIZE))
+        if not batch:
+            break
+        yield from _extract_packages(batch, source, stats)
+
+
+def _iter_bom_documents(
+    filename: str,
+    sniff: bool = False,
+) -> Iterator[Tuple[str, BinaryIO]]:
+    try:
+        if sniff and not is_archive(filename):
+            if not _is_cyclonedx_file(filename):
+                return
+        yield from iter_bom_documents(str(filename))
+    except _BOM_ERRORS as error:
+        raise _get_processing_error(error, str(filename))
+
+
+def _load_bom(
+    filename: str = "",
+    json_backend: str = AUTO_BACKEND,
+) -> Dict[Any, Any]:
     if os.path.exists(filename):
-        with open(filename, "r") as read_file:
-            return json.load(read_file)
+        with open_bom(filename) as stream:
+            return decode_json(stream.read(), json_backend)
     else:
         raise ProcessingError("Provided file does not exist")
 
 
-def _extract_packages(content: Dict[Any, Any]) -> List[Package]:
-    packages = []
-    for component in content[COMPONENTS_ID]:
-        packages.append(
-            Package(
-                component[NAME_ID],
-                component[VERSION_ID],
-                component[TYPE_ID],
-                ",".join(_extract_licenses(component)),
-                _extract_purl(component),
-                get_url(_extract_purl(component)),
-            ),
-        )
+def _extract_bom_packages(
+    content: Dict[Any, Any],
+    source: str = "",
+    stats: Optional[Stats] = None,
+) -> List[Package]:
+    with measure(stats, EXTRACT_STAGE):
+        components = list(iter_nested_components(content[COMPONENTS_ID]))
+        depths = get_dependency_depths(content)
+    return _extract_packages(components, source, stats, depths)
+
+
+def _extract_packages(
+    components: List[Dict[Any, Any]],
+    source: str = "",
+    stats: Optional[Stats] = None,
+    depths: Optional[Dict[str, int]] = None,
+) -> List[Package]:
+    sources = (source,) if source else ()
+    with measure(stats, EXTRACT_STAGE):
+        purls = [_extract_purl(component) for component in components]
+    with measure(stats, URLS_STAGE):
+        urls = resolve_urls(purls)
+    with measure(stats, EXTRACT_STAGE):
+        packages = [
+            _create_package(
+                component,
+                purl,
+                url,
+                sources,
+                _get_depth(component, depths),
+            )
+            for component, purl, url in zip(components, purls, urls)
+        ]
+    count(stats, COMPONENTS_COUNTER, len(packages))
     return packages
 
 
+def _extract_package(
+    component: Dict[Any, Any],
+    sources: Tuple[str, ...] = (),
+) -> Package:
+    purl = _extract_purl(component)
+    return _create_package(component, purl, get_url(purl), sources)
+
+
+def _create_package(
+    component: Dict[Any, Any],
+    purl: str,
+    url: str,
+    sources: Tuple[str, ...],
+    depth: Optional[int] = None,
+) -> Package:
+    return Package(
+        component[NAME_ID],
+        component[VERSION_ID],
+        component[TYPE_ID],
+        join_licenses(_extract_licenses(component)),
+        purl,
+        url,
+        sources,
+        depth,
+    )
+
+
+def _get_depth(
+    component: Dict[Any, Any],
+    depths: Optional[Dict[str, int]],
+) -> Optional[int]:
+    if not depths:
+        return None
+    return depths.get(component.get(BOM_REF_ID))  # type: ignore
+
+
 def _extract_licenses(component: Dict[Any, Any]) -> List[str]:
     licenses = []
     if component.get(LICENSES_ID) is not None:
@@ -104,9 +742,9 @@ def _extract_licenses(component: Dict[Any, Any]) -> List[str]:
             elif component_license[LICENSE_ID].get(NAME_ID) is not None:
                 licenses.append(component_license[LICENSE_ID][NAME_ID])
             else:
-                licenses.append("unknown")
+                licenses.append(UNKNOWN_LICENSE)
     else:
-        licenses.append("unknown")
+        licenses.append(UNKNOWN_LICENSE)
     return licenses
 
 
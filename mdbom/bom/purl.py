@@ -0,0 +1,63 @@
+"""Handling purl parsing."""
+
+import re
+from functools import lru_cache
+from typing import NamedTuple, Optional
+
+PURL_CACHE_SIZE = 1 << 16
+
+purl_reg = re.compile(r"pkg:(?P<type>[a-z]+)\/(?P<rest>\S*)")
+
+
+class PURL(NamedTuple):
+    """A representation of a parsed package URL."""
+
+    kind: str
+    namespace: str
+    name: str
+    version: Optional[str]
+    qualifiers: str
+    subpath: str
+
+    @property
+    def package(self) -> str:
+        """The name of the package including its namespace.
+
+        Returns:
+            The namespace and name joined by a slash.
+        """
+        if self.namespace:
+            return "{0}/{1}".format(self.namespace, self.name)
+        return self.name
+
+
+@lru_cache(maxsize=PURL_CACHE_SIZE)
+def parse_purl(purl: str) -> Optional[PURL]:
+    """Parse the provided purl into its parts.
+
+    The results are cached, so the same purl is only parsed once no
+    matter how often it is requested.
+
+    Args:
+        purl: The purl of the package.
+
+    Returns:
+        The parsed purl or None if the purl is not valid.
+    """
+    match = purl_reg.match(purl)
+    if match is None:
+        return None
+    rest, _, subpath = match.group("rest").partition("#")
+    rest, _, qualifiers = rest.partition("?")
+    version: Optional[str] = None
+    if "@" in rest:
+        rest, _, version = rest.rpartition("@")
+    namespace, _, name = rest.rpartition("/")
+    return PURL(
+        match.group("type"),
+        namespace,
+        name,
+        version,
+        qualifiers,
+        subpath,
+    )
@@ -0,0 +1,400 @@
+"""Handling the reading of BOM files.
+
+BOM files are mapped read-only into memory instead of being read into
+an intermediate copy, so decoders which accept buffers can work directly
+on the pages of the file, which are often already in the page cache.
+
+Compressed BOM files and BOM files within tar or zip archives are
+decompressed while they are read, without extracting them to disk.
+
+Directories are searched recursively for BOM files, scanning the
+directories of each level concurrently.
+"""
+
+import bz2
+import fnmatch
+import gzip
+import lzma
+import mmap
+import os
+import tarfile
+import traceback
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from functools import partial
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+)
+
+from mdbom.bom.bom import Buffer, ProcessingError
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover
+    zstandard = None
+
+JSON_EXTENSION = ".json"
+TAR_EXTENSION = ".tar"
+ZIP_EXTENSION = ".zip"
+GZIP_EXTENSION = ".gz"
+BZIP2_EXTENSION = ".bz2"
+XZ_EXTENSION = ".xz"
+ZSTD_EXTENSION = ".zst"
+
+compressions: Dict[str, Any] = {
+    GZIP_EXTENSION: lambda stream: gzip.GzipFile(fileobj=stream, mode="rb"),
+    BZIP2_EXTENSION: bz2.BZ2File,
+    XZ_EXTENSION: lzma.LZMAFile,
+    ZSTD_EXTENSION: lambda stream: _open_zstd(stream),
+}
+_tar_aliases = {
+    ".tgz": GZIP_EXTENSION,
+    ".tbz2": BZIP2_EXTENSION,
+    ".txz": XZ_EXTENSION,
+}
+
+# The errors raised for corrupt archives or compressed data.
+READ_ERRORS: Tuple[Type[BaseException], ...] = (
+    EOFError,
+    lzma.LZMAError,
+    tarfile.TarError,
+    zipfile.BadZipFile,
+)
+if zstandard is not None:
+    READ_ERRORS += (zstandard.ZstdError,)
+
+
+class BufferReader(object):
+    """A binary stream returning slices of a buffer without copying."""
+
+    def __init__(self, buffer: Buffer) -> None:
+        """Create a stream reading from the start of the buffer.
+
+        Args:
+            buffer: The buffer to read from.
+        """
+        self._buffer = buffer
+        self._pos = 0
+
+    def read(self, size: int = -1) -> Buffer:
+        """Read from the buffer.
+
+        Args:
+            size: The maximum number of bytes to read, all remaining
+                bytes if negative.
+
+        Returns:
+            The next bytes, empty at the end of the buffer.
+        """
+        start = self._pos
+        end = len(self._buffer) if size < 0 else start + size
+        chunk = self._buffer[start:end]
+        self._pos = start + len(chunk)
+        return chunk
+
+
+@contextmanager
+def map_file(filename: str) -> Iterator[Buffer]:
+    """Map a file read-only into memory.
+
+    Files which cannot be mapped, e.g. empty files or pipes, are read
+    into memory instead.
+
+    Args:
+        filename: The path to the file.
+
+    Yields:
+        The content of the file. It must not be referenced after the
+        context is left.
+    """
+    with open(filename, "rb") as read_file:
+        try:
+            mapped = mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            mapped = None
+        if mapped is None:
+            yield read_file.read()
+            return
+        content = memoryview(mapped)
+        try:
+            yield content
+        except BaseException as error:
+            # The traceback may still reference slices of the content,
+            # which must not replace the error by failing to close it.
+            traceback.clear_frames(error.__traceback__)
+            _close_mapping(content, mapped, suppress=True)
+            raise
+        _close_mapping(content, mapped)
+
+
+def find_bom_files(
+    directory: str,
+    include: Sequence[str] = (),
+    exclude: Sequence[str] = (),
+) -> List[str]:
+    """Find the BOM files within a directory and its subdirectories.
+
+    Patterns are matched against the name of a file or directory if
+    they do not contain a slash, otherwise against its path relative to
+    the searched directory, e.g. `*.json` or `team-a/*/bom.json`. A `*`
+    also matches slashes. Symbolic links to directories are not followed.
+
+    Args:
+        directory: The directory to search.
+        include: If provided, only files matching one of these patterns
+            are returned, instead of all files `is_bom_file` accepts.
+        exclude: Files and directories matching one of these patterns
+            are skipped.
+
+    Returns:
+        The paths of the BOM files, sorted by their relative path.
+
+    Raises:
+        ProcessingError: If a directory cannot be read.
+    """
+    found: List[str] = []
+    pending = [""]
+    with ThreadPoolExecutor() as executor:
+        while pending:
+            scan = partial(_scan_directory, directory)
+            if len(pending) > 1:
+                scanned: Iterable[Tuple[List[str], List[str]]] = executor.map(
+                    scan,
+                    pending,
+                )
+            else:
+                scanned = map(scan, pending)
+            pending = []
+            for files, directories in scanned:
+                found.extend(
+                    path
+                    for path in files
+                    if _is_included(path, include, exclude)
+                )
+                pending.extend(
+                    path for path in directories if not _matches(path, exclude)
+                )
+    return [os.path.join(directory, path) for path in sorted(found)]
+
+
+def is_bom_file(filename: str) -> bool:
+    """Check whether a file contains BOMs based on its name.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        True for JSON files, compressed JSON files and archives.
+    """
+    extension, compression = get_file_format(filename)
+    if extension == ZIP_EXTENSION:
+        return not compression
+    return extension in {JSON_EXTENSION, TAR_EXTENSION}
+
+
+def is_archive(filename: str) -> bool:
+    """Check whether a file is an archive based on its name.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        True for tar archives, optionally compressed, and zip archives.
+    """
+    extension, compression = get_file_format(filename)
+    if extension == ZIP_EXTENSION:
+        return not compression
+    return extension == TAR_EXTENSION
+
+
+def get_file_format(filename: str) -> Tuple[str, str]:
+    """Get the format of a file based on its name.
+
+    Args:
+        filename: The name of the file.
+
+    Returns:
+        The extension of the content, e.g. ".json" or ".tar", and the
+        extension of the compression, e.g. ".gz", or an empty string if
+        the file is not compressed.
+    """
+    root, extension = os.path.splitext(os.fspath(filename).lower())
+    if extension in _tar_aliases:
+        return TAR_EXTENSION, _tar_aliases[extension]
+    if extension in compressions:
+        return os.path.splitext(root)[1], extension
+    return extension, ""
+
+
+@contextmanager
+def open_bom(filename: str) -> Iterator[BinaryIO]:
+    """Open a single BOM file for reading.
+
+    Uncompressed files are memory mapped, compressed files are
+    decompressed while they are read.
+
+    Args:
+        filename: The path to the file.
+
+    Yields:
+        A binary stream of the BOM.
+    """
+    _, compression = get_file_format(filename)
+    if not compression:
+        with map_file(filename) as content:
+            yield BufferReader(content)  # type: ignore
+        return
+    with open(filename, "rb") as read_file:
+        with _decompress(read_file, compression) as stream:
+            yield stream
+
+
+def iter_bom_documents(filename: str) -> Iterator[Tuple[str, BinaryIO]]:
+    """Iterate over the BOMs within a file.
+
+    Archives are read member by member, any other file is considered a
+    single BOM. Within archives, only JSON files, optionally compressed,
+    are considered BOMs. Their source is the path of the archive joined
+    with the path of the member.
+
+    Args:
+        filename: The path to the file.
+
+    Yields:
+        The source and a binary stream of each BOM, the stream can only
+        be read until the next BOM is requested.
+    """
+    extension, compression = get_file_format(filename)
+    if extension == TAR_EXTENSION:
+        yield from _iter_tar_documents(filename, compression)
+    elif extension == ZIP_EXTENSION and not compression:
+        yield from _iter_zip_documents(filename)
+    else:
+        with open_bom(filename) as stream:
+            yield filename, stream
+
+
+def _close_mapping(
+    content: memoryview,
+    mapped: mmap.mmap,
+    suppress: bool = False,
+) -> None:
+    try:
+        content.release()
+        mapped.close()
+    except BufferError:
+        if not suppress:
+            raise
+        # The mapping is closed once the last slice is garbage collected.
+
+
+def _scan_directory(
+    directory: str,
+    relative_path: str,
+) -> Tuple[List[str], List[str]]:
+    files = []
+    directories = []
+    try:
+        with os.scandir(os.path.join(directory, relative_path)) as entries:
+            for entry in entries:
+                path = os.path.join(relative_path, entry.name)
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(path)
+                elif entry.is_file():
+                    files.append(path)
+    except OSError as error:
+        raise ProcessingError(
+            "Cannot read directory: {0}".format(error.filename),
+        )
+    return files, directories
+
+
+def _is_included(
+    path: str,
+    include: Sequence[str],
+    exclude: Sequence[str],
+) -> bool:
+    if _matches(path, exclude):
+        return False
+    if include:
+        return _matches(path, include)
+    return is_bom_file(path)
+
+
+def _matches(path: str, patterns: Sequence[str]) -> bool:
+    path = path.replace(os.sep, "/")
+    name = path.rpartition("/")[2]
+    return any(
+        fnmatch.fnmatchcase(path if "/" in pattern else name, pattern)
+        for pattern in patterns
+    )
+
+
+def _iter_tar_documents(
+    filename: str,
+    compression: str,
+) -> Iterator[Tuple[str, BinaryIO]]:
+    with open(filename, "rb") as read_file:
+        with _decompress(read_file, compression) as stream:
+            # Reading the archive as stream avoids seeking in the data.
+            with tarfile.open(fileobj=stream, mode="r|") as archive:
+                for member in archive:
+                    if member.isfile() and _is_document(member.name):
+                        yield from _open_member(
+                            filename,
+                            member.name,
+                            archive.extractfile(member),  # type: ignore
+                        )
+
+
+def _iter_zip_documents(filename: str) -> Iterator[Tuple[str, BinaryIO]]:
+    with zipfile.ZipFile(filename) as archive:
+        for member in archive.infolist():
+            if not member.is_dir() and _is_document(member.filename):
+                yield from _open_member(
+                    filename,
+                    member.filename,
+                    archive.open(member),  # type: ignore
+                )
+
+
+def _open_member(
+    filename: str,
+    member_name: str,
+    member_file: BinaryIO,
+) -> Iterator[Tuple[str, BinaryIO]]:
+    _, compression = get_file_format(member_name)
+    with member_file, _decompress(member_file, compression) as stream:
+        yield os.path.join(filename, member_name), stream
+
+
+def _is_document(member_name: str) -> bool:
+    return get_file_format(member_name)[0] == JSON_EXTENSION
+
+
+def _decompress(stream: BinaryIO, compression: str) -> BinaryIO:
+    if not compression:
+        return stream
+    return compressions[compression](stream)
+
+
+def _open_zstd(stream: BinaryIO) -> BinaryIO:
+    if zstandard is None:
+        raise ProcessingError(
+            "Reading {0} files requires the zstandard package".format(
+                ZSTD_EXTENSION,
+            ),
+        )
+    return zstandard.ZstdDecompressor().stream_reader(
+        stream,
+        read_across_frames=True,
+    )
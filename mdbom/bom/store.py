@@ -0,0 +1,393 @@
+"""Handling compact storage of large package sets.
+
+A `PackageStore` keeps the packages column by column instead of as one
+tuple per package. Columns with few distinct values, like the kind, the
+licenses, the purl type or the sources, are dictionary encoded, so each
+distinct value is stored only once and every package only references it
+by a small integer code.
+"""
+
+from array import array
+from typing import (
+    Dict,
+    Generic,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+    Union,
+)
+
+from mdbom.bom.bom import Package
+from mdbom.bom.purl import PURL, parse_purl
+
+_CODE_TYPE = "I"
+_DEPTH_TYPE = "i"
+# Stands for an unknown depth within the depth column.
+_NO_DEPTH = -1
+
+Value = TypeVar("Value", str, Tuple[str, ...])
+
+
+class _Dictionary(Generic[Value]):
+    def __init__(self) -> None:
+        self.values: List[Value] = []
+        self._codes: Dict[Value, int] = {}
+
+    def encode(self, value: Value) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self._codes[value] = code
+            self.values.append(value)
+        return code
+
+    def lookup(self, value: Value) -> Optional[int]:
+        return self._codes.get(value)
+
+    def ranks(self) -> List[int]:
+        order = sorted(range(len(self.values)), key=self.values.__getitem__)
+        ranks = [0] * len(order)
+        for rank, code in enumerate(order):
+            ranks[code] = rank
+        return ranks
+
+
+class PackageView(object):
+    """A single package within a `PackageStore`.
+
+    The view provides the same attributes as a `Package`, so it can be
+    used in templates the same way.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "PackageStore", index: int) -> None:
+        """Create a view on a package.
+
+        Args:
+            store: The store containing the package.
+            index: The position of the package within the store.
+        """
+        self._store = store
+        self._index = index
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (PackageView, Package)):
+            return tuple(self) == tuple(other)
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return hash(tuple(self))
+
+    def __iter__(self) -> Iterator[object]:
+        return iter(self.to_package())
+
+    def __repr__(self) -> str:
+        return "PackageView({0!r})".format(self.to_package())
+
+    @property
+    def name(self) -> str:
+        """The name of the package.
+
+        Returns:
+            The name.
+        """
+        return self._store.names[self._index]
+
+    @property
+    def version(self) -> str:
+        """The version of the package.
+
+        Returns:
+            The version.
+        """
+        return self._store.versions[self._index]
+
+    @property
+    def kind(self) -> str:
+        """The kind of the package.
+
+        Returns:
+            The kind.
+        """
+        return self._store.kinds.values[self._store.kind_codes[self._index]]
+
+    @property
+    def licenses(self) -> str:
+        """The licenses of the package.
+
+        Returns:
+            The licenses joined by commas.
+        """
+        store = self._store
+        return store.licenses.values[store.license_codes[self._index]]
+
+    @property
+    def purl(self) -> str:
+        """The purl of the package.
+
+        Returns:
+            The purl.
+        """
+        return self._store.purls[self._index]
+
+    @property
+    def url(self) -> str:
+        """The URL of the package.
+
+        Returns:
+            The URL.
+        """
+        return self._store.urls[self._index]
+
+    @property
+    def sources(self) -> Tuple[str, ...]:
+        """The BOM files the package was found in.
+
+        Returns:
+            The sources.
+        """
+        store = self._store
+        return store.sources.values[store.source_codes[self._index]]
+
+    @property
+    def depth(self) -> Optional[int]:
+        """The depth of the package within the dependency graph.
+
+        Returns:
+            The depth or None if it is not known.
+        """
+        depth = self._store.depths[self._index]
+        return None if depth == _NO_DEPTH else depth
+
+    @property
+    def direct(self) -> bool:
+        """Whether the package is a direct dependency.
+
+        Returns:
+            True if the package has a depth of 1 in the dependency graph.
+        """
+        return self._store.depths[self._index] == 1
+
+    @property
+    def purl_type(self) -> str:
+        """The type of the package according to its purl.
+
+        Returns:
+            The purl type or an empty string if the purl is not valid.
+        """
+        store = self._store
+        return store.purl_types.values[store.purl_type_codes[self._index]]
+
+    @property
+    def parsed_purl(self) -> Optional[PURL]:
+        """The parsed purl of the package.
+
+        Returns:
+            The parsed purl or None if the package has no valid purl.
+        """
+        return parse_purl(self.purl)
+
+    def to_package(self) -> Package:
+        """Convert the view into a standalone package.
+
+        Returns:
+            The package.
+        """
+        return Package(
+            self.name,
+            self.version,
+            self.kind,
+            self.licenses,
+            self.purl,
+            self.url,
+            self.sources,
+            self.depth,
+        )
+
+
+class PackageStore(object):
+    """A columnar store for a large number of packages."""
+
+    def __init__(self) -> None:
+        """Create an empty store."""
+        self.names: List[str] = []
+        self.versions: List[str] = []
+        self.purls: List[str] = []
+        self.urls: List[str] = []
+        self.kinds: _Dictionary[str] = _Dictionary()
+        self.licenses: _Dictionary[str] = _Dictionary()
+        self.purl_types: _Dictionary[str] = _Dictionary()
+        self.sources: _Dictionary[Tuple[str, ...]] = _Dictionary()
+        self.kind_codes = array(_CODE_TYPE)
+        self.license_codes = array(_CODE_TYPE)
+        self.purl_type_codes = array(_CODE_TYPE)
+        self.source_codes = array(_CODE_TYPE)
+        self.depths = array(_DEPTH_TYPE)
+
+    @classmethod
+    def from_packages(
+        cls,
+        packages: Iterable[Union[Package, PackageView]],
+    ) -> "PackageStore":
+        """Create a store from packages.
+
+        Args:
+            packages: The packages to store.
+
+        Returns:
+            The store.
+        """
+        store = cls()
+        store.extend(packages)
+        return store
+
+    def append(self, package: Union[Package, PackageView]) -> None:
+        """Add a package to the store.
+
+        Args:
+            package: The package to add.
+        """
+        self.names.append(package.name)
+        self.versions.append(package.version)
+        self.purls.append(package.purl)
+        self.urls.append(package.url)
+        self.kind_codes.append(self.kinds.encode(package.kind))
+        self.license_codes.append(self.licenses.encode(package.licenses))
+        self.purl_type_codes.append(self.purl_types.encode(package.purl_type))
+        self.source_codes.append(self.sources.encode(package.sources))
+        self.depths.append(
+            _NO_DEPTH if package.depth is None else package.depth,
+        )
+
+    def extend(self, packages: Iterable[Union[Package, PackageView]]) -> None:
+        """Add multiple packages to the store.
+
+        Args:
+            packages: The packages to add.
+        """
+        for package in packages:
+            self.append(package)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __getitem__(
+        self,
+        index: Union[int, slice],
+    ) -> Union[PackageView, "PackageStore"]:
+        if isinstance(index, slice):
+            return self.select(range(len(self))[index])
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("package index out of range")
+        return PackageView(self, index)
+
+    def __iter__(self) -> Iterator[PackageView]:
+        return (PackageView(self, index) for index in range(len(self)))
+
+    def select(self, indices: Iterable[int]) -> "PackageStore":
+        """Create a new store from the packages at the given positions.
+
+        The dictionaries are shared with this store, so only the codes
+        are copied.
+
+        Args:
+            indices: The positions of the packages to select.
+
+        Returns:
+            The new store.
+        """
+        indices = list(indices)
+        store = PackageStore()
+        store.kinds = self.kinds
+        store.licenses = self.licenses
+        store.purl_types = self.purl_types
+        store.sources = self.sources
+        for column in ("names", "versions", "purls", "urls"):
+            values = getattr(self, column)
+            setattr(store, column, [values[index] for index in indices])
+        for codes in (
+            "kind_codes",
+            "license_codes",
+            "purl_type_codes",
+            "source_codes",
+        ):
+            values = getattr(self, codes)
+            setattr(
+                store,
+                codes,
+                array(_CODE_TYPE, [values[index] for index in indices]),
+            )
+        store.depths = array(
+            _DEPTH_TYPE,
+            [self.depths[index] for index in indices],
+        )
+        return store
+
+    def filter_by_type(self, package_types: Iterable[str]) -> "PackageStore":
+        """Select the packages of the given purl types.
+
+        The packages are grouped by type in the order the types are
+        provided, like done by `filter_packages_by_type`.
+
+        Args:
+            package_types: The purl types to select.
+
+        Returns:
+            A store containing the matching packages.
+        """
+        buckets: Dict[int, List[int]] = {}
+        for purl_type in package_types:
+            code = self.purl_types.lookup(purl_type)
+            if code is not None:
+                buckets.setdefault(code, [])
+        for index, code in enumerate(self.purl_type_codes):
+            bucket = buckets.get(code)
+            if bucket is not None:
+                bucket.append(index)
+        return self.select(
+            index for bucket in buckets.values() for index in bucket
+        )
+
+    def sort_by(self, attribute: str) -> "PackageStore":
+        """Sort the packages by one of their attributes.
+
+        Dictionary encoded attributes are sorted by comparing integer
+        ranks instead of the values themselves.
+
+        Args:
+            attribute: The name of the attribute, e.g. "name" or "licenses".
+
+        Returns:
+            A sorted store.
+
+        Raises:
+            ValueError: If the attribute is unknown.
+        """
+        encoded = {
+            "kind": ("kinds", "kind_codes"),
+            "licenses": ("licenses", "license_codes"),
+            "purl_type": ("purl_types", "purl_type_codes"),
+            "sources": ("sources", "source_codes"),
+        }
+        plain = {
+            "name": "names",
+            "version": "versions",
+            "purl": "purls",
+            "url": "urls",
+            "depth": "depths",
+        }
+        if attribute in encoded:
+            dictionary, codes = encoded[attribute]
+            ranks = getattr(self, dictionary).ranks()
+            keys = [ranks[code] for code in getattr(self, codes)]
+        elif attribute in plain:
+            keys = getattr(self, plain[attribute])
+        else:
+            raise ValueError("Unknown attribute: {0}".format(attribute))
+        return self.select(sorted(range(len(self)), key=keys.__getitem__))
@@ -0,0 +1,268 @@
+"""Incremental scanning of BOM files.
+
+The scanner walks a CycloneDX document chunk by chunk and only decodes
+the values which are actually requested. Everything else is skipped by
+tracking the nesting of strings, objects and arrays, which keeps the
+memory usage bounded by the size of the largest single component
+instead of the size of the whole document.
+"""
+
+import codecs
+import json
+import re
+from typing import Any, BinaryIO, Dict, Iterator, Optional
+
+from mdbom.bom.bom import ProcessingError
+
+COMPONENTS_ID = "components"
+BOM_FORMAT_ID = "bomFormat"
+CHUNK_SIZE = 1 << 16
+SNIFF_CHUNK_SIZE = 1 << 12
+
+_whitespace_reg = re.compile(r"[ \t\n\r]*")
+_string_reg = re.compile(r'"[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+_container_reg = re.compile(
+    r'(?:[^"{}\[\]]+|"[^"\\]*(?:\\.[^"\\]*)*")*',
+    re.DOTALL,
+)
+_scalar_reg = re.compile(r"[^ \t\n\r,\]}]*")
+
+_QUOTE = '"'
+_OPENING = frozenset("{[")
+_UNEXPECTED_END = "Invalid BOM: unexpected end of data"
+
+_json_decoder = json.JSONDecoder()
+
+
+def iter_components(
+    stream: BinaryIO,
+    chunk_size: int = CHUNK_SIZE,
+) -> Iterator[Dict[Any, Any]]:
+    """Iterate over the top level components of a BOM.
+
+    Args:
+        stream:     A binary stream containing the BOM.
+        chunk_size: The number of bytes to read at once.
+
+    Yields:
+        One component at a time.
+    """
+    scanner = _Scanner(stream=stream, chunk_size=chunk_size)
+    for key in scanner.members():
+        if key == COMPONENTS_ID:
+            yield from scanner.elements()
+        else:
+            scanner.skip_value()
+
+
+def get_bom_format(
+    stream: BinaryIO,
+    chunk_size: int = SNIFF_CHUNK_SIZE,
+) -> Optional[str]:
+    """Get the format of a BOM without reading more than necessary.
+
+    The top level members preceding the format are skipped without
+    decoding them and reading stops as soon as the format is found.
+
+    Args:
+        stream:     A binary stream containing the BOM.
+        chunk_size: The number of bytes to read at once.
+
+    Returns:
+        The format, e.g. "CycloneDX", or None if the document is no
+        JSON object or has no format.
+
+    Raises:
+        ProcessingError: If the document is not valid JSON.
+    """
+    scanner = _Scanner(stream=stream, chunk_size=chunk_size)
+    if scanner.peek() != "{":
+        return None
+    for key in scanner.members():
+        if key == BOM_FORMAT_ID:
+            bom_format = scanner.capture_value()
+            return bom_format if isinstance(bom_format, str) else None
+        scanner.skip_value()
+    return None
+
+
+class _Scanner(object):
+    def __init__(self, stream: BinaryIO, chunk_size: int) -> None:
+        self._stream = stream
+        self._chunk_size = chunk_size
+        self._text_decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._buffer = ""
+        self._pos = 0
+        self._mark = -1
+        self._eof = False
+
+    def members(self) -> Iterator[str]:
+        """Iterate over the keys of the top level object.
+
+        The value belonging to a key has to be consumed by the caller
+        before the next key can be read.
+
+        Yields:
+            The keys of the top level object.
+        """
+        self._expect("{")
+        if self._peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            self._peek()
+            self._mark = self._pos
+            self._skip_string()
+            key = self._decode_marked()
+            self._expect(":")
+            yield key
+            if self._next_or_end("}"):
+                return
+
+    def elements(self) -> Iterator[Any]:
+        """Iterate over the decoded elements of an array value.
+
+        Yields:
+            The decoded elements.
+        """
+        self._expect("[")
+        if self._peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            yield self.capture_value()
+            if self._next_or_end("]"):
+                return
+
+    def capture_value(self) -> Any:
+        """Decode the next value.
+
+        Returns:
+            The decoded value.
+        """
+        self._peek()
+        try:
+            value, end = _json_decoder.raw_decode(self._buffer, self._pos)
+        except ValueError:
+            end = -1
+        if end >= 0 and (end < len(self._buffer) or self._eof):
+            self._pos = end
+            return value
+        # The value might be cut off by the end of the buffer, so its extent
+        # is determined first and the decoding is retried with all its data.
+        self._mark = self._pos
+        self._skip_value()
+        return self._decode_marked()
+
+    def peek(self) -> str:
+        """Get the next character which is not whitespace.
+
+        Returns:
+            The character.
+        """
+        return self._peek()
+
+    def skip_value(self) -> None:
+        """Skip the next value without decoding it."""
+        self._peek()
+        self._skip_value()
+
+    def _decode_marked(self) -> Any:
+        start = self._mark
+        self._mark = -1
+        try:
+            return json.loads(self._buffer[start : self._pos])
+        except ValueError as error:
+            raise ProcessingError("Invalid BOM: {0}".format(error))
+
+    def _fill(self) -> bool:
+        if self._eof:
+            return False
+        chunk = self._stream.read(self._chunk_size)
+        text = self._text_decoder.decode(chunk, final=not chunk)
+        self._eof = not chunk
+        keep = self._pos if self._mark < 0 else self._mark
+        self._buffer = self._buffer[keep:] + text
+        self._pos -= keep
+        if self._mark >= 0:
+            self._mark = 0
+        return not self._eof
+
+    def _peek(self) -> str:
+        while True:
+            match = _whitespace_reg.match(self._buffer, self._pos)
+            self._pos = match.end()  # type: ignore
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                raise ProcessingError(_UNEXPECTED_END)
+
+    def _expect(self, token: str) -> None:
+        if self._peek() != token:
+            raise ProcessingError(
+                "Invalid BOM: expected {0!r} at character {1}".format(
+                    token,
+                    self._pos,
+                ),
+            )
+        self._pos += 1
+
+    def _next_or_end(self, end: str) -> bool:
+        token = self._peek()
+        self._pos += 1
+        if token == ",":
+            return False
+        if token == end:
+            return True
+        raise ProcessingError(
+            "Invalid BOM: unexpected {0!r} at character {1}".format(
+                token,
+                self._pos - 1,
+            ),
+        )
+
+    def _skip_value(self) -> None:
+        first = self._buffer[self._pos]
+        if first == _QUOTE:
+            self._skip_string()
+        elif first in _OPENING:
+            self._skip_container()
+        else:
+            self._skip_scalar()
+
+    def _skip_string(self) -> None:
+        while True:
+            match = _string_reg.match(self._buffer, self._pos)
+            if match is not None:
+                self._pos = match.end()
+                return
+            if not self._fill():
+                raise ProcessingError(_UNEXPECTED_END)
+
+    def _skip_container(self) -> None:
+        depth = 0
+        while True:
+            match = _container_reg.match(self._buffer, self._pos)
+            self._pos = match.end()  # type: ignore
+            if self._pos == len(self._buffer):
+                if not self._fill():
+                    raise ProcessingError(_UNEXPECTED_END)
+                continue
+            token = self._buffer[self._pos]
+            if token == _QUOTE:
+                # A string which is cut off by the end of the buffer.
+                if not self._fill():
+                    raise ProcessingError(_UNEXPECTED_END)
+                continue
+            self._pos += 1
+            depth += 1 if token in _OPENING else -1
+            if not depth:
+                return
+
+    def _skip_scalar(self) -> None:
+        while True:
+            match = _scalar_reg.match(self._buffer, self._pos)
+            end = match.end()  # type: ignore
+            if end < len(self._buffer) or not self._fill():
+                self._pos = end
+                return
@@ -1,24 +1,131 @@
-"""Handling URL construction."""
+"""Handling URL construction.
 
-import logging
-import re
-from typing import Tuple
+URLs are created by resolvers registered per purl type. Most resolvers
+fill the parts of a purl into a URL pattern, e.g.
+`https://crates.io/crates/{name}/{version}`, which is parsed once when
+it is registered. Further resolvers can be registered via entry points
+of the `mdbom.url_resolvers` group or via a JSON file mapping purl types
+to patterns, which is named by the `MDBOM_URL_RESOLVERS` environment
+variable and takes precedence.
+"""
+
+import json
+import os
+from functools import lru_cache
+from string import Formatter
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from mdbom.bom.bom import ProcessingError
+from mdbom.bom.diagnostics import (
+    INCOMPLETE_PURL,
+    INVALID_PURL,
+    UNSUPPORTED_TYPE,
+    report_issue,
+)
+from mdbom.bom.purl import PURL, parse_purl
 
-TYPE_GROUP_ID = "type"
-REST_GROUP_ID = "rest"
 NPM_TYPE = "npm"
 GOLANG_TYPE = "golang"
 
-logger = logging.getLogger("MdBOM")
+RESOLVERS_ENV = "MDBOM_URL_RESOLVERS"
+RESOLVERS_ENTRY_POINT_GROUP = "mdbom.url_resolvers"
 
-purl_reg = re.compile(r"pkg:(?P<type>[a-z]+)\/(?P<rest>\S*)")
+# The parts of a purl which can be used within URL patterns.
+PURL_FIELDS = frozenset(
+    ("type", "namespace", "name", "package", "version", "subpath"),
+)
 
+# The built-in URL patterns per purl type.
+url_patterns = {
+    "pypi": "https://pypi.org/project/{package}/{version}",
+    "npm": "https://www.npmjs.com/package/{package}/v/{version}",
+    "golang": "https://pkg.go.dev/{package}@{version}",
+    "maven": (
+        "https://central.sonatype.com/artifact/{namespace}/{name}/{version}"
+    ),
+    "cargo": "https://crates.io/crates/{name}/{version}",
+    "nuget": "https://www.nuget.org/packages/{name}/{version}",
+    "gem": "https://rubygems.org/gems/{name}/versions/{version}",
+    "composer": "https://packagist.org/packages/{package}#{version}",
+    "deb": "https://sources.debian.org/src/{name}/{version}/",
+    "docker": "https://hub.docker.com/r/{package}/tags?name={version}",
+    "github": "https://github.com/{namespace}/{name}/tree/{version}",
+}
+
+# The base URLs of the originally supported purl types, kept for
+# compatibility only, URLs are created by the resolvers instead.
 url_types = {
     "pypi": "https://pypi.org/project/",
     "npm": "https://www.npmjs.com/package/",
     "golang": "https://pkg.go.dev/",
 }
 
+Resolver = Callable[[PURL], str]
+
+
+class PatternResolver(object):
+    """Creates URLs by filling the parts of a purl into a pattern."""
+
+    def __init__(self, pattern: str) -> None:
+        """Parse a URL pattern.
+
+        Args:
+            pattern: The pattern, referring to the parts of the purl as
+                `{type}`, `{namespace}`, `{name}`, `{package}`, which is
+                the namespace and name, `{version}` and `{subpath}`.
+
+        Raises:
+            ValueError: If the pattern refers to unknown parts.
+        """
+        fields = [
+            field
+            for _, field, _, _ in Formatter().parse(pattern)
+            if field is not None
+        ]
+        unknown = sorted(set(fields) - PURL_FIELDS)
+        if unknown:
+            raise ValueError(
+                "Unknown fields in URL pattern {0}: {1}".format(
+                    pattern,
+                    ", ".join(unknown),
+                ),
+            )
+        self.pattern = pattern
+        self.fields = tuple(dict.fromkeys(fields))
+        self._format = pattern.format
+
+    def __call__(self, purl: PURL) -> str:
+        """Create the URL of a package.
+
+        Args:
+            purl: The parsed purl of the package.
+
+        Returns:
+            The URL or an empty string if a part used by the pattern is
+            missing.
+        """
+        values = {field: _get_field(purl, field) for field in self.fields}
+        if not all(values.values()):
+            return ""
+        return self._format(**values)
+
+
+resolvers: Dict[str, Resolver] = {
+    purl_type: PatternResolver(pattern)
+    for purl_type, pattern in url_patterns.items()
+}
+# The versions of the distributions providing resolvers via entry points.
+_entry_point_versions: Dict[str, str] = {}
+
 
 def get_url(purl: str) -> str:
     """Construct the package URL from provided purl.
@@ -29,18 +136,51 @@ def get_url(purl: str) -> str:
     Returns:
         A URL to the package.
     """
-    purl_type = get_purl_type(purl=purl)
-    if purl_type:
+    parsed_purl = parse_purl(purl)
+    if parsed_purl is not None:
         return _convert_purl_to_url(
             purl=purl,
-            purl_type=purl_type,
+            purl_type=parsed_purl.kind,
         )
-    logger.warning(
-        "No valid purl: {0} provided, returning empty URL".format(purl),
+    report_issue(
+        INVALID_PURL,
+        "No valid purl: %(purl)s provided, returning empty URL",
+        purl,
     )
     return ""
 
 
+def resolve_urls(purls: Iterable[str]) -> List[str]:
+    """Construct the URLs of many packages.
+
+    Every distinct purl is resolved only once, grouped by purl type, so
+    the cost depends on the number of distinct purls instead of the
+    number of components. Issues are reported once per distinct purl.
+
+    Args:
+        purls: The purls of the packages.
+
+    Returns:
+        The URLs of the packages, in the order of the purls.
+    """
+    purls = list(purls)
+    by_type: Dict[str, List[Tuple[str, PURL]]] = {}
+    urls: Dict[str, str] = {}
+    for purl in dict.fromkeys(purls):
+        parsed_purl = parse_purl(purl)
+        if parsed_purl is None:
+            urls[purl] = get_url(purl)
+        else:
+            by_type.setdefault(parsed_purl.kind, []).append(
+                (purl, parsed_purl),
+            )
+    for purl_type, parsed_purls in by_type.items():
+        resolver = get_resolver(purl_type)
+        for purl, parsed_purl in parsed_purls:
+            urls[purl] = _resolve(purl, parsed_purl, resolver)
+    return [urls[purl] for purl in purls]
+
+
 def get_purl_type(purl: str) -> str:
     """Extract the package type from provided purl.
 
@@ -50,55 +190,194 @@ def get_purl_type(purl: str) -> str:
     Returns:
         A type to the package.
     """
-    match = purl_reg.match(purl)
-    if match:
-        return match.group(TYPE_GROUP_ID)
-    logger.warning(
-        "No valid purl: {0} provided, returning empty type".format(purl),
+    parsed_purl = parse_purl(purl)
+    if parsed_purl is not None:
+        return parsed_purl.kind
+    report_issue(
+        INVALID_PURL,
+        "No valid purl: %(purl)s provided, returning empty type",
+        purl,
     )
     return ""
 
 
-def _get_package_and_version(purl: str) -> Tuple[str, str]:
-    package, version = "", ""
-    match = purl_reg.match(purl)
-    if match:
-        result = match.group(REST_GROUP_ID).split("@")
-        if len(result) == 2:
-            package = result[0]
-            version = _extract_version(result[1])
-    return package, version
+def get_resolver(purl_type: str) -> Optional[Resolver]:
+    """Get the resolver of a purl type.
+
+    The configured resolvers are loaded on first use.
+
+    Args:
+        purl_type: The purl type, e.g. "pypi".
+
+    Returns:
+        The resolver or None if the purl type is not supported.
+    """
+    configure_resolvers()
+    return resolvers.get(purl_type)
+
+
+def register_resolver(
+    purl_type: str,
+    resolver: Union[str, Resolver],
+) -> None:
+    """Register the resolver of a purl type, replacing any previous one.
+
+    The resolver is only registered within the current process. Worker
+    processes, e.g. of `get_packages_from_bom` with multiple jobs, do
+    not see it if they are spawned instead of forked. Resolvers of entry
+    points and of the `MDBOM_URL_RESOLVERS` file are loaded by every
+    process instead.
+
+    Args:
+        purl_type: The purl type, e.g. "conda".
+        resolver: A URL pattern, see `PatternResolver`, or a function
+            creating the URL from a parsed purl.
+
+    Raises:
+        ValueError: If the pattern refers to unknown parts.
+    """
+    if isinstance(resolver, str):
+        resolver = PatternResolver(resolver)
+    resolvers[purl_type] = resolver
+
+
+def load_resolvers(filename: str) -> None:
+    """Register the URL patterns of a JSON file.
+
+    Args:
+        filename: The path to a JSON file mapping purl types to patterns.
+
+    Raises:
+        ProcessingError: If the file cannot be read or is invalid.
+    """
+    try:
+        with open(filename, "rb") as read_file:
+            patterns = json.load(read_file)
+    except OSError as error:
+        raise ProcessingError(
+            "Cannot read URL resolvers: {0}".format(error.strerror),
+            source=filename,
+        )
+    except ValueError as error:
+        raise ProcessingError(
+            "Invalid URL resolvers: {0}".format(error),
+            source=filename,
+        )
+    if not isinstance(patterns, dict):
+        raise ProcessingError(
+            "URL resolvers must map purl types to patterns",
+            source=filename,
+        )
+    for purl_type, pattern in patterns.items():
+        _register_configured(purl_type, pattern, filename)
 
 
-def _extract_version(content: str) -> str:
-    version = content
-    if "?" in content:
-        version = content.split("?")[0]
-    else:
-        version = content
-    return version
+@lru_cache(maxsize=None)
+def configure_resolvers() -> None:
+    """Register the resolvers of entry points and the configured file.
+
+    This only happens once per process, later calls do nothing.
+
+    Raises:
+        ProcessingError: If a resolver is invalid.
+    """
+    for entry_point in _get_entry_points():
+        _register_configured(entry_point.name, entry_point.load(), "")
+        distribution = getattr(entry_point, "dist", None)
+        _entry_point_versions[entry_point.name] = getattr(
+            distribution,
+            "version",
+            "",
+        )
+    filename = os.environ.get(RESOLVERS_ENV)
+    if filename:
+        load_resolvers(filename)
+
+
+def describe_resolvers() -> List[Tuple[str, str]]:
+    """Describe the configured resolvers, e.g. as part of cache keys.
+
+    Returns:
+        The purl types together with the pattern of their resolver or the
+        qualified name of their resolver function, which is followed by
+        the version of its distribution for entry points, sorted by purl
+        type.
+    """
+    configure_resolvers()
+    return sorted(
+        (purl_type, _describe_resolver(purl_type, resolver))
+        for purl_type, resolver in resolvers.items()
+    )
+
+
+def _describe_resolver(purl_type: str, resolver: Resolver) -> str:
+    if isinstance(resolver, PatternResolver):
+        return resolver.pattern
+    description = "{0}.{1}".format(
+        getattr(resolver, "__module__", ""),
+        getattr(resolver, "__qualname__", repr(resolver)),
+    )
+    version = _entry_point_versions.get(purl_type)
+    if version:
+        return "{0}@{1}".format(description, version)
+    return description
+
+
+def _register_configured(purl_type: str, resolver: Any, source: str) -> None:
+    if not isinstance(resolver, str) and not callable(resolver):
+        raise ProcessingError(
+            "Invalid URL resolver for {0}".format(purl_type),
+            source=source,
+        )
+    try:
+        register_resolver(purl_type, resolver)
+    except ValueError as error:
+        raise ProcessingError(str(error), source=source)
+
+
+def _get_entry_points() -> Iterable[Any]:
+    try:
+        from importlib.metadata import entry_points  # noqa: WPS433
+    except ImportError:
+        return []
+    all_entry_points = entry_points()
+    if hasattr(all_entry_points, "select"):
+        return all_entry_points.select(group=RESOLVERS_ENTRY_POINT_GROUP)
+    return all_entry_points.get(RESOLVERS_ENTRY_POINT_GROUP, [])
+
+
+def _get_field(purl: PURL, field: str) -> str:
+    if field == "type":
+        return purl.kind
+    if field == "package":
+        return purl.package
+    return getattr(purl, field) or ""
 
 
 def _convert_purl_to_url(purl, purl_type: str) -> str:
-    if purl_type not in url_types:
-        logger.warning(
-            "Package type: {0} not supported, returning empty URL".format(
-                purl_type,
-            ),
+    parsed_purl = parse_purl(purl)
+    resolver = get_resolver(purl_type)
+    if parsed_purl is None:
+        # Reported as incomplete below, unless the type is not supported.
+        parsed_purl = PURL(purl_type, "", "", None, "", "")
+    return _resolve(purl, parsed_purl, resolver)
+
+
+def _resolve(purl: str, parsed_purl: PURL, resolver: Optional[Resolver]) -> str:
+    if resolver is None:
+        report_issue(
+            UNSUPPORTED_TYPE,
+            "Package type: %(purl_type)s not supported, returning empty URL",
+            purl,
+            parsed_purl.kind,
         )
         return ""
-    url = url_types[purl_type]
-    package, version = _get_package_and_version(purl)
-    if package and version:
-        if purl_type == NPM_TYPE:
-            url += "{0}/v/{1}".format(package, version)
-        elif purl_type == GOLANG_TYPE:
-            url += "{0}@{1}".format(package, version)
-        else:
-            url += "{0}/{1}".format(package, version)
-    else:
-        logger.warning(
-            "No valid purl: {0} provided, returning empty URL".format(purl),
+    url = resolver(parsed_purl)
+    if not url:
+        report_issue(
+            INCOMPLETE_PURL,
+            "No valid purl: %(purl)s provided, returning empty URL",
+            purl,
+            parsed_purl.kind,
         )
-        url = ""
     return url
@@ -0,0 +1,199 @@
+"""Handling the content addressed cache of MdBOM.
+
+All entries are stored below a single cache directory and are keyed on
+hashes of their inputs, so outdated entries are never reused but simply
+no longer looked up.
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+from typing import Any, Dict, Iterable, List, Optional
+
+from mdbom.bom.bom import Package
+
+CACHE_DIR_ENV = "MDBOM_CACHE_DIR"
+OUTPUTS_CACHE_DIR = "outputs"
+PACKAGES_CACHE_DIR = "packages"
+# Has to be increased whenever the format of cached entries changes.
+CACHE_FORMAT = "2"
+
+_HASH_CHUNK_SIZE = 1 << 20
+
+
+def get_cache_dir() -> str:
+    """Get the default cache directory of MdBOM.
+
+    The directory can be set via the `MDBOM_CACHE_DIR` environment
+    variable and otherwise follows the XDG base directory specification.
+
+    Returns:
+        The path to the cache directory.
+    """
+    cache_dir = os.environ.get(CACHE_DIR_ENV)
+    if cache_dir is not None:
+        return cache_dir
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"),
+        ".cache",
+    )
+    return os.path.join(cache_home, "mdbom")
+
+
+def get_version() -> str:
+    """Get the installed version of MdBOM.
+
+    Returns:
+        The version or "unknown" if MdBOM is not installed.
+    """
+    try:
+        from importlib.metadata import PackageNotFoundError, version
+    except ImportError:
+        return "unknown"
+    try:
+        return version("mdbom")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def hash_file(filename: str) -> str:
+    """Hash the content of a file.
+
+    Args:
+        filename: The path to the file.
+
+    Returns:
+        The SHA-256 hex digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(filename, "rb") as read_file:
+        for chunk in iter(lambda: read_file.read(_HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def hash_values(values: Iterable[Any]) -> str:
+    """Hash a sequence of JSON serializable values.
+
+    Args:
+        values: The values to hash.
+
+    Returns:
+        The SHA-256 hex digest of the values.
+    """
+    digest = hashlib.sha256(CACHE_FORMAT.encode())
+    for value in values:
+        digest.update(json.dumps(value, sort_keys=True).encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def is_output_cached(cache_dir: str, key: str) -> bool:
+    """Check whether the outputs of a run are still up to date.
+
+    Outputs are up to date if a previous run stored them for the same
+    key and none of them was removed or modified since.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The key of the run, e.g. created via `hash_values`.
+
+    Returns:
+        True if the outputs do not have to be generated again.
+    """
+    entry = _read_entry(os.path.join(cache_dir, OUTPUTS_CACHE_DIR, key))
+    if entry is None:
+        return False
+    return all(
+        _get_file_state(file_name) == state for file_name, state in entry
+    )
+
+
+def store_outputs(cache_dir: str, key: str, file_names: List[str]) -> None:
+    """Remember the outputs of a run.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The key of the run.
+        file_names: The generated files.
+    """
+    _write_entry(
+        os.path.join(cache_dir, OUTPUTS_CACHE_DIR, key),
+        [(file_name, _get_file_state(file_name)) for file_name in file_names],
+    )
+
+
+def load_packages(
+    cache_dir: str,
+    key: str,
+    source: str,
+) -> Optional[List[Package]]:
+    """Load the packages previously extracted from a BOM file.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The content hash of the BOM file.
+        source: The BOM file the packages are loaded for.
+
+    Returns:
+        The packages or None if they are not cached.
+    """
+    entry = _read_entry(os.path.join(cache_dir, PACKAGES_CACHE_DIR, key))
+    if entry is None:
+        return None
+    sources = (source,)
+    return [Package(**row, sources=sources) for row in entry]
+
+
+def store_packages(
+    cache_dir: str,
+    key: str,
+    packages: List[Package],
+) -> None:
+    """Store the packages extracted from a BOM file.
+
+    Args:
+        cache_dir: The cache directory.
+        key: The content hash of the BOM file.
+        packages: The extracted packages.
+    """
+    _write_entry(
+        os.path.join(cache_dir, PACKAGES_CACHE_DIR, key),
+        [_get_package_row(package) for package in packages],
+    )
+
+
+def _get_package_row(package: Package) -> Dict[str, Any]:
+    row = package._asdict()
+    row.pop("sources")
+    return row
+
+
+def _get_file_state(file_name: str) -> Optional[List[int]]:
+    try:
+        stat = os.stat(file_name)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _read_entry(path: str) -> Any:
+    try:
+        with open(path, "r") as read_file:
+            return json.load(read_file)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_entry(path: str, content: Any) -> None:
+    directory = os.path.dirname(path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+        handle, temp_path = tempfile.mkstemp(dir=directory)
+        with os.fdopen(handle, "w") as write_file:
+            json.dump(content, write_file)
+        os.replace(temp_path, path)
+    except OSError:
+        # The cache is an optimization only, so failures are ignored.
+        return
@@ -1,38 +1,288 @@
 """Handling markdown conversion."""
 
-from typing import List
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, TextIO, Tuple
 
-from jinja2 import Environment
+from jinja2 import (
+    Environment,
+    FileSystemBytecodeCache,
+    FileSystemLoader,
+    Template,
+    TemplateNotFound,
+    meta,
+)
 
 from mdbom.bom.bom import Package
+from mdbom.bom.licenses import LicenseTexts
+from mdbom.cache import get_cache_dir
+from mdbom.md.views import create_context
+from mdbom.stats import (
+    BYTES_WRITTEN_COUNTER,
+    COMPILE_STAGE,
+    RENDER_STAGE,
+    WRITE_STAGE,
+    Stats,
+    count,
+    measure,
+)
+
+TEMPLATE_CACHE_DIR = "templates"
+WRITE_BUFFER_SIZE = 1024
 
 
 class GeneratingError(RuntimeError):
     """Generating error for raising generation specific error."""
 
 
-def generate_markdown(template, file_name: str, packages: List[Package]):
+def generate_markdown(
+    template,
+    file_name: str,
+    packages: Iterable[Package],
+    cache_dir: Optional[str] = None,
+    stats: Optional[Stats] = None,
+    license_texts: Optional[LicenseTexts] = None,
+):
     """Generate markdown file from provided template.
 
+    The rendered content is written to the file chunk by chunk, so the
+    packages can also be provided lazily, e.g. by a generator. Besides
+    the packages, the template can use the views of `create_context`.
+
+    Args:
+        template: The template which should be used.
+        file_name: The file in which the result should be stored.
+        packages: The packages, either as list or as iterator.
+        cache_dir: The directory for caching compiled templates, defaults
+            to the directory returned by `get_cache_dir`.
+        stats: Records the compile, render and write stages.
+        license_texts: The license texts provided by `license_index`.
+
+    Raises:
+        GeneratingError: If not all requirements are satisfied.
+    """
+    render_markdown(
+        template=template,
+        file_name=file_name,
+        context=create_context(packages, license_texts),
+        cache_dir=cache_dir,
+        stats=stats,
+    )
+
+
+def render_markdown(
+    template,
+    file_name: str,
+    context: Dict[str, Any],
+    cache_dir: Optional[str] = None,
+    stats: Optional[Stats] = None,
+):
+    """Render a template with an arbitrary context into a file.
+
     Args:
         template: The template which should be used.
         file_name: The file in which the result should be stored.
-        packages: The package list.
+        context: The variables available within the template.
+        cache_dir: The directory for caching compiled templates, defaults
+            to the directory returned by `get_cache_dir`.
+        stats: Records the compile, render and write stages.
 
     Raises:
         GeneratingError: If not all requirements are satisfied.
     """
     if template:
         if file_name:
-            with open(template, "r") as template_file:
-                md_template = template_file.read()
-
-            md_env = Environment(autoescape=True).from_string(md_template)
-            content = md_env.render(packages=packages)
+            with measure(stats, COMPILE_STAGE):
+                md_template = load_template(
+                    template=template,
+                    cache_dir=cache_dir,
+                )
 
             with open(file_name, "w") as result_file:
-                result_file.write(content)
+                if stats is None:
+                    result_file.writelines(md_template.stream(context))
+                else:
+                    _dump_measured(md_template, context, result_file, stats)
+            count(stats, BYTES_WRITTEN_COUNTER, os.path.getsize(file_name))
         else:
             raise GeneratingError("No valid output file name provided.")
     else:
         raise GeneratingError("No valid template provided.")
+
+
+def generate_markdown_files(
+    targets: Iterable[Tuple[Any, str, Iterable[Package]]],
+    jobs: Optional[int] = None,
+    cache_dir: Optional[str] = None,
+    stats: Optional[Stats] = None,
+    license_texts: Optional[LicenseTexts] = None,
+) -> List[str]:
+    """Generate multiple markdown files concurrently.
+
+    Each target is rendered in a thread of a shared pool. If packages are
+    provided lazily, they must not be shared between targets.
+
+    Args:
+        targets: Triples of template, output file name and packages.
+        jobs: The maximum number of threads, defaults to the number of
+            targets.
+        cache_dir: The directory for caching compiled templates.
+        stats: Records the compile, render and write stages.
+        license_texts: The license texts provided by `license_index`.
+
+    Returns:
+        The names of the generated files.
+
+    Raises:
+        GeneratingError: If not all requirements are satisfied.
+    """
+    targets = list(targets)
+    if len(targets) <= 1 or jobs == 1:
+        for template, file_name, packages in targets:
+            generate_markdown(
+                template,
+                file_name,
+                packages,
+                cache_dir,
+                stats,
+                license_texts,
+            )
+    else:
+        with ThreadPoolExecutor(max_workers=jobs or len(targets)) as executor:
+            futures = [
+                executor.submit(
+                    generate_markdown,
+                    template,
+                    file_name,
+                    packages,
+                    cache_dir,
+                    stats,
+                    license_texts,
+                )
+                for template, file_name, packages in targets
+            ]
+            for future in futures:
+                future.result()
+    return [file_name for _, file_name, _ in targets]
+
+
+def load_template(template, cache_dir: Optional[str] = None) -> Template:
+    """Load a template through a shared, cached environment.
+
+    The directory containing the template is used as search path, so
+    other templates can be included or extended relative to it.
+
+    Args:
+        template: The path to the template.
+        cache_dir: The directory for caching compiled templates.
+
+    Returns:
+        The compiled template.
+
+    Raises:
+        GeneratingError: If the template does not exist.
+    """
+    search_path, template_name = os.path.split(os.path.abspath(template))
+    md_env = get_environment(
+        search_path=search_path,
+        cache_dir=get_cache_dir() if cache_dir is None else cache_dir,
+    )
+    try:
+        return md_env.get_template(template_name)
+    except TemplateNotFound:
+        raise GeneratingError("Provided template does not exist.")
+
+
+def get_template_files(template) -> Optional[List[str]]:
+    """Get the files a template consists of.
+
+    Besides the template itself, all templates it includes, imports or
+    extends are returned, following these references recursively.
+
+    Args:
+        template: The path to the template.
+
+    Returns:
+        The files of the template or None if a referenced template is
+        only known at render time or is not loaded from a file.
+
+    Raises:
+        GeneratingError: If a template does not exist.
+    """
+    search_path, template_name = os.path.split(os.path.abspath(template))
+    md_env = get_environment(search_path=search_path)
+    template_files: Dict[str, str] = {}
+    pending = [template_name]
+    while pending:
+        name = pending.pop()
+        if name in template_files:
+            continue
+        try:
+            source, file_name, _ = md_env.loader.get_source(  # type: ignore
+                md_env,
+                name,
+            )
+        except TemplateNotFound:
+            raise GeneratingError("Provided template does not exist.")
+        if file_name is None:
+            # Templates without a file cannot be checked for changes.
+            return None
+        template_files[name] = file_name
+        references = list(meta.find_referenced_templates(md_env.parse(source)))
+        if None in references:
+            return None
+        pending.extend(references)
+    return sorted(template_files.values())
+
+
+@lru_cache(maxsize=None)
+def get_environment(search_path: str, cache_dir: str = "") -> Environment:
+    """Get the environment for templates within a directory.
+
+    Environments are reused within the process, which also keeps the
+    compiled templates in memory. If a cache directory is provided, the
+    compiled templates are additionally stored on disk, keyed on the
+    template source, and reused between runs.
+
+    Args:
+        search_path: The directory containing the templates.
+        cache_dir: The directory for caching compiled templates, an empty
+            value disables the cache on disk.
+
+    Returns:
+        The environment.
+    """
+    return Environment(
+        loader=FileSystemLoader(search_path),
+        autoescape=True,
+        bytecode_cache=_get_bytecode_cache(cache_dir),
+    )
+
+
+def _dump_measured(
+    md_template: Template,
+    context: Dict[str, Any],
+    result_file: TextIO,
+    stats: Stats,
+) -> None:
+    template_stream = md_template.stream(context)
+    # Measuring every single chunk would cost more than writing it.
+    template_stream.enable_buffering(WRITE_BUFFER_SIZE)
+    with stats.stage(RENDER_STAGE):
+        for chunk in template_stream:
+            with stats.stage(WRITE_STAGE):
+                result_file.write(chunk)
+        with stats.stage(WRITE_STAGE):
+            result_file.flush()
+
+
+def _get_bytecode_cache(cache_dir: str) -> Optional[FileSystemBytecodeCache]:
+    if not cache_dir:
+        return None
+    directory = os.path.join(cache_dir, TEMPLATE_CACHE_DIR)
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        return None
+    return FileSystemBytecodeCache(directory=directory)
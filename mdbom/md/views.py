@@ -0,0 +1,146 @@
+"""Handling precomputed views of packages for templates.
+
+Besides the `packages` themselves, templates can use the packages sorted
+by name as `packages_sorted`, and grouped by purl type or by license as
+`packages_by_type` and `packages_by_license`. `license_index` maps
+every single license to the packages using it, see `LicenseIndex`.
+Sorting and grouping within Python is much faster than with the `sort`
+and `groupby` filters of Jinja, especially if a template uses the same
+order in several sections.
+
+The views are only built when a template accesses them, with a single
+sort each, and are kept for the rest of the render.
+"""
+
+from collections.abc import Mapping, Sequence
+from itertools import groupby
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional
+
+from mdbom.bom.bom import Package, get_name_key
+from mdbom.bom.licenses import LicenseIndex, LicenseTexts
+
+PACKAGES_ID = "packages"
+PACKAGES_SORTED_ID = "packages_sorted"
+PACKAGES_BY_TYPE_ID = "packages_by_type"
+PACKAGES_BY_LICENSE_ID = "packages_by_license"
+LICENSE_INDEX_ID = "license_index"
+
+
+class SortedPackages(Sequence):
+    """The packages sorted by name and version, sorted on first access."""
+
+    def __init__(self, source: "_Source") -> None:
+        """Create the view.
+
+        Args:
+            source: The packages to sort.
+        """
+        self._source = source
+        self._packages: Optional[List[Package]] = None
+
+    def __getitem__(self, index: Any) -> Any:
+        return self._load()[index]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self) -> Iterator[Package]:
+        return iter(self._load())
+
+    def _load(self) -> List[Package]:
+        if self._packages is None:
+            self._packages = sorted(self._source.get(), key=get_name_key)
+        return self._packages
+
+
+class GroupedPackages(Mapping):
+    """The packages grouped by a key, grouped on first access.
+
+    The groups are sorted by their key and the packages of each group by
+    name and version.
+    """
+
+    def __init__(
+        self,
+        source: "_Source",
+        key: Callable[[Package], str],
+    ) -> None:
+        """Create the view.
+
+        Args:
+            source: The packages to group.
+            key: The function returning the group of a package.
+        """
+        self._source = source
+        self._key = key
+        self._groups: Optional[Dict[str, List[Package]]] = None
+
+    def __getitem__(self, group: str) -> List[Package]:
+        return self._load()[group]
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def _load(self) -> Dict[str, List[Package]]:
+        if self._groups is None:
+            keyed = sorted(
+                ((self._key(package), package) for package in self._source),
+                key=lambda item: (item[0], get_name_key(item[1])),
+            )
+            self._groups = {
+                group: [package for _, package in items]
+                for group, items in groupby(keyed, key=lambda item: item[0])
+            }
+        return self._groups
+
+
+def create_context(
+    packages: Iterable[Package],
+    license_texts: Optional[LicenseTexts] = None,
+) -> Dict[str, Any]:
+    """Create the context of a template.
+
+    Args:
+        packages: The packages, either as list or as iterator. Iterators
+            are only read into memory if the template accesses a view, in
+            which case the template must not iterate `packages` as well.
+        license_texts: The texts provided by the license index, if any.
+
+    Returns:
+        The packages and their views by their names within templates.
+    """
+    source = _Source(packages)
+    return {
+        PACKAGES_ID: packages,
+        PACKAGES_SORTED_ID: SortedPackages(source),
+        PACKAGES_BY_TYPE_ID: GroupedPackages(source, _get_purl_type),
+        PACKAGES_BY_LICENSE_ID: GroupedPackages(source, _get_licenses),
+        LICENSE_INDEX_ID: LicenseIndex(source, license_texts),
+    }
+
+
+class _Source(object):
+    def __init__(self, packages: Iterable[Package]) -> None:
+        self._packages = packages
+        self._loaded = hasattr(packages, "__len__")
+
+    def __iter__(self) -> Iterator[Package]:
+        return iter(self.get())
+
+    def get(self) -> Iterable[Package]:
+        if not self._loaded:
+            # All views share the packages of an iterator.
+            self._packages = list(self._packages)
+            self._loaded = True
+        return self._packages
+
+
+def _get_purl_type(package: Package) -> str:
+    return package.purl_type
+
+
+def _get_licenses(package: Package) -> str:
+    return package.licenses or ""
@@ -5,27 +5,48 @@ file and extracts relevant data from it for
 creating a 3rd party software markdown document.
 """
 
+import json
 import logging
+import os
+from functools import partial
+from typing import TYPE_CHECKING, Iterable, List, Optional, Sequence, Tuple
 
 import click
 
-from mdbom.bom.bom import ProcessingError
-from mdbom.bom.processor import filter_packages_by_type, get_packages_from_bom
-from mdbom.md.md import GeneratingError, generate_markdown
+from mdbom.bom.bom import Package, ProcessingError
+from mdbom.bom.decoding import AUTO_BACKEND, get_json_decoder, json_backends
 
-log_handler = logging.StreamHandler()
-log_handler.setLevel(logging.INFO)
-log_formatter = logging.Formatter("%(levelname)s [%(module)s] : %(message)s")
-log_handler.setFormatter(log_formatter)
+if TYPE_CHECKING:  # pragma: no cover
+    from asyncio.base_events import Server  # noqa: F401
 
-logging.basicConfig(level=logging.NOTSET, handlers=[log_handler])
+    from mdbom.bom.licenses import LicenseTexts  # noqa: F401
+    from mdbom.stats import Stats  # noqa: F401
+
+# The modules processing BOMs and rendering templates are only imported
+# by the commands using them, so e.g. `mdb --help` starts quickly.
 
 logger = logging.getLogger("MdBOM")
 
+UNKNOWN_TYPE = "unknown"
+
 
 @click.group()
 def cli():
     """Run the main entry point for MdBOM."""
+    configure_logging()
+
+
+def configure_logging() -> None:
+    """Print the log messages of MdBOM to stderr.
+
+    Nothing is changed if logging was already configured.
+    """
+    log_handler = logging.StreamHandler()
+    log_handler.setLevel(logging.INFO)
+    log_handler.setFormatter(
+        logging.Formatter("%(levelname)s [%(module)s] : %(message)s"),
+    )
+    logging.basicConfig(level=logging.NOTSET, handlers=[log_handler])
 
 
 @click.command()
@@ -44,55 +65,753 @@ def info():
 )
 @click.option(
     "--output",
-    "output_file",
-    default="3rd-party.md",
-    help="Target .md file",
+    "output_files",
+    default=["3rd-party.md"],
+    multiple=True,
+    help="Target .md file, can be repeated together with --template",
 )
 @click.option(
     "--template",
-    "template_file",
-    default="template.md.jinja",
-    help="The Jinja2 template file",
+    "template_files",
+    default=["template.md.jinja"],
+    multiple=True,
+    help="The Jinja2 template file, can be repeated together with --output",
 )
 @click.option(
     "--type",
     "package_type",
     default="",
-    help="Can be used to focus on a single package type [pypi|npm|golang].",
+    help="Can be used to focus on package types, e.g. pypi or pypi,npm.",
+)
+@click.option(
+    "--stream",
+    "stream",
+    is_flag=True,
+    default=False,
+    help="Read the components incrementally to keep memory usage flat.",
+)
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of processes for a directory input [default: CPU count].",
+)
+@click.option(
+    "--deduplicate",
+    "deduplicate",
+    is_flag=True,
+    default=False,
+    help="Merge packages which occur in multiple BOM files.",
+)
+@click.option(
+    "--split-by-type",
+    "split_by_type",
+    is_flag=True,
+    default=False,
+    help="Generate one output file per package type.",
+)
+@click.option(
+    "--incremental",
+    "incremental",
+    is_flag=True,
+    default=False,
+    help="Skip the generation if no input changed since the last run.",
+)
+@click.option(
+    "--include",
+    "include",
+    multiple=True,
+    help="Only process matching files of a directory, can be repeated.",
+)
+@click.option(
+    "--exclude",
+    "exclude",
+    multiple=True,
+    help="Skip matching files and directories, can be repeated.",
+)
+@click.option(
+    "--json-backend",
+    "json_backend",
+    type=click.Choice([AUTO_BACKEND, *json_backends]),
+    default=AUTO_BACKEND,
+    show_default=True,
+    help="The JSON decoder, auto uses the fastest one installed.",
+)
+@click.option(
+    "--stats",
+    "show_stats",
+    is_flag=True,
+    default=False,
+    help="Report time and peak memory per stage.",
+)
+@click.option(
+    "--stats-file",
+    "stats_file",
+    default="",
+    help="Write the stage report as JSON to the given file.",
+)
+@click.option(
+    "--profile",
+    "profile_file",
+    default="",
+    help="Write a cProfile of the run to the given file.",
+)
+@click.option(
+    "--diagnostics-file",
+    "diagnostics_file",
+    default="",
+    help="Write all purl issues as JSON to the given file.",
+)
+@click.option(
+    "--license-texts",
+    "license_dir",
+    default="",
+    help="Directory with one text file per license for license_index.",
 )
-def generate(input_path, output_file, template_file, package_type):
+def generate(  # noqa: WPS211
+    input_path,
+    output_files,
+    template_files,
+    package_type,
+    stream,
+    jobs,
+    deduplicate,
+    split_by_type,
+    incremental,
+    include,
+    exclude,
+    json_backend,
+    show_stats,
+    stats_file,
+    profile_file,
+    diagnostics_file,
+    license_dir,
+):
     """Processes a given BOM file and generates the markdown file.
 
     Args:
         input_path:     The input_path, can be a single file or a directory.
-        output_file:    The output_file where the result should be stored.
-        template_file:  The template_file to be used for markdown generation.
-        package_type:   Can be used to set the focus on a specific package
-                        type like pypi
+        output_files:   The output_files where the results should be stored.
+        template_files: The template_files to be used for markdown
+                        generation, one per output file
+        package_type:   Can be used to set the focus on specific package
+                        types like pypi, multiple types are separated
+                        by commas
+        stream:         Process the BOM as a lazy pipeline instead of
+                        loading it completely
+        jobs:           The number of processes used for processing the
+                        BOM files of a directory
+        deduplicate:    Merge packages occurring in multiple BOM files
+                        into a single package
+        split_by_type:  Generate one output file per package type, named
+                        after the output file with the type appended
+        incremental:    Use the cache directory to skip the generation
+                        if neither the BOM files, the templates nor the
+                        options changed since the last run
+        include:        Glob patterns of the files to process within a
+                        directory, by default all JSON files, compressed
+                        JSON files and archives are processed
+        exclude:        Glob patterns of the files and directories to
+                        skip within a directory
+        json_backend:   The backend decoding the BOM files, which cannot
+                        be chosen when streaming
+        show_stats:     Print the wall time, CPU time and peak memory
+                        of each stage as well as some counters
+        stats_file:     Write the same report as JSON to a file
+        profile_file:   Write a cProfile of the run to a file
+        diagnostics_file:   Write every purl issue, like invalid purls or
+                            unsupported purl types, as JSON to a file
+        license_dir:    The directory containing the license texts, named
+                        after the SPDX id or name of the license, which
+                        templates get via `license_index`
+
+    Raises:
+        ClickException: In case invalid input is provided.
+    """
+    _check_json_backend(stream, json_backend)
+    from mdbom.bom.diagnostics import (
+        EXAMPLE_LIMIT,
+        Diagnostics,
+        collect_diagnostics,
+    )
+    from mdbom.stats import (
+        URL_WARNINGS_COUNTER,
+        Stats,
+        collect_stats,
+        profile,
+    )
+
+    stats = Stats() if show_stats or stats_file else None
+    diagnostics = Diagnostics(
+        example_limit=None if diagnostics_file else EXAMPLE_LIMIT,
+    )
+    with profile(profile_file), collect_stats(stats):
+        with collect_diagnostics(diagnostics):
+            _generate(
+                input_path,
+                output_files,
+                template_files,
+                package_type,
+                stream,
+                jobs,
+                deduplicate,
+                split_by_type,
+                incremental,
+                include,
+                exclude,
+                json_backend,
+                stats,
+                license_dir,
+            )
+
+    if diagnostics.total:
+        click.echo(diagnostics.format(), err=True)
+    if diagnostics_file:
+        with open(diagnostics_file, "w") as write_file:
+            json.dump(diagnostics.to_dict(), write_file, indent=2)
+
+    if stats is not None:
+        if diagnostics.total:
+            # Only the first issues of each kind are logged, but all count.
+            stats.counters[URL_WARNINGS_COUNTER] = diagnostics.total
+        if show_stats:
+            click.echo(stats.format(), err=True)
+        if stats_file:
+            with open(stats_file, "w") as write_file:
+                json.dump(stats.to_dict(), write_file, indent=2)
+
+
+def _generate(  # noqa: WPS211
+    input_path: str,
+    output_files: List[str],
+    template_files: List[str],
+    package_type: str,
+    stream: bool,
+    jobs: Optional[int],
+    deduplicate: bool,
+    split_by_type: bool,
+    incremental: bool,
+    include: Sequence[str],
+    exclude: Sequence[str],
+    json_backend: str,
+    stats: Optional["Stats"],
+    license_dir: str,
+) -> None:
+    from mdbom.bom.licenses import LicenseTexts
+    from mdbom.bom.processor import (
+        deduplicate_packages,
+        get_bom_files,
+        get_packages_from_bom,
+        iter_packages_from_bom,
+    )
+    from mdbom.bom.store import PackageStore
+    from mdbom.bom.urls import configure_resolvers
+    from mdbom.cache import get_cache_dir, is_output_cached, store_outputs
+    from mdbom.md.md import GeneratingError, generate_markdown_files
+    from mdbom.stats import DEDUPLICATE_STAGE, FILTER_STAGE, measure
+
+    if len(template_files) != len(output_files):
+        raise click.ClickException(
+            "Each template requires exactly one output file.",
+        )
+    try:
+        license_texts = LicenseTexts(license_dir) if license_dir else None
+    except ProcessingError as pe:
+        raise click.ClickException(str(pe))
+
+    cache_dir, cache_key = "", None
+    if incremental:
+        cache_dir = get_cache_dir()
+        try:
+            cache_key = _get_cache_key(
+                get_bom_files(
+                    filepath=input_path,
+                    include=include,
+                    exclude=exclude,
+                ),
+                template_files,
+                output_files,
+                [
+                    package_type,
+                    deduplicate,
+                    split_by_type,
+                    _hash_license_texts(license_texts),
+                ],
+            )
+        except (GeneratingError, ProcessingError) as error:
+            raise click.ClickException(str(error))
+        if cache_key is not None and is_output_cached(cache_dir, cache_key):
+            click.echo("Markdown files are up to date.")
+            return
+
+    errors: List[ProcessingError] = []
+    packages: Iterable[Package]
+    try:
+        # Fails before any BOM file is read if a URL resolver is invalid.
+        configure_resolvers()
+        if stream:
+            packages = iter_packages_from_bom(
+                filepath=input_path,
+                stats=stats,
+                include=include,
+                exclude=exclude,
+                errors=errors,
+            )
+        else:
+            packages = get_packages_from_bom(
+                filepath=input_path,
+                jobs=jobs or os.cpu_count() or 1,
+                errors=errors,
+                cache_dir=cache_dir,
+                stats=stats,
+                json_backend=json_backend,
+                include=include,
+                exclude=exclude,
+            )
+    except ProcessingError as pe:
+        raise click.ClickException(str(pe))
+
+    try:
+        if deduplicate:
+            with measure(stats, DEDUPLICATE_STAGE):
+                packages = deduplicate_packages(packages)
+        elif stream and len(output_files) > 1:
+            # All targets iterate over the same packages.
+            packages = PackageStore.from_packages(packages)  # type: ignore
+        with measure(stats, FILTER_STAGE):
+            selections = _select_packages(
+                packages,
+                package_type,
+                split_by_type,
+                stream and len(output_files) == 1,
+            )
+        generated_files = generate_markdown_files(
+            targets=[
+                (template_file, _get_output_file(output_file, purl_type), pkgs)
+                for template_file, output_file in zip(
+                    template_files,
+                    output_files,
+                )
+                for purl_type, pkgs in selections
+            ],
+            stats=stats,
+            license_texts=license_texts,
+        )
+    except (GeneratingError, ProcessingError) as error:
+        raise click.ClickException(str(error))
+    finally:
+        # Streamed BOM files are only read while generating.
+        for skipped in errors:
+            logger.warning("Skipped {0}: {1}".format(skipped.source, skipped))
+
+    if cache_key is not None:
+        store_outputs(cache_dir, cache_key, generated_files)
+
+    for generated_file in generated_files:
+        click.echo("Generated markdown file:")
+        click.echo(generated_file)
+
+
+@click.command()
+@click.option(
+    "--templates",
+    "template_dir",
+    default=".",
+    show_default=True,
+    help="The directory containing the templates to render.",
+)
+@click.option(
+    "--host",
+    "host",
+    default="127.0.0.1",
+    show_default=True,
+    help="The host to listen on.",
+)
+@click.option(
+    "--port",
+    "port",
+    type=click.IntRange(min=0, max=65535),
+    default=8080,
+    show_default=True,
+    help="The TCP port to listen on.",
+)
+@click.option(
+    "--socket",
+    "socket_path",
+    default="",
+    help="Listen on a Unix socket instead of a TCP port.",
+)
+@click.option(
+    "--cache-size",
+    "cache_size",
+    type=click.IntRange(min=1),
+    # The default of mdbom.server, which is not imported before serving.
+    default=32,
+    show_default=True,
+    help="The number of parsed BOMs kept in memory.",
+)
+@click.option(
+    "--json-backend",
+    "json_backend",
+    type=click.Choice([AUTO_BACKEND, *json_backends]),
+    default=AUTO_BACKEND,
+    show_default=True,
+    help="The JSON decoder, auto uses the fastest one installed.",
+)
+def serve(
+    template_dir,
+    host,
+    port,
+    socket_path,
+    cache_size,
+    json_backend,
+):
+    """Serves render requests, keeping BOMs and templates in memory.
+
+    Args:
+        template_dir:   The directory containing the templates, requests
+                        refer to templates relative to it
+        host:           The host to listen on
+        port:           The TCP port to listen on
+        socket_path:    Listen on a Unix socket instead of a TCP port
+        cache_size:     The number of parsed BOMs kept in memory
+        json_backend:   The backend decoding the BOMs
 
     Raises:
         ClickException: In case invalid input is provided.
     """
+    from mdbom.bom.urls import configure_resolvers
+    from mdbom.server import serve as serve_requests
+
+    if not os.path.isdir(template_dir):
+        raise click.ClickException(
+            "Provided template directory does not exist."
+        )
     try:
-        packages = filter_packages_by_type(
-            packages=get_packages_from_bom(filepath=input_path),
-            package_type=package_type,
+        configure_resolvers()
+        serve_requests(
+            template_dir=template_dir,
+            host=host,
+            port=port,
+            socket_path=socket_path,
+            cache_size=cache_size,
+            json_backend=json_backend,
+            on_start=partial(_echo_address, socket_path),
         )
+    except (OSError, ProcessingError) as error:
+        raise click.ClickException(str(error))
+    except KeyboardInterrupt:
+        click.echo("Stopped serving.")
+
+
+@click.command()
+@click.argument("manifest")
+@click.option(
+    "--jobs",
+    "jobs",
+    type=click.IntRange(min=1),
+    default=None,
+    help="Number of worker processes [default: CPU count].",
+)
+@click.option(
+    "--json-backend",
+    "json_backend",
+    type=click.Choice([AUTO_BACKEND, *json_backends]),
+    default=AUTO_BACKEND,
+    show_default=True,
+    help="The JSON decoder, auto uses the fastest one installed.",
+)
+def batch(manifest, jobs, json_backend):
+    """Generates the markdown files of all jobs listed in a manifest.
+
+    Args:
+        manifest:       The JSON or YAML file listing the jobs, each with
+                        an input, a template, an output and optionally a
+                        type and deduplicate
+        jobs:           The number of worker processes running the jobs
+        json_backend:   The backend decoding the BOM files
+
+    Raises:
+        ClickException: In case the manifest is invalid or any job failed.
+    """
+    from mdbom.batch import (
+        format_result,
+        format_summary,
+        load_manifest,
+        run_jobs,
+    )
+    from mdbom.bom.urls import configure_resolvers
+
+    try:
+        # Fails once instead of once per job if the backend or a URL
+        # resolver is invalid.
+        get_json_decoder(json_backend)
+        configure_resolvers()
+        batch_jobs = load_manifest(manifest)
     except ProcessingError as pe:
-        raise click.ClickException(pe)
+        raise click.ClickException(str(pe))
+
+    results = []
+    for result in run_jobs(
+        batch_jobs,
+        workers=jobs or os.cpu_count() or 1,
+        json_backend=json_backend,
+    ):
+        click.echo(format_result(result))
+        results.append(result)
+    click.echo(format_summary(results))
+    if any(result.failed for result in results):
+        raise click.ClickException("Not all jobs succeeded.")
+
+
+@click.command()
+@click.option(
+    "--old",
+    "old_path",
+    required=True,
+    help="BOM file or directory of the previous release.",
+)
+@click.option(
+    "--new",
+    "new_path",
+    required=True,
+    help="BOM file or directory of the current release.",
+)
+@click.option(
+    "--output",
+    "output_file",
+    default="3rd-party-changes.md",
+    show_default=True,
+    help="Target .md file.",
+)
+@click.option(
+    "--template",
+    "template_file",
+    default="changes.md.jinja",
+    show_default=True,
+    help="The Jinja2 template file.",
+)
+@click.option(
+    "--type",
+    "package_type",
+    default="",
+    help="Can be used to focus on package types, e.g. pypi or pypi,npm.",
+)
+@click.option(
+    "--stream",
+    "stream",
+    is_flag=True,
+    default=False,
+    help="Read the components incrementally to keep memory usage flat.",
+)
+@click.option(
+    "--json-backend",
+    "json_backend",
+    type=click.Choice([AUTO_BACKEND, *json_backends]),
+    default=AUTO_BACKEND,
+    show_default=True,
+    help="The JSON decoder, auto uses the fastest one installed.",
+)
+def diff(  # noqa: WPS211
+    old_path,
+    new_path,
+    output_file,
+    template_file,
+    package_type,
+    stream,
+    json_backend,
+):
+    """Generates a markdown file of the packages changed between two BOMs.
+
+    Args:
+        old_path:       The BOM file or directory of the previous release
+        new_path:       The BOM file or directory of the current release
+        output_file:    The output_file where the result should be stored
+        template_file:  The template, which can use the `added`, `removed`
+                        and `changed` packages
+        package_type:   Can be used to set the focus on specific package
+                        types like pypi, multiple types are separated
+                        by commas
+        stream:         Process the BOMs as a lazy pipeline instead of
+                        loading them completely
+        json_backend:   The backend decoding the BOM files, which cannot
+                        be chosen when streaming
 
+    Raises:
+        ClickException: In case invalid input is provided.
+    """
+    _check_json_backend(stream, json_backend)
+    from mdbom.bom.diagnostics import Diagnostics, collect_diagnostics
+    from mdbom.bom.diff import diff_packages
+    from mdbom.bom.urls import configure_resolvers
+    from mdbom.md.md import GeneratingError, render_markdown
+
+    diagnostics = Diagnostics()
     try:
-        generate_markdown(
+        with collect_diagnostics(diagnostics):
+            configure_resolvers()
+            # The new packages are streamed while the old ones are indexed.
+            package_diff = diff_packages(
+                _get_diff_packages(
+                    old_path, package_type, stream, json_backend
+                ),
+                _get_diff_packages(
+                    new_path, package_type, stream, json_backend
+                ),
+            )
+        render_markdown(
             template=template_file,
             file_name=output_file,
-            packages=packages,
+            context=package_diff._asdict(),
         )
-    except GeneratingError as ge:
-        raise click.ClickException(ge)
+    except (GeneratingError, ProcessingError) as error:
+        raise click.ClickException(str(error))
+    finally:
+        if diagnostics.total:
+            click.echo(diagnostics.format(), err=True)
 
+    click.echo(
+        "{0} added, {1} removed, {2} changed".format(
+            len(package_diff.added),
+            len(package_diff.removed),
+            len(package_diff.changed),
+        ),
+    )
     click.echo("Generated markdown file:")
     click.echo(output_file)
 
 
+def _check_json_backend(stream: bool, json_backend: str) -> None:
+    if stream and json_backend != AUTO_BACKEND:
+        # Streamed components are decoded incrementally instead.
+        raise click.ClickException(
+            "The JSON backend cannot be chosen together with --stream.",
+        )
+
+
+def _echo_address(
+    socket_path: str,
+    server: "Server",
+) -> None:
+    if socket_path:
+        click.echo("Serving on {0}".format(socket_path))
+        return
+    host, port = server.sockets[0].getsockname()[:2]
+    click.echo("Serving on http://{0}:{1}".format(host, port))
+
+
+def _get_diff_packages(
+    filepath: str,
+    package_type: str,
+    stream: bool,
+    json_backend: str,
+) -> Iterable[Package]:
+    from mdbom.bom.processor import (
+        get_packages_from_bom,
+        iter_packages_by_type,
+        iter_packages_from_bom,
+    )
+
+    if stream:
+        packages: Iterable[Package] = iter_packages_from_bom(filepath=filepath)
+    else:
+        packages = get_packages_from_bom(
+            filepath=filepath,
+            jobs=os.cpu_count() or 1,
+            json_backend=json_backend,
+        )
+    return iter_packages_by_type(packages, package_type)
+
+
+def _get_cache_key(
+    bom_files: List[str],
+    template_files: List[str],
+    output_files: List[str],
+    options: List[object],
+) -> Optional[str]:
+    from mdbom.bom.urls import describe_resolvers
+    from mdbom.cache import get_version, hash_file, hash_values
+    from mdbom.md.md import get_template_files
+
+    bom_hashes = [
+        (os.path.abspath(bom_file), hash_file(bom_file))
+        for bom_file in bom_files
+        if os.path.exists(bom_file)
+    ]
+    templates = []
+    for template_file in template_files:
+        files = get_template_files(template_file) if template_file else []
+        if files is None:
+            # Templates which are only known at render time cannot be tracked.
+            return None
+        templates.append([(name, hash_file(name)) for name in files])
+    return hash_values(
+        [
+            get_version(),
+            bom_hashes,
+            templates,
+            [os.path.abspath(output_file) for output_file in output_files],
+            options,
+            describe_resolvers(),
+        ],
+    )
+
+
+def _hash_license_texts(
+    license_texts: Optional["LicenseTexts"],
+) -> List[Tuple[str, str]]:
+    from mdbom.cache import hash_file
+
+    if license_texts is None:
+        return []
+    return [(name, hash_file(name)) for name in license_texts.files]
+
+
+def _select_packages(
+    packages: Iterable[Package],
+    package_type: str,
+    split_by_type: bool,
+    lazy: bool,
+) -> List[Tuple[str, Iterable[Package]]]:
+    from mdbom.bom.processor import (
+        filter_packages_by_type,
+        iter_packages_by_type,
+    )
+
+    if split_by_type:
+        return _split_by_type(packages, package_type)  # type: ignore
+    if lazy:
+        return [("", iter_packages_by_type(packages, package_type))]
+    return [("", filter_packages_by_type(packages, package_type))]
+
+
+def _split_by_type(
+    packages: Iterable[Package],
+    package_type: str,
+) -> List[Tuple[str, List[Package]]]:
+    from mdbom.bom.processor import (
+        index_packages_by_type,
+        split_package_types,
+    )
+
+    index = index_packages_by_type(packages)
+    package_types = split_package_types(package_type) or sorted(index)
+    return [
+        (purl_type or UNKNOWN_TYPE, index.get(purl_type, []))
+        for purl_type in package_types
+    ]
+
+
+def _get_output_file(output_file: str, purl_type: str) -> str:
+    if not purl_type:
+        return output_file
+    root, extension = os.path.splitext(output_file)
+    return "{0}-{1}{2}".format(root, purl_type, extension)
+
+
 cli.add_command(info)
 cli.add_command(generate)
+cli.add_command(serve)
+cli.add_command(batch)
+cli.add_command(diff)
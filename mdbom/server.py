@@ -0,0 +1,356 @@
+"""Handling the server mode of MdBOM.
+
+The server renders templates on request without paying the startup of
+a new process each time. Parsed BOMs are kept in a least recently used
+cache, keyed on the hash of their content, and compiled templates are
+kept by their environment, so repeated requests only render.
+
+Requests are served by asyncio, while the parsing and rendering runs in
+a pool of threads, so slow requests do not block the others.
+"""
+
+import asyncio
+import hashlib
+import logging
+import os
+import threading
+from asyncio.base_events import Server as AsyncioServer
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from mdbom.bom.bom import Package, ProcessingError
+from mdbom.bom.decoding import AUTO_BACKEND, get_json_decoder
+from mdbom.bom.processor import (
+    deduplicate_packages,
+    filter_packages_by_type,
+    get_bom_files,
+    get_packages_from_bom,
+    get_packages_from_content,
+)
+from mdbom.cache import hash_file, hash_values
+from mdbom.md.md import GeneratingError, load_template
+from mdbom.md.views import create_context
+
+RENDER_PATH = "/render"
+DEFAULT_CACHE_SIZE = 32
+MAX_UPLOAD_SIZE = 1 << 28
+MAX_HEADER_COUNT = 100
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+logger = logging.getLogger("MdBOM")
+
+
+class RequestError(RuntimeError):
+    """Request error for rejecting a request with an HTTP status."""
+
+    def __init__(self, message: str, status: int = 400) -> None:
+        """Create a new request error.
+
+        Args:
+            message: The error message, returned as response.
+            status: The HTTP status of the response.
+        """
+        super().__init__(message)
+        self.status = status
+
+
+class PackageCache(object):
+    """A thread safe least recently used cache of parsed BOMs."""
+
+    def __init__(self, max_size: int = DEFAULT_CACHE_SIZE) -> None:
+        """Create an empty cache.
+
+        Args:
+            max_size: The maximum number of package sets kept.
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, List[Package]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self,
+        key: str,
+        load: Callable[[], List[Package]],
+    ) -> List[Package]:
+        """Get the packages of a BOM, loading them if not cached.
+
+        Args:
+            key: The hash of the BOM.
+            load: Loads the packages if they are not cached.
+
+        Returns:
+            The packages, which must not be modified.
+        """
+        with self._lock:
+            packages = self._entries.get(key)
+            if packages is not None:
+                self._entries.move_to_end(key)
+                return packages
+        packages = load()
+        with self._lock:
+            self._entries[key] = packages
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        return packages
+
+
+class Server(object):
+    """Renders templates for uploaded BOMs or BOMs on disk.
+
+    A request is a `POST` to `/render` with the following parameters:
+
+    - `template`: The template, relative to the template directory.
+    - `path`: The BOM file or directory on the server, if no BOM is
+      uploaded as body of the request.
+    - `type`: The package types to focus on, e.g. `pypi,npm`.
+    - `deduplicate`: Merge packages occurring in multiple BOM files.
+
+    The response contains the rendered template.
+    """
+
+    def __init__(
+        self,
+        template_dir: str,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        json_backend: str = AUTO_BACKEND,
+    ) -> None:
+        """Create a new server.
+
+        Args:
+            template_dir: The directory containing the templates.
+            cache_size: The number of parsed BOMs kept in memory.
+            json_backend: The backend decoding the BOMs.
+
+        Raises:
+            ProcessingError: If the JSON backend is not installed.
+        """
+        get_json_decoder(json_backend)
+        self.template_dir = os.path.abspath(template_dir)
+        self.packages = PackageCache(cache_size)
+        self.json_backend = json_backend
+
+    async def start(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        socket_path: str = "",
+    ) -> AsyncioServer:
+        """Start listening for requests.
+
+        Args:
+            host: The host to listen on.
+            port: The TCP port to listen on, 0 picks a free port.
+            socket_path: If provided, listen on this Unix socket instead.
+
+        Returns:
+            The started server.
+        """
+        if socket_path:
+            return await asyncio.start_unix_server(self.handle, socket_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(
+        self,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        """Answer a single request of a connection.
+
+        Args:
+            reader: The stream of the request.
+            writer: The stream of the response.
+        """
+        try:
+            method, target, body = await _read_request(reader)
+            if urlsplit(target).path != RENDER_PATH:
+                raise RequestError("Unknown path", 404)
+            if method != "POST":
+                raise RequestError("Only POST is supported", 405)
+            content = await asyncio.get_running_loop().run_in_executor(
+                None,
+                self.render,
+                _get_parameters(target),
+                body,
+            )
+            status = 200
+        except RequestError as error:
+            status, content = error.status, str(error)
+        except (GeneratingError, ProcessingError) as error:
+            status, content = 400, str(error)
+        except Exception:
+            logger.exception("Failed to handle request")
+            status, content = 500, _REASONS[500]
+        try:
+            await _write_response(writer, status, content)
+        finally:
+            writer.close()
+
+    def render(self, parameters: Dict[str, str], body: bytes) -> str:
+        """Render a template for a BOM.
+
+        Args:
+            parameters: The parameters of the request.
+            body: The uploaded BOM, empty if a path is provided.
+
+        Returns:
+            The rendered template.
+
+        Raises:
+            RequestError: If the parameters are invalid.
+        """
+        template_name = parameters.get("template")
+        if not template_name:
+            raise RequestError("No template provided")
+        template = os.path.abspath(
+            os.path.join(self.template_dir, template_name),
+        )
+        if os.path.commonpath([template, self.template_dir]) != (
+            self.template_dir
+        ):
+            raise RequestError("Provided template does not exist.", 404)
+        md_template = load_template(template)
+        packages = self.get_packages(parameters.get("path", ""), body)
+        if parameters.get("deduplicate", "") not in {"", "0", "false"}:
+            packages = deduplicate_packages(packages)
+        packages = filter_packages_by_type(packages, parameters.get("type", ""))
+        return md_template.render(create_context(packages))
+
+    def get_packages(self, path: str, body: bytes) -> List[Package]:
+        """Get the packages of an uploaded BOM or a BOM on disk.
+
+        Args:
+            path: The path to the BOM file(s) on the server.
+            body: The uploaded BOM, used if no path is provided.
+
+        Returns:
+            The packages, which must not be modified.
+
+        Raises:
+            RequestError: If neither a path nor a BOM is provided.
+        """
+        if path:
+            key = hash_values(
+                [
+                    (bom_file, hash_file(bom_file))
+                    for bom_file in get_bom_files(filepath=path)
+                    if os.path.isfile(bom_file)
+                ],
+            )
+            return self.packages.get(
+                "path:{0}".format(key),
+                lambda: get_packages_from_bom(
+                    filepath=path,
+                    json_backend=self.json_backend,
+                ),
+            )
+        if not body:
+            raise RequestError("No BOM provided")
+        key = hashlib.sha256(body).hexdigest()
+        return self.packages.get(
+            "upload:{0}".format(key),
+            lambda: get_packages_from_content(
+                body,
+                json_backend=self.json_backend,
+            ),
+        )
+
+
+async def _read_request(
+    reader: asyncio.StreamReader,
+) -> Tuple[str, str, bytes]:
+    try:
+        request_line = (await reader.readline()).decode("latin-1")
+        method, target, _ = request_line.split()
+    except ValueError:
+        raise RequestError("Malformed request")
+    headers = {}
+    for _ in range(MAX_HEADER_COUNT):
+        line = (await reader.readline()).decode("latin-1").strip()
+        if not line:
+            break
+        name, _, header_value = line.partition(":")
+        headers[name.strip().lower()] = header_value.strip()
+    else:
+        raise RequestError("Too many headers")
+    try:
+        length = int(headers.get("content-length", "0"))
+    except ValueError:
+        raise RequestError("Invalid Content-Length")
+    if length > MAX_UPLOAD_SIZE:
+        raise RequestError(_REASONS[413], 413)
+    try:
+        body = await reader.readexactly(length) if length > 0 else b""
+    except asyncio.IncompleteReadError:
+        raise RequestError("Incomplete body")
+    return method, target, body
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter,
+    status: int,
+    content: str,
+) -> None:
+    body = content.encode()
+    content_type = "text/markdown" if status == 200 else "text/plain"
+    writer.write(
+        (
+            "HTTP/1.1 {0} {1}\r\n"
+            + "Content-Type: {2}; charset=utf-8\r\n"
+            + "Content-Length: {3}\r\n"
+            + "Connection: close\r\n\r\n"
+        )
+        .format(status, _REASONS[status], content_type, len(body))
+        .encode("latin-1"),
+    )
+    writer.write(body)
+    await writer.drain()
+
+
+def _get_parameters(target: str) -> Dict[str, str]:
+    query = parse_qs(urlsplit(target).query)
+    return {name: query_values[-1] for name, query_values in query.items()}
+
+
+def serve(
+    template_dir: str,
+    host: str = "127.0.0.1",
+    port: int = 0,
+    socket_path: str = "",
+    cache_size: int = DEFAULT_CACHE_SIZE,
+    json_backend: str = AUTO_BACKEND,
+    on_start: Optional[Callable[[AsyncioServer], None]] = None,
+) -> None:
+    """Serve render requests until interrupted.
+
+    Args:
+        template_dir: The directory containing the templates.
+        host: The host to listen on.
+        port: The TCP port to listen on.
+        socket_path: If provided, listen on this Unix socket instead.
+        cache_size: The number of parsed BOMs kept in memory.
+        json_backend: The backend decoding the BOMs.
+        on_start: Called with the server once it is listening.
+    """
+    server = Server(template_dir, cache_size, json_backend)
+
+    async def run() -> None:  # noqa: WPS430
+        started = await server.start(host, port, socket_path)
+        if on_start is not None:
+            on_start(started)
+        async with started:
+            await started.serve_forever()
+
+    asyncio.run(run())
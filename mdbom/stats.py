@@ -0,0 +1,340 @@
+"""Handling the statistics of a MdBOM run.
+
+A `Stats` instance records the wall time, the CPU time and the peak
+memory of each stage of a run, e.g. loading the BOM or rendering the
+template, together with some counters like the number of components.
+Stages can be nested, in which case the time spent in the inner stage
+is not accounted to the outer one.
+"""
+
+import cProfile
+import logging
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager, nullcontext
+from typing import (
+    Any,
+    ContextManager,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+)
+
+LOAD_STAGE = "load"
+EXTRACT_STAGE = "extract"
+URLS_STAGE = "urls"
+DEDUPLICATE_STAGE = "deduplicate"
+FILTER_STAGE = "filter"
+COMPILE_STAGE = "compile"
+RENDER_STAGE = "render"
+WRITE_STAGE = "write"
+
+BOM_FILES_COUNTER = "bom_files"
+COMPONENTS_COUNTER = "components"
+SKIPPED_FILES_COUNTER = "skipped_files"
+URL_WARNINGS_COUNTER = "url_warnings"
+BYTES_WRITTEN_COUNTER = "bytes_written"
+
+# The modules logging warnings about URLs. Before Python 3.8, the issues
+# reported via the diagnostics are attributed to the diagnostics module.
+_URLS_MODULES = frozenset(("urls", "diagnostics"))
+# tracemalloc.reset_peak is only available since Python 3.9.
+_CAN_RESET_PEAK = hasattr(tracemalloc, "reset_peak")
+
+
+class StageStats(object):
+    """The accumulated measurements of a single stage."""
+
+    __slots__ = ("wall_seconds", "cpu_seconds", "peak_bytes", "calls")
+
+    def __init__(self) -> None:
+        """Create empty measurements."""
+        self.wall_seconds = 0.0
+        self.cpu_seconds = 0.0
+        self.peak_bytes = 0
+        self.calls = 0
+
+    def merge(self, other: "StageStats") -> None:
+        """Add the measurements of another run of the same stage.
+
+        Args:
+            other: The measurements to add.
+        """
+        self.wall_seconds += other.wall_seconds
+        self.cpu_seconds += other.cpu_seconds
+        self.peak_bytes = max(self.peak_bytes, other.peak_bytes)
+        self.calls += other.calls
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the measurements into a JSON serializable dictionary.
+
+        Returns:
+            The measurements.
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+
+class _Frame(object):
+    __slots__ = ("wall", "cpu", "child_wall", "child_cpu", "peak", "start_peak")
+
+    def __init__(self, start_peak: int = 0) -> None:
+        self.wall = time.perf_counter()
+        self.cpu = time.process_time()
+        self.child_wall = 0.0
+        self.child_cpu = 0.0
+        self.peak = 0
+        self.start_peak = start_peak
+
+
+class _WarningCounter(logging.Handler):
+    def __init__(self, stats: "Stats") -> None:
+        super().__init__(level=logging.WARNING)
+        self.stats = stats
+
+    def emit(self, record: logging.LogRecord) -> None:
+        if record.module in _URLS_MODULES:
+            self.stats.count(URL_WARNINGS_COUNTER)
+
+
+class Stats(object):
+    """The statistics of a run, collected stage by stage."""
+
+    def __init__(self) -> None:
+        """Create empty statistics."""
+        self.stages: Dict[str, StageStats] = {}
+        self.counters: Dict[str, int] = {}
+        self.total = StageStats()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        return {
+            "stages": self.stages,
+            "counters": self.counters,
+            "total": self.total,
+        }
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        self.__init__()  # type: ignore
+        self.__dict__.update(state)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        """Measure a stage of the run.
+
+        Stages with the same name are accumulated. The peak memory is
+        only recorded while tracemalloc is tracing. Before Python 3.9, the
+        peak cannot be reset per stage, so a stage only records the peak
+        if it exceeds all previous ones, otherwise the memory traced at
+        its end.
+
+        Args:
+            name: The name of the stage.
+
+        Yields:
+            Nothing, the stage ends when the context is left.
+        """
+        stack = self._get_stack()
+        with self._lock:
+            stage = self.stages.setdefault(name, StageStats())
+        tracing = tracemalloc.is_tracing()
+        start_peak = 0
+        if tracing:
+            start_peak = tracemalloc.get_traced_memory()[1]
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, start_peak)
+            if _CAN_RESET_PEAK:
+                tracemalloc.reset_peak()
+                start_peak = 0
+        frame = _Frame(start_peak)
+        stack.append(frame)
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - frame.wall
+            cpu = time.process_time() - frame.cpu
+            peak = _get_peak(frame.start_peak) if tracing else 0
+            stack.pop()
+            if stack:
+                stack[-1].child_wall += wall
+                stack[-1].child_cpu += cpu
+                stack[-1].peak = max(stack[-1].peak, peak)
+            with self._lock:
+                stage.wall_seconds += wall - frame.child_wall
+                stage.cpu_seconds += cpu - frame.child_cpu
+                stage.peak_bytes = max(stage.peak_bytes, frame.peak, peak)
+                stage.calls += 1
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Increase a counter.
+
+        Args:
+            name: The name of the counter.
+            value: The value to add.
+        """
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def merge(self, other: "Stats") -> None:
+        """Add the stages and counters of another run, e.g. of a worker.
+
+        Args:
+            other: The statistics to add.
+        """
+        for name, stage in other.stages.items():
+            with self._lock:
+                self.stages.setdefault(name, StageStats()).merge(stage)
+        for counter, value in other.counters.items():
+            self.count(counter, value)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics into a JSON serializable dictionary.
+
+        Returns:
+            The statistics.
+        """
+        return {
+            "total": self.total.to_dict(),
+            "stages": {
+                name: stage.to_dict() for name, stage in self.stages.items()
+            },
+            "counters": dict(self.counters),
+        }
+
+    def format(self) -> str:
+        """Format the statistics as a human readable table.
+
+        Returns:
+            The formatted statistics.
+        """
+        lines = [
+            "{0:<12} {1:>10} {2:>10} {3:>16} {4:>8}".format(
+                "Stage",
+                "Wall [s]",
+                "CPU [s]",
+                "Peak [bytes]",
+                "Calls",
+            ),
+        ]
+        rows = list(self.stages.items()) + [("total", self.total)]
+        for name, stage in rows:
+            lines.append(
+                "{0:<12} {1:>10.4f} {2:>10.4f} {3:>16,} {4:>8}".format(
+                    name,
+                    stage.wall_seconds,
+                    stage.cpu_seconds,
+                    stage.peak_bytes,
+                    stage.calls,
+                ),
+            )
+        for counter, value in self.counters.items():
+            lines.append("{0}: {1:,}".format(counter, value))
+        return "\n".join(lines)
+
+    def _get_stack(self) -> List[_Frame]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = []
+            self._local.stack = stack
+        return stack
+
+
+def measure(stats: Optional[Stats], name: str) -> ContextManager[None]:
+    """Measure a stage if statistics are collected.
+
+    Args:
+        stats: The statistics or None if none are collected.
+        name: The name of the stage.
+
+    Returns:
+        A context manager measuring the stage.
+    """
+    if stats is None:
+        return nullcontext()
+    return stats.stage(name)
+
+
+def count(stats: Optional[Stats], name: str, value: int = 1) -> None:
+    """Increase a counter if statistics are collected.
+
+    Args:
+        stats: The statistics or None if none are collected.
+        name: The name of the counter.
+        value: The value to add.
+    """
+    if stats is not None:
+        stats.count(name, value)
+
+
+@contextmanager
+def collect_stats(stats: Optional[Stats]) -> Iterator[None]:
+    """Collect the statistics of a whole run.
+
+    Traces the memory allocations via tracemalloc, which slows the run
+    down, counts the warnings about URLs and measures the total time.
+
+    Args:
+        stats: The statistics or None if none should be collected.
+
+    Yields:
+        Nothing, the run ends when the context is left.
+    """
+    if stats is None:
+        yield
+        return
+    logger = logging.getLogger("MdBOM")
+    counter = _WarningCounter(stats)
+    started_tracing = not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    logger.addHandler(counter)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    try:
+        yield
+    finally:
+        logger.removeHandler(counter)
+        stats.total.wall_seconds += time.perf_counter() - wall
+        stats.total.cpu_seconds += time.process_time() - cpu
+        stats.total.peak_bytes = max(
+            [tracemalloc.get_traced_memory()[1]]
+            + [stage.peak_bytes for stage in stats.stages.values()],
+        )
+        stats.total.calls += 1
+        if started_tracing:
+            tracemalloc.stop()
+
+
+@contextmanager
+def profile(file_name: Optional[str]) -> Iterator[None]:
+    """Profile a run with cProfile.
+
+    Args:
+        file_name: The file the profile is written to, no profile is
+            created if it is empty. The file can be inspected with the
+            `pstats` module or tools like snakeviz.
+
+    Yields:
+        Nothing, the profile is written when the context is left.
+    """
+    if not file_name:
+        yield
+        return
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        profiler.dump_stats(file_name)
+
+
+def _get_peak(start_peak: int) -> int:
+    current, peak = tracemalloc.get_traced_memory()
+    if peak > start_peak:
+        return peak
+    # The peak was reached before the stage, so only a lower bound of the
+    # peak of the stage is known.
+    return current
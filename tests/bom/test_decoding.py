@@ -0,0 +1,74 @@
+import codecs
+import json
+import pathlib
+from unittest import TestCase
+from mdbom.bom.bom import ProcessingError
+from mdbom.bom.decoding import (
+    decode_json,
+    get_json_decoder,
+    is_json_backend_available,
+    json_backends,
+)
+from mdbom.bom.processor import get_packages_from_bom
+
+
+class TestDecoding(TestCase):
+
+    input_dir = pathlib.Path.cwd() / "tests" / "inputs"
+
+    def test_backends_extract_identical_packages(self):
+        expected = get_packages_from_bom(
+            filepath=self.input_dir, json_backend="json"
+        )
+        for backend in json_backends:
+            with self.subTest(backend=backend):
+                if not is_json_backend_available(backend):
+                    self.skipTest("{0} is not installed".format(backend))
+                self.assertEqual(
+                    expected,
+                    get_packages_from_bom(
+                        filepath=self.input_dir, json_backend=backend
+                    ),
+                )
+
+    def test_backends_decode_byte_order_mark_and_unicode(self):
+        document = {"components": [{"name": "café", "version": "1"}]}
+        content = codecs.BOM_UTF8 + json.dumps(document).encode("utf-8")
+        for backend in json_backends:
+            with self.subTest(backend=backend):
+                if not is_json_backend_available(backend):
+                    self.skipTest("{0} is not installed".format(backend))
+                self.assertEqual(document, decode_json(content, backend))
+
+    def test_backends_reject_invalid_json(self):
+        for backend in json_backends:
+            with self.subTest(backend=backend):
+                if not is_json_backend_available(backend):
+                    self.skipTest("{0} is not installed".format(backend))
+                with self.assertRaises(ValueError):
+                    decode_json(b'{"components": [', backend)
+
+    def test_auto_backend_is_available(self):
+        self.assertTrue(is_json_backend_available("auto"))
+        self.assertTrue(is_json_backend_available("json"))
+
+    def test_unknown_backend_fails(self):
+        with self.assertRaises(ProcessingError) as pe:
+            get_json_decoder("yaml")
+        self.assertEqual("Unknown JSON backend: yaml", str(pe.exception))
+        self.assertFalse(is_json_backend_available("yaml"))
+
+    def test_missing_backend_fails_before_processing(self):
+        json_backends["missing"] = "mdbom_missing_json_module"
+        try:
+            with self.assertRaises(ProcessingError) as pe:
+                get_packages_from_bom(
+                    filepath=self.input_dir,
+                    json_backend="missing",
+                    errors=[],
+                )
+        finally:
+            del json_backends["missing"]
+        self.assertEqual(
+            "JSON backend missing is not installed", str(pe.exception)
+        )
@@ -0,0 +1,96 @@
+import pickle
+import sys
+from testfixtures import LogCapture
+from unittest import TestCase
+from mdbom.bom.diagnostics import (
+    INVALID_PURL,
+    UNSUPPORTED_TYPE,
+    Diagnostics,
+    collect_diagnostics,
+    get_diagnostics,
+)
+from mdbom.bom.urls import get_url
+
+
+class TestDiagnostics(TestCase):
+    def test_collect_diagnostics_limits_warnings(self):
+        diagnostics = Diagnostics(warning_limit=2, example_limit=3)
+        with LogCapture() as log:
+            with collect_diagnostics(diagnostics):
+                self.assertIs(diagnostics, get_diagnostics())
+                for index in range(5):
+                    get_url("pkg:generic/org.example/lib{0}@1.0".format(index))
+                get_url("invalid")
+            self.assertIsNone(get_diagnostics())
+            log.check(
+                (
+                    "MdBOM",
+                    "WARNING",
+                    "Package type: generic not supported, returning empty URL",
+                ),
+                (
+                    "MdBOM",
+                    "WARNING",
+                    "Package type: generic not supported, returning empty URL",
+                ),
+                (
+                    "MdBOM",
+                    "WARNING",
+                    "No valid purl: invalid provided, returning empty URL",
+                ),
+            )
+            if sys.version_info >= (3, 8):
+                self.assertEqual("urls", log.records[0].module)
+        self.assertEqual(6, diagnostics.total)
+        self.assertEqual(
+            {(UNSUPPORTED_TYPE, "generic"): 5, (INVALID_PURL, ""): 1},
+            diagnostics.counts,
+        )
+        self.assertEqual(
+            [
+                "pkg:generic/org.example/lib0@1.0",
+                "pkg:generic/org.example/lib1@1.0",
+                "pkg:generic/org.example/lib2@1.0",
+            ],
+            diagnostics.examples[(UNSUPPORTED_TYPE, "generic")],
+        )
+
+    def test_diagnostics_format_and_report(self):
+        diagnostics = Diagnostics(example_limit=None)
+        for index in range(3):
+            diagnostics.add(
+                UNSUPPORTED_TYPE, "pkg:generic/a{0}".format(index), "generic"
+            )
+        diagnostics.add(INVALID_PURL, "")
+        self.assertEqual(
+            "4 purl issue(s):\n"
+            "        3 purl type without URL support (generic), "
+            "e.g. 'pkg:generic/a0', 'pkg:generic/a1'\n"
+            "        1 invalid purl, e.g. ''",
+            diagnostics.format(example_limit=2),
+        )
+        report = diagnostics.to_dict()
+        self.assertEqual(4, report["total"])
+        self.assertEqual(
+            {
+                "category": UNSUPPORTED_TYPE,
+                "purl_type": "generic",
+                "count": 3,
+                "purls": ["pkg:generic/a0", "pkg:generic/a1", "pkg:generic/a2"],
+            },
+            report["issues"][0],
+        )
+        self.assertEqual("", Diagnostics().format())
+
+    def test_diagnostics_merge_and_pickle(self):
+        diagnostics = Diagnostics(example_limit=2)
+        worker = pickle.loads(pickle.dumps(diagnostics.spawn()))
+        worker.add(UNSUPPORTED_TYPE, "pkg:cargo/a@1", "cargo")
+        worker.add(UNSUPPORTED_TYPE, "pkg:cargo/b@1", "cargo")
+        diagnostics.add(UNSUPPORTED_TYPE, "pkg:cargo/c@1", "cargo")
+        diagnostics.merge(pickle.loads(pickle.dumps(worker)))
+        self.assertEqual(3, diagnostics.total)
+        self.assertEqual(
+            ["pkg:cargo/c@1", "pkg:cargo/a@1"],
+            diagnostics.examples[(UNSUPPORTED_TYPE, "cargo")],
+        )
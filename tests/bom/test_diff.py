@@ -0,0 +1,92 @@
+from unittest import TestCase
+from mdbom.bom.bom import Package
+from mdbom.bom.diff import PackageChange, diff_packages
+
+
+def create_package(name, version, licenses="MIT", purl_type="npm"):
+    return Package(
+        name,
+        version,
+        "library",
+        licenses,
+        "pkg:{0}/{1}@{2}".format(purl_type, name, version) if purl_type else "",
+        "",
+    )
+
+
+class TestDiff(TestCase):
+    def test_diff_packages(self):
+        old = [
+            create_package("kept", "1.0"),
+            create_package("removed", "1.0"),
+            create_package("upgraded", "1.0"),
+            create_package("relicensed", "1.0", "MIT,BSD"),
+            create_package("reordered", "1.0", "MIT,BSD"),
+            create_package("local", "1.0", purl_type=""),
+        ]
+        new = iter(
+            [
+                create_package("upgraded", "2.0"),
+                create_package("kept", "1.0"),
+                create_package("kept", "1.0"),
+                create_package("relicensed", "1.0", "Apache-2.0"),
+                create_package("reordered", "1.0", "BSD,MIT"),
+                create_package("added", "1.0"),
+                create_package("upgraded", "1.0", purl_type="pypi"),
+                create_package("local", "1.1", purl_type=""),
+            ]
+        )
+        package_diff = diff_packages(old, new)
+        self.assertEqual(
+            [("added", "1.0"), ("upgraded", "1.0")],
+            [(p.name, p.version) for p in package_diff.added],
+        )
+        self.assertEqual(
+            [("removed", "1.0")],
+            [(p.name, p.version) for p in package_diff.removed],
+        )
+        self.assertEqual(
+            [
+                ("local", "1.0", "1.1"),
+                ("relicensed", "1.0", "1.0"),
+                ("upgraded", "1.0", "2.0"),
+            ],
+            [
+                (change.name, change.old.version, change.new.version)
+                for change in package_diff.changed
+            ],
+        )
+        self.assertEqual(
+            ["local", "upgraded"],
+            [change.name for change in package_diff.upgraded],
+        )
+        self.assertEqual(
+            ["relicensed"],
+            [change.name for change in package_diff.license_changed],
+        )
+
+    def test_diff_packages_with_multiple_versions(self):
+        old = [create_package("lib", "1.0"), create_package("lib", "2.0")]
+        new = [
+            create_package("lib", "2.0"),
+            create_package("lib", "3.0"),
+            create_package("lib", "4.0"),
+        ]
+        package_diff = diff_packages(old, new)
+        self.assertEqual([], package_diff.changed)
+        self.assertEqual([new[1], new[2]], package_diff.added)
+        self.assertEqual([old[0]], package_diff.removed)
+
+    def test_diff_packages_pairs_single_remaining_versions(self):
+        old = [create_package("lib", "9.0"), create_package("lib", "2.0")]
+        new = [create_package("lib", "2.0"), create_package("lib", "10.0")]
+        package_diff = diff_packages(old, new)
+        self.assertEqual([PackageChange(old[0], new[1])], package_diff.changed)
+        self.assertEqual([], package_diff.added)
+        self.assertEqual([], package_diff.removed)
+
+    def test_diff_packages_without_changes(self):
+        packages = [create_package("a", "1.0"), create_package("b", "1.0")]
+        self.assertEqual(
+            ([], [], []), tuple(diff_packages(packages, reversed(packages)))
+        )
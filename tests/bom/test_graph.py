@@ -0,0 +1,60 @@
+from unittest import TestCase
+from mdbom.bom.graph import get_dependency_depths, iter_nested_components
+
+
+class TestGraph(TestCase):
+    def test_iter_nested_components_in_document_order(self):
+        components = [
+            {
+                "name": "a",
+                "components": [
+                    {"name": "b", "components": [{"name": "c"}]},
+                    {"name": "d"},
+                ],
+            },
+            {"name": "e", "components": []},
+        ]
+        self.assertEqual(
+            ["a", "b", "c", "d", "e"],
+            [c["name"] for c in iter_nested_components(components)],
+        )
+
+    def test_iter_nested_components_without_recursion_limit(self):
+        root = component = {"name": "0"}
+        for level in range(1, 5000):
+            nested = {"name": str(level)}
+            component["components"] = [nested]
+            component = nested
+        self.assertEqual(5000, len(list(iter_nested_components([root]))))
+
+    def test_get_dependency_depths_from_root(self):
+        content = {
+            "metadata": {"component": {"bom-ref": "app"}},
+            "dependencies": [
+                {"ref": "app", "dependsOn": ["a", "b"]},
+                {"ref": "a", "dependsOn": ["c"]},
+                {"ref": "b", "dependsOn": ["c", "app"]},
+                {"ref": "c", "dependsOn": ["d"]},
+                {"ref": "e"},
+            ],
+        }
+        self.assertEqual(
+            {"app": 0, "a": 1, "b": 1, "c": 2, "d": 3},
+            get_dependency_depths(content),
+        )
+
+    def test_get_dependency_depths_without_root(self):
+        content = {
+            "dependencies": [
+                {"ref": "a", "dependsOn": ["b"]},
+                {"ref": "b", "dependsOn": ["c"]},
+                {"ref": "d", "dependsOn": ["c"]},
+            ],
+        }
+        self.assertEqual(
+            {"a": 1, "d": 1, "b": 2, "c": 2},
+            get_dependency_depths(content),
+        )
+
+    def test_get_dependency_depths_without_graph(self):
+        self.assertEqual({}, get_dependency_depths({"components": []}))
@@ -0,0 +1,70 @@
+import os
+import tempfile
+from unittest import TestCase
+from mdbom.bom.bom import Package, ProcessingError
+from mdbom.bom.licenses import (
+    LicenseIndex,
+    LicenseTexts,
+    join_licenses,
+    split_licenses,
+)
+
+
+class TestLicenses(TestCase):
+
+    packages = [
+        Package("zlib", "1.0", "library", "MIT", "", ""),
+        Package("attrs", "2.0", "library", "MIT,Apache-2.0", "", ""),
+        Package("Django", "4.0", "library", "BSD-3-Clause", "", ""),
+        Package("six", "1.0", "library", "MIT,MIT", "", ""),
+    ]
+
+    def test_join_and_split_licenses(self):
+        licenses = join_licenses(["MIT", "Apache-2.0"])
+        self.assertEqual("MIT,Apache-2.0", licenses)
+        self.assertIs(licenses, join_licenses(["MIT", "Apache-2.0"]))
+        self.assertEqual(("MIT", "Apache-2.0"), split_licenses(licenses))
+        self.assertEqual(("MIT",), split_licenses("MIT, MIT,"))
+        self.assertEqual((), split_licenses(""))
+        self.assertIs(
+            split_licenses("MIT,BSD")[0], split_licenses("BSD,MIT")[1]
+        )
+
+    def test_license_index(self):
+        index = LicenseIndex(self.packages)
+        self.assertEqual(["Apache-2.0", "BSD-3-Clause", "MIT"], index.keys())
+        self.assertEqual(3, len(index))
+        self.assertIn("MIT", index)
+        self.assertEqual(
+            ["attrs", "six", "zlib"],
+            [package.name for package in index["MIT"].packages],
+        )
+        self.assertEqual(
+            ["Apache-2.0", "BSD-3-Clause", "MIT"],
+            [license.key for license in index],
+        )
+        self.assertEqual("", index["MIT"].text)
+
+    def test_license_index_with_texts(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for name, text in (("MIT.txt", "MIT text"), ("apache-2.0", "AL")):
+                with open(os.path.join(dir, name), "w") as write_file:
+                    write_file.write(text)
+            os.mkdir(os.path.join(dir, "BSD-3-Clause"))
+            texts = LicenseTexts(dir)
+            index = LicenseIndex(iter(self.packages), texts)
+            self.assertEqual("MIT text", index["MIT"].text)
+            self.assertEqual("AL", index["Apache-2.0"].text)
+            self.assertEqual("", index["BSD-3-Clause"].text)
+            self.assertEqual(
+                [os.path.join(dir, "MIT.txt"), os.path.join(dir, "apache-2.0")],
+                texts.files,
+            )
+            os.remove(os.path.join(dir, "MIT.txt"))
+            self.assertEqual("MIT text", texts.get("mit"))
+
+    def test_license_texts_fail_for_missing_directory(self):
+        with tempfile.TemporaryDirectory() as dir:
+            with self.assertRaises(ProcessingError) as pe:
+                LicenseTexts(os.path.join(dir, "missing"))
+        self.assertIn("Cannot read license texts", str(pe.exception))
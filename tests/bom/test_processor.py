@@ -1,11 +1,30 @@
+import json
+import bz2
+import gzip
+import lzma
+import os
 import pathlib
+import pickle
+import shutil
+import tarfile
+import tempfile
+import zipfile
 from unittest import TestCase
 from unittest.mock import patch
 from mdbom.bom.bom import Package, ProcessingError
+from mdbom.bom.decoding import is_json_backend_available, json_backends
+from mdbom.bom.urls import register_resolver, resolvers
+from mdbom.stats import Stats
+from mdbom.bom.diagnostics import Diagnostics, collect_diagnostics
 from mdbom.bom.processor import (
     _load_bom,
+    deduplicate_packages,
     get_packages_from_bom,
     filter_packages_by_type,
+    index_packages_by_type,
+    iter_packages_by_type,
+    split_package_types,
+    iter_packages_from_bom,
 )
 
 
@@ -70,6 +89,52 @@ class TestProcessor(TestCase):
         self.assertEqual("0.1.1", packages[0].version)
         self.assertEqual("", packages[0].url)
 
+    @patch("mdbom.bom.processor._load_bom")
+    def test_get_packages_with_nested_components_and_depth(self, load_patch):
+        load_patch.return_value = {
+            "metadata": {"component": {"bom-ref": "app"}},
+            "components": [
+                {
+                    "bom-ref": "a",
+                    "name": "a",
+                    "version": "1",
+                    "type": "library",
+                    "components": [
+                        {
+                            "bom-ref": "b",
+                            "name": "b",
+                            "version": "2",
+                            "type": "library",
+                        }
+                    ],
+                },
+                {"name": "c", "version": "3", "type": "library"},
+            ],
+            "dependencies": [
+                {"ref": "app", "dependsOn": ["a"]},
+                {"ref": "a", "dependsOn": ["b"]},
+            ],
+        }
+        packages = get_packages_from_bom(
+            filepath=self.input_dir / "bom-pypi.json"
+        )
+        self.assertEqual(["a", "b", "c"], [p.name for p in packages])
+        self.assertEqual([1, 2, None], [p.depth for p in packages])
+        self.assertEqual([True, False, False], [p.direct for p in packages])
+
+    def test_iter_packages_with_nested_components(self):
+        with tempfile.TemporaryDirectory() as dir:
+            bom_file = os.path.join(dir, "bom.json")
+            with open(bom_file, "w") as write_file:
+                write_file.write(
+                    '{"components": [{"name": "a", "version": "1", '
+                    '"type": "library", "components": [{"name": "b", '
+                    '"version": "2", "type": "library"}]}]}'
+                )
+            packages = list(iter_packages_from_bom(filepath=bom_file))
+            self.assertEqual(["a", "b"], [p.name for p in packages])
+            self.assertEqual([None, None], [p.depth for p in packages])
+
     def test_get_packages_pypi_bom_success(self):
         packages = get_packages_from_bom(
             filepath=self.input_dir / "bom-pypi.json"
@@ -118,6 +183,211 @@ class TestProcessor(TestCase):
         packages = get_packages_from_bom(filepath=self.input_dir)
         self.assertEqual(6, len(packages))
 
+    def test_get_packages_multiple_boms_with_jobs_success(self):
+        packages = get_packages_from_bom(filepath=self.input_dir, jobs=2)
+        self.assertEqual(
+            get_packages_from_bom(filepath=self.input_dir, jobs=1), packages
+        )
+        self.assertEqual("cloud.google.com/go", packages[0].name)
+
+    def test_get_packages_multiple_boms_with_stats(self):
+        for jobs in (1, 2):
+            stats = Stats()
+            packages = get_packages_from_bom(
+                filepath=self.input_dir, jobs=jobs, stats=stats
+            )
+            self.assertEqual(6, len(packages))
+            self.assertEqual({"bom_files": 3, "components": 6}, stats.counters)
+            self.assertEqual(["load", "extract", "urls"], list(stats.stages))
+            self.assertEqual(3, stats.stages["load"].calls)
+
+    def test_iter_packages_with_stats(self):
+        stats = Stats()
+        packages = list(
+            iter_packages_from_bom(filepath=self.input_dir, stats=stats)
+        )
+        self.assertEqual(
+            get_packages_from_bom(filepath=self.input_dir), packages
+        )
+        self.assertEqual({"bom_files": 3, "components": 6}, stats.counters)
+
+    def test_get_packages_from_nested_directories(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for bom_file in self.input_dir.glob("*.json"):
+                service_dir = os.path.join(dir, bom_file.stem, "1.0")
+                os.makedirs(service_dir)
+                shutil.copy(bom_file, service_dir)
+            with open(os.path.join(dir, "package.json"), "w") as write_file:
+                write_file.write('{"name": "frontend", "version": "1.0"}')
+            stats = Stats()
+            packages = get_packages_from_bom(
+                filepath=dir, exclude=["bom-golang*"], stats=stats
+            )
+            self.assertEqual(4, len(packages))
+            self.assertEqual(1, stats.counters["skipped_files"])
+            self.assertEqual(
+                packages, list(iter_packages_from_bom(dir, exclude=["*go*"]))
+            )
+
+    def test_get_packages_multiple_boms_collects_errors(self):
+        with tempfile.TemporaryDirectory() as dir:
+            shutil.copy(self.input_dir / "bom-npm.json", dir)
+            invalid_file = os.path.join(dir, "invalid.json")
+            with open(invalid_file, "w") as write_file:
+                write_file.write('{"bomFormat": "CycloneDX"}')
+            errors = []
+            packages = get_packages_from_bom(
+                filepath=dir, jobs=2, errors=errors
+            )
+            self.assertEqual(1, len(packages))
+            self.assertEqual(1, len(errors))
+            self.assertEqual(invalid_file, errors[0].source)
+            with self.assertRaises(ProcessingError) as pe:
+                get_packages_from_bom(filepath=dir)
+            self.assertEqual(invalid_file, pe.exception.source)
+
+    def test_get_packages_skips_truncated_bom_in_directory(self):
+        with tempfile.TemporaryDirectory() as dir:
+            shutil.copy(self.input_dir / "bom-npm.json", dir)
+            truncated_file = os.path.join(dir, "truncated.json")
+            with open(truncated_file, "w") as write_file:
+                write_file.write('{"bomFormat": "CycloneDX", "components": [')
+            for jobs in (1, 2):
+                with self.subTest(jobs=jobs):
+                    errors = []
+                    packages = get_packages_from_bom(
+                        filepath=dir, jobs=jobs, errors=errors
+                    )
+                    self.assertEqual(1, len(packages))
+                    self.assertEqual(
+                        [truncated_file], [error.source for error in errors]
+                    )
+                    self.assertIn("Invalid BOM", str(errors[0]))
+
+    def test_iter_packages_skips_truncated_bom_in_directory(self):
+        with tempfile.TemporaryDirectory() as dir:
+            shutil.copy(self.input_dir / "bom-npm.json", dir)
+            truncated_file = os.path.join(dir, "truncated.json")
+            with open(truncated_file, "w") as write_file:
+                write_file.write('{"bomFormat": "CycloneDX", "components": [')
+            for stats in (None, Stats()):
+                with self.subTest(stats=stats):
+                    errors = []
+                    packages = list(
+                        iter_packages_from_bom(
+                            filepath=dir, stats=stats, errors=errors
+                        )
+                    )
+                    self.assertEqual(1, len(packages))
+                    self.assertEqual(
+                        [truncated_file], [error.source for error in errors]
+                    )
+                    self.assertIn("unexpected end", str(errors[0]))
+                    with self.assertRaises(ProcessingError) as pe:
+                        list(iter_packages_from_bom(filepath=dir, stats=stats))
+                    self.assertEqual(truncated_file, pe.exception.source)
+
+    def test_get_packages_fails_due_to_truncated_bom(self):
+        with tempfile.TemporaryDirectory() as dir:
+            truncated_file = os.path.join(dir, "truncated.json")
+            with open(truncated_file, "w") as write_file:
+                write_file.write('{"components": [')
+            for backend in filter(is_json_backend_available, json_backends):
+                with self.subTest(backend=backend):
+                    with self.assertRaises(ProcessingError) as pe:
+                        get_packages_from_bom(
+                            filepath=truncated_file, json_backend=backend
+                        )
+                    self.assertIn("Invalid BOM", str(pe.exception))
+                    self.assertEqual(truncated_file, pe.exception.source)
+
+    def test_get_packages_from_compressed_boms_and_archives(self):
+        expected = get_packages_from_bom(filepath=self.input_dir)
+        with tempfile.TemporaryDirectory() as dir:
+            compressed_dir = os.path.join(dir, "compressed")
+            os.mkdir(compressed_dir)
+            for bom_file, (compress, extension) in zip(
+                sorted(self.input_dir.glob("*.json")),
+                (
+                    (gzip.compress, ".gz"),
+                    (bz2.compress, ".bz2"),
+                    (lzma.compress, ".xz"),
+                ),
+            ):
+                with open(bom_file, "rb") as read_file:
+                    content = compress(read_file.read())
+                compressed_name = os.path.join(
+                    compressed_dir, bom_file.name + extension
+                )
+                with open(compressed_name, "wb") as write_file:
+                    write_file.write(content)
+            packages = get_packages_from_bom(filepath=compressed_dir)
+            self.assertEqual(
+                [package._replace(sources=()) for package in expected],
+                [package._replace(sources=()) for package in packages],
+            )
+            self.assertEqual(
+                os.path.join(compressed_dir, "bom-golang.json.gz"),
+                packages[0].sources[0],
+            )
+
+            archive_name = os.path.join(dir, "boms.tar.gz")
+            with tarfile.open(archive_name, "w:gz") as archive:
+                archive.add(self.input_dir, arcname="boms")
+            for archive_packages in (
+                get_packages_from_bom(filepath=archive_name, jobs=2),
+                list(iter_packages_from_bom(filepath=archive_name)),
+            ):
+                self.assertEqual(
+                    sorted(package.purl for package in expected),
+                    sorted(package.purl for package in archive_packages),
+                )
+                self.assertIn(
+                    os.path.join(archive_name, "boms", "bom-npm.json"),
+                    {package.sources[0] for package in archive_packages},
+                )
+
+    def test_get_packages_from_archive_collects_errors(self):
+        with tempfile.TemporaryDirectory() as dir:
+            archive_name = os.path.join(dir, "boms.zip")
+            with zipfile.ZipFile(archive_name, "w") as archive:
+                archive.write(self.input_dir / "bom-npm.json", "bom-npm.json")
+                archive.writestr("invalid.json.gz", b"no gzip")
+            errors = []
+            packages = get_packages_from_bom(
+                filepath=archive_name, errors=errors
+            )
+            self.assertEqual(1, len(packages))
+            self.assertEqual(
+                [os.path.join(archive_name, "invalid.json.gz")],
+                [error.source for error in errors],
+            )
+            with self.assertRaises(ProcessingError):
+                get_packages_from_bom(filepath=archive_name)
+
+    def test_processing_error_can_be_pickled(self):
+        error = pickle.loads(
+            pickle.dumps(ProcessingError("Invalid BOM", source="bom.json"))
+        )
+        self.assertEqual("Invalid BOM", str(error))
+        self.assertEqual("bom.json", error.source)
+
+    def test_iter_packages_from_bom_matches_get_packages(self):
+        for bom_file in sorted(self.input_dir.glob("*.json")):
+            self.assertEqual(
+                get_packages_from_bom(filepath=bom_file),
+                list(iter_packages_from_bom(filepath=bom_file)),
+            )
+
+    def test_iter_packages_multiple_boms_success(self):
+        packages = list(iter_packages_from_bom(filepath=self.input_dir))
+        self.assertEqual(6, len(packages))
+
+    def test_iter_packages_fails_due_to_file_does_not_exist(self):
+        with self.assertRaises(ProcessingError) as pe:
+            iter_packages_from_bom(filepath="bom.json")
+        self.assertEqual("Provided file does not exist", str(pe.exception))
+
     def test_filter_packages_by_type_no_type_returns_all(self):
         packages = packages = [
             Package(
@@ -169,3 +439,149 @@ class TestProcessor(TestCase):
         self.assertEqual(
             "pkg:npm/some-package_1.2.3", filtered_packages[0].purl
         )
+
+    def test_iter_packages_by_type_is_lazy(self):
+        def packages():
+            yield Package(
+                "test", "0.1.0", "lib", "MIT", "pkg:npm/test@0.1.0", ""
+            )
+            raise AssertionError("consumed too far")
+
+        filtered_packages = iter_packages_by_type(
+            packages=packages(), package_type="npm"
+        )
+        self.assertEqual("test", next(filtered_packages).name)
+
+    def test_iter_packages_by_type_groups_like_filter_packages_by_type(self):
+        packages = [
+            Package(name, "1.0", "lib", "MIT", purl.format(name), "")
+            for name, purl in (
+                ("a", "pkg:npm/{0}@1.0"),
+                ("b", "pkg:pypi/{0}@1.0"),
+                ("c", "pkg:golang/{0}@1.0"),
+                ("d", "pkg:npm/{0}@1.0"),
+                ("e", "pkg:pypi/{0}@1.0"),
+            )
+        ]
+        for package_type in ("", "npm", "pypi,npm", "golang,pypi,npm"):
+            self.assertEqual(
+                filter_packages_by_type(packages, package_type),
+                list(iter_packages_by_type(iter(packages), package_type)),
+                package_type,
+            )
+
+    def test_get_packages_from_bom_records_source(self):
+        bom_file = str(self.input_dir / "bom-npm.json")
+        packages = get_packages_from_bom(filepath=bom_file)
+        self.assertEqual((bom_file,), packages[0].sources)
+
+    def test_deduplicate_packages_merges_sources(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for name in ("a.json", "b.json"):
+                shutil.copy(
+                    self.input_dir / "bom-pypi.json", os.path.join(dir, name)
+                )
+            packages = deduplicate_packages(get_packages_from_bom(filepath=dir))
+            self.assertEqual(3, len(packages))
+            self.assertEqual("argcomplete", packages[0].name)
+            self.assertEqual(
+                (os.path.join(dir, "a.json"), os.path.join(dir, "b.json")),
+                packages[0].sources,
+            )
+
+    def test_deduplicate_packages_without_purl(self):
+        packages = deduplicate_packages(
+            [
+                Package("a", "1", "lib", "MIT", "", "", ("x.json",)),
+                Package("a", "1", "lib", "MIT", "", "", ("y.json",)),
+                Package("a", "2", "lib", "MIT", "", "", ("y.json",)),
+                Package("a", "1", "lib", "MIT", "", "", ("x.json",)),
+            ]
+        )
+        self.assertEqual(2, len(packages))
+        self.assertEqual(("x.json", "y.json"), packages[0].sources)
+        self.assertEqual(("y.json",), packages[1].sources)
+
+    def test_deduplicate_packages_keeps_smallest_depth(self):
+        packages = deduplicate_packages(
+            [
+                Package("a", "1", "lib", "MIT", "", "", ("x.json",), None),
+                Package("a", "1", "lib", "MIT", "", "", ("y.json",), 3),
+                Package("a", "1", "lib", "MIT", "", "", ("z.json",), 1),
+            ]
+        )
+        self.assertEqual(1, packages[0].depth)
+        self.assertTrue(packages[0].direct)
+
+    def test_filter_packages_by_multiple_types(self):
+        packages = get_packages_from_bom(filepath=self.input_dir)
+        filtered_packages = filter_packages_by_type(
+            packages=packages, package_type="npm, pypi"
+        )
+        self.assertEqual(4, len(filtered_packages))
+        self.assertEqual("eslint", filtered_packages[0].name)
+        self.assertEqual("argcomplete", filtered_packages[1].name)
+        lazy_packages = list(
+            iter_packages_by_type(packages=packages, package_type="npm,pypi")
+        )
+        self.assertEqual(sorted(filtered_packages), sorted(lazy_packages))
+
+    def test_index_packages_by_type(self):
+        index = index_packages_by_type(
+            get_packages_from_bom(filepath=self.input_dir)
+        )
+        self.assertEqual(["golang", "npm", "pypi"], sorted(index))
+        self.assertEqual(3, len(index["pypi"]))
+
+    def test_split_package_types(self):
+        self.assertEqual([], split_package_types(""))
+        self.assertEqual(
+            ["pypi", "npm"], split_package_types("pypi,,npm, pypi")
+        )
+
+    def test_get_packages_multiple_boms_with_cache_success(self):
+        with tempfile.TemporaryDirectory() as dir:
+            packages = get_packages_from_bom(
+                filepath=self.input_dir, cache_dir=dir
+            )
+            self.assertEqual(3, len(os.listdir(os.path.join(dir, "packages"))))
+            with patch("mdbom.bom.processor._load_bom") as load_patch:
+                cached_packages = get_packages_from_bom(
+                    filepath=self.input_dir, cache_dir=dir
+                )
+                load_patch.assert_not_called()
+            self.assertEqual(packages, cached_packages)
+
+    def test_get_packages_with_cache_depends_on_resolvers(self):
+        bom_file = str(self.input_dir / "bom-npm.json")
+        with tempfile.TemporaryDirectory() as dir, patch.dict(resolvers):
+            get_packages_from_bom(filepath=bom_file, cache_dir=dir)
+            register_resolver("npm", "https://npm.example.com/{name}")
+            packages = get_packages_from_bom(filepath=bom_file, cache_dir=dir)
+            self.assertEqual(2, len(os.listdir(os.path.join(dir, "packages"))))
+        self.assertTrue(packages[0].url.startswith("https://npm.example.com/"))
+
+    def test_get_packages_with_jobs_collects_diagnostics(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for name in ("a.json", "b.json"):
+                with open(os.path.join(dir, name), "w") as write_file:
+                    json.dump(
+                        {
+                            "bomFormat": "CycloneDX",
+                            "components": [
+                                {
+                                    "name": "lib",
+                                    "version": "1",
+                                    "type": "library",
+                                    "purl": "pkg:generic/org/lib@1",
+                                }
+                            ],
+                        },
+                        write_file,
+                    )
+            diagnostics = Diagnostics(warning_limit=0)
+            with collect_diagnostics(diagnostics):
+                get_packages_from_bom(filepath=dir, jobs=2)
+        self.assertEqual(
+            {("unsupported_type", "generic"): 2}, diagnostics.counts
+        )
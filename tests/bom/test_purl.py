@@ -0,0 +1,45 @@
+from unittest import TestCase
+from mdbom.bom.bom import Package
+from mdbom.bom.purl import PURL, parse_purl
+
+
+class TestPURL(TestCase):
+    def test_parse_purl_fails_due_to_invalid_purl(self):
+        self.assertIsNone(parse_purl(""))
+        self.assertIsNone(parse_purl("pypi/django@1.11.1"))
+
+    def test_parse_purl_all_parts(self):
+        purl = parse_purl(
+            "pkg:golang/cloud.google.com/go@v0.93.3?type=module#sub/path"
+        )
+        self.assertEqual(
+            PURL(
+                "golang",
+                "cloud.google.com",
+                "go",
+                "v0.93.3",
+                "type=module",
+                "sub/path",
+            ),
+            purl,
+        )
+        self.assertEqual("cloud.google.com/go", purl.package)
+
+    def test_parse_purl_without_version(self):
+        purl = parse_purl("pkg:pypi/django")
+        self.assertEqual("django", purl.package)
+        self.assertIsNone(purl.version)
+
+    def test_parse_purl_is_cached(self):
+        self.assertIs(
+            parse_purl("pkg:npm/foobar@12.3.1"),
+            parse_purl("pkg:npm/foobar@12.3.1"),
+        )
+
+    def test_package_purl_type(self):
+        package = Package(
+            "django", "1.11.1", "lib", "MIT", "pkg:pypi/django@1.11.1", ""
+        )
+        self.assertEqual("pypi", package.purl_type)
+        self.assertEqual("django", package.parsed_purl.name)
+        self.assertEqual("", package._replace(purl="").purl_type)
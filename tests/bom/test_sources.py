@@ -0,0 +1,169 @@
+import bz2
+import gzip
+import io
+import os
+import tarfile
+import tempfile
+import zipfile
+from unittest import TestCase
+from unittest.mock import patch
+from mdbom.bom.bom import ProcessingError
+from mdbom.bom.sources import (
+    BufferReader,
+    find_bom_files,
+    get_file_format,
+    is_archive,
+    is_bom_file,
+    iter_bom_documents,
+    map_file,
+    open_bom,
+)
+from mdbom.bom.stream import iter_components
+
+
+class TestSources(TestCase):
+    def test_buffer_reader_reads_slices(self):
+        reader = BufferReader(memoryview(b"abcdef"))
+        self.assertEqual(b"abcd", reader.read(4))
+        self.assertEqual(b"ef", reader.read(4))
+        self.assertEqual(b"", reader.read(4))
+        self.assertEqual(b"", reader.read())
+
+    def test_map_file(self):
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "bom.json")
+            with open(file_name, "wb") as write_file:
+                write_file.write(b'{"components": [{"name": "six"}]}')
+            with map_file(file_name) as content:
+                self.assertIsInstance(content, memoryview)
+                self.assertEqual(
+                    [{"name": "six"}],
+                    list(iter_components(BufferReader(content), 4)),
+                )
+
+    def test_map_file_keeps_error_referencing_content(self):
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "bom.json")
+            with open(file_name, "wb") as write_file:
+                write_file.write(b'{"components": [')
+
+            def fail(content):
+                chunk = content[1:]  # noqa: F841
+                raise ValueError("truncated")
+
+            with self.assertRaises(ValueError) as ve:
+                with map_file(file_name) as content:
+                    fail(content)
+        self.assertEqual("truncated", str(ve.exception))
+
+    def test_map_empty_file(self):
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "bom.json")
+            open(file_name, "wb").close()
+            with map_file(file_name) as content:
+                self.assertEqual(b"", content)
+
+    def test_get_file_format(self):
+        self.assertEqual((".json", ""), get_file_format("bom.json"))
+        self.assertEqual((".json", ".gz"), get_file_format("bom.JSON.gz"))
+        self.assertEqual((".tar", ".gz"), get_file_format("boms.tgz"))
+        self.assertEqual((".tar", ".zst"), get_file_format("boms.tar.zst"))
+        self.assertEqual((".zip", ""), get_file_format("boms.zip"))
+        self.assertTrue(is_bom_file("bom.json.xz"))
+        self.assertTrue(is_bom_file("boms.tar.bz2"))
+        self.assertFalse(is_bom_file("boms.zip.gz"))
+        self.assertFalse(is_bom_file("notes.txt.gz"))
+        self.assertTrue(is_archive("boms.tar"))
+        self.assertFalse(is_archive("bom.json.gz"))
+
+    def test_iter_bom_documents_of_archives(self):
+        content = b'{"components": []}'
+        with tempfile.TemporaryDirectory() as dir:
+            tar_name = os.path.join(dir, "boms.tar.xz")
+            with tarfile.open(tar_name, "w:xz") as archive:
+                for name, data in (
+                    ("a/bom.json", content),
+                    ("b/bom.json.gz", gzip.compress(content)),
+                    ("README.md", b"# BOMs"),
+                ):
+                    info = tarfile.TarInfo(name)
+                    info.size = len(data)
+                    archive.addfile(info, io.BytesIO(data))
+            zip_name = os.path.join(dir, "boms.zip")
+            with zipfile.ZipFile(zip_name, "w") as archive:
+                archive.writestr("c/bom.json.bz2", bz2.compress(content))
+            for file_name, members in (
+                (tar_name, ["a/bom.json", "b/bom.json.gz"]),
+                (zip_name, ["c/bom.json.bz2"]),
+            ):
+                documents = [
+                    (source, stream.read())
+                    for source, stream in iter_bom_documents(file_name)
+                ]
+                self.assertEqual(
+                    [
+                        (os.path.join(file_name, member), content)
+                        for member in members
+                    ],
+                    documents,
+                )
+
+    def test_open_bom_requires_zstandard(self):
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "bom.json.zst")
+            open(file_name, "wb").close()
+            with patch("mdbom.bom.sources.zstandard", None):
+                with self.assertRaises(ProcessingError) as pe:
+                    with open_bom(file_name):
+                        pass
+        self.assertEqual(
+            "Reading .zst files requires the zstandard package",
+            str(pe.exception),
+        )
+
+    def test_find_bom_files(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for path in (
+                "bom.json",
+                "notes.txt",
+                "team-a/service/1.0/bom.json.gz",
+                "team-a/service/1.0/bom.cdx",
+                "team-b/boms.tar",
+                "team-b/node_modules/package.json",
+            ):
+                file_name = os.path.join(dir, path)
+                os.makedirs(os.path.dirname(file_name), exist_ok=True)
+                open(file_name, "w").close()
+            os.symlink(os.path.join(dir, "team-a"), os.path.join(dir, "team-c"))
+
+            def find(include=(), exclude=()):
+                return [
+                    os.path.relpath(path, dir).replace(os.sep, "/")
+                    for path in find_bom_files(dir, include, exclude)
+                ]
+
+            self.assertEqual(
+                [
+                    "bom.json",
+                    "team-a/service/1.0/bom.json.gz",
+                    "team-b/boms.tar",
+                    "team-b/node_modules/package.json",
+                ],
+                find(),
+            )
+            self.assertEqual(
+                ["bom.json", "team-a/service/1.0/bom.json.gz"],
+                find(exclude=["node_modules", "*.tar"]),
+            )
+            self.assertEqual(
+                ["team-a/service/1.0/bom.cdx"],
+                find(include=["team-a/*.cdx"]),
+            )
+            self.assertEqual(
+                ["bom.json", "team-b/node_modules/package.json"],
+                find(include=["*.json"]),
+            )
+
+    def test_find_bom_files_fails_due_to_missing_directory(self):
+        with self.assertRaises(ProcessingError):
+            find_bom_files("does-not-exist")
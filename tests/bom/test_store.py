@@ -0,0 +1,92 @@
+import os
+import pathlib
+import tempfile
+from unittest import TestCase
+from mdbom.bom.bom import Package
+from mdbom.bom.processor import filter_packages_by_type, get_packages_from_bom
+from mdbom.bom.store import PackageStore
+from mdbom.md.md import generate_markdown
+
+
+class TestStore(TestCase):
+
+    input_dir = pathlib.Path.cwd() / "tests" / "inputs"
+    examples_dir = pathlib.Path.cwd() / "examples"
+
+    def setUp(self):
+        self.packages = get_packages_from_bom(filepath=self.input_dir)
+        self.store = PackageStore.from_packages(self.packages)
+
+    def test_store_views_look_like_packages(self):
+        self.assertEqual(len(self.packages), len(self.store))
+        self.assertEqual(self.packages, list(self.store))
+        self.assertEqual(self.packages[-1], self.store[-1])
+        view = self.store[0]
+        self.assertEqual(self.packages[0].name, view.name)
+        self.assertEqual(self.packages[0].licenses, view.licenses)
+        self.assertEqual(self.packages[0].sources, view.sources)
+        self.assertEqual("golang", view.purl_type)
+        self.assertEqual(self.packages[0], view.to_package())
+        with self.assertRaises(IndexError):
+            self.store[len(self.packages)]
+
+    def test_store_keeps_depth(self):
+        packages = [
+            Package("a", "1", "lib", "MIT", "", "", (), 1),
+            Package("b", "1", "lib", "MIT", "", "", (), None),
+            Package("c", "1", "lib", "MIT", "", "", (), 0),
+        ]
+        store = PackageStore.from_packages(packages)
+        self.assertEqual(packages, list(store))
+        self.assertEqual([1, None, 0], [p.depth for p in store])
+        self.assertEqual([True, False, False], [p.direct for p in store])
+        self.assertEqual(
+            ["b", "c", "a"], [p.name for p in store.sort_by("depth")]
+        )
+
+    def test_store_encodes_repeated_values_once(self):
+        self.assertEqual(["library"], self.store.kinds.values)
+        self.assertEqual(
+            ["golang", "npm", "pypi"], self.store.purl_types.values
+        )
+        self.assertEqual(3, len(self.store.sources.values))
+
+    def test_store_filter_by_type(self):
+        self.assertEqual(
+            filter_packages_by_type(self.packages, "pypi,npm"),
+            list(filter_packages_by_type(self.store, "pypi,npm")),
+        )
+        self.assertEqual(0, len(self.store.filter_by_type(["cargo"])))
+
+    def test_store_sort_by(self):
+        self.assertEqual(
+            sorted(self.packages, key=lambda package: package.name),
+            list(self.store.sort_by("name")),
+        )
+        self.assertEqual(
+            sorted(self.packages, key=lambda package: package.licenses),
+            list(self.store.sort_by("licenses")),
+        )
+        with self.assertRaises(ValueError):
+            self.store.sort_by("unknown")
+
+    def test_store_slice(self):
+        self.assertEqual(self.packages[1:3], list(self.store[1:3]))
+
+    def test_generate_markdown_from_store(self):
+        store = PackageStore.from_packages(
+            [Package("test", "0.1.0", "lib", "MIT", "", "https://some.url")]
+        )
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "3rdParty.md")
+            generate_markdown(
+                template=self.examples_dir / "template.md.jinja",
+                file_name=file_name,
+                packages=store,
+                cache_dir="",
+            )
+            with open(file_name, "r") as result:
+                self.assertIn(
+                    "| test | 0.1.0 | MIT | lib | https://some.url |",
+                    result.read(),
+                )
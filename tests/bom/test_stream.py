@@ -0,0 +1,77 @@
+import io
+import json
+import pathlib
+from unittest import TestCase
+from mdbom.bom.bom import ProcessingError
+from mdbom.bom.stream import get_bom_format, iter_components
+
+
+class TestStream(TestCase):
+
+    input_dir = pathlib.Path.cwd() / "tests" / "inputs"
+
+    def test_iter_components_matches_json_load(self):
+        for bom_file in sorted(self.input_dir.glob("*.json")):
+            with open(bom_file, "r") as read_file:
+                expected = json.load(read_file)["components"]
+            for chunk_size in (1, 7, 4096):
+                with open(bom_file, "rb") as read_file:
+                    components = list(
+                        iter_components(read_file, chunk_size=chunk_size)
+                    )
+                self.assertEqual(expected, components)
+
+    def test_iter_components_skips_other_members(self):
+        content = {
+            "metadata": {"tools": [{"name": 'x"]}', "version": "1"}]},
+            "serialNumber": 'urn:uuid:\\"escaped\\\\',
+            "version": 1,
+            "empty": [],
+            "flag": True,
+            "nothing": None,
+            "components": [{"name": "a", "nested": {"b": [1, 2.5e3]}}],
+            "dependencies": [{"ref": "a", "dependsOn": []}],
+        }
+        data = json.dumps(content, indent=3).encode()
+        for chunk_size in (1, 3, 1024):
+            components = list(
+                iter_components(io.BytesIO(data), chunk_size=chunk_size)
+            )
+            self.assertEqual(content["components"], components)
+
+    def test_iter_components_without_components(self):
+        self.assertEqual([], list(iter_components(io.BytesIO(b"{}"))))
+        self.assertEqual(
+            [], list(iter_components(io.BytesIO(b'{"components": []}')))
+        )
+
+    def test_iter_components_fails_due_to_truncated_file(self):
+        with self.assertRaises(ProcessingError) as pe:
+            list(iter_components(io.BytesIO(b'{"components": [{"name": "a"')))
+        self.assertEqual(
+            "Invalid BOM: unexpected end of data", str(pe.exception)
+        )
+
+    def test_iter_components_fails_due_to_no_object(self):
+        with self.assertRaises(ProcessingError) as pe:
+            list(iter_components(io.BytesIO(b"[]")))
+        self.assertEqual(
+            "Invalid BOM: expected '{' at character 0", str(pe.exception)
+        )
+
+    def test_get_bom_format(self):
+        for document, bom_format in (
+            (b'{"bomFormat": "CycloneDX", "components": []}', "CycloneDX"),
+            (b'{"metadata": {"a": [1, "}"]}, "bomFormat": "SPDX"}', "SPDX"),
+            (b'{"name": "package.json"}', None),
+            (b'{"bomFormat": 1}', None),
+            (b"[1, 2]", None),
+        ):
+            self.assertEqual(
+                bom_format, get_bom_format(io.BytesIO(document), chunk_size=3)
+            )
+
+    def test_get_bom_format_stops_reading_at_format(self):
+        stream = io.BytesIO(b'{"bomFormat": "CycloneDX", ' + b" " * 100000)
+        self.assertEqual("CycloneDX", get_bom_format(stream))
+        self.assertLess(stream.tell(), 10000)
@@ -1,10 +1,23 @@
+import json
+import os
+import tempfile
 from testfixtures import LogCapture
 from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from mdbom.bom.bom import ProcessingError
 from mdbom.bom.urls import (
+    RESOLVERS_ENV,
+    PatternResolver,
     _convert_purl_to_url,
-    _get_package_and_version,
+    configure_resolvers,
+    describe_resolvers,
     get_url,
+    load_resolvers,
+    register_resolver,
+    resolve_urls,
+    resolvers,
 )
+from mdbom.bom.purl import parse_purl
 
 
 class TestURLs(TestCase):
@@ -15,20 +28,23 @@ class TestURLs(TestCase):
     valid_pypi_purl = "pkg:pypi/django@1.11.1"
     valid_npm_purl = "pkg:npm/foobar@12.3.1"
 
-    def test_get_package_and_version_empty_return_due_to_invalid_purl(self):
-        package, version = _get_package_and_version(self.invalid_purl_rest)
-        self.assertEqual("", package)
-        self.assertEqual("", version)
-
-    def test_get_package_and_version_only_package_due_to_invalid_purl(self):
-        package, version = _get_package_and_version("pkg:pypi/some-package@")
-        self.assertEqual("some-package", package)
-        self.assertEqual("", version)
-
-    def test_get_package_and_version_only_package_due_to_invalid_purl(self):
-        package, version = _get_package_and_version("pkg:pypi/@1.2.3")
-        self.assertEqual("", package)
-        self.assertEqual("1.2.3", version)
+    def test_get_url_fails_due_to_missing_name_or_version(self):
+        for purl in (
+            self.invalid_purl_rest,
+            "pkg:pypi/some-package@",
+            "pkg:pypi/@1.2.3",
+        ):
+            with self.subTest(purl=purl), LogCapture() as log:
+                self.assertEqual("", get_url(purl))
+                log.check(
+                    (
+                        "MdBOM",
+                        "WARNING",
+                        "No valid purl: {0} provided, returning empty URL".format(
+                            purl
+                        ),
+                    )
+                )
 
     def test_convert_purl_to_url_fails_due_to_unsupported_type(self):
         with LogCapture() as log:
@@ -77,3 +93,176 @@ class TestURLs(TestCase):
     def test_get_url_for_pypi_success(self):
         res = get_url(self.valid_pypi_purl)
         self.assertEqual("https://pypi.org/project/django/1.11.1", res)
+
+    def test_get_url_for_further_ecosystems(self):
+        for purl, url in (
+            (
+                "pkg:maven/org.apache.commons/commons-lang3@3.12.0",
+                "https://central.sonatype.com/artifact/org.apache.commons/"
+                "commons-lang3/3.12.0",
+            ),
+            ("pkg:cargo/serde@1.0.0", "https://crates.io/crates/serde/1.0.0"),
+            (
+                "pkg:nuget/Newtonsoft.Json@13.0.1",
+                "https://www.nuget.org/packages/Newtonsoft.Json/13.0.1",
+            ),
+            (
+                "pkg:gem/rails@7.0.4",
+                "https://rubygems.org/gems/rails/versions/7.0.4",
+            ),
+            (
+                "pkg:composer/laravel/framework@9.0.0",
+                "https://packagist.org/packages/laravel/framework#9.0.0",
+            ),
+            (
+                "pkg:deb/debian/curl@7.88.1?arch=amd64",
+                "https://sources.debian.org/src/curl/7.88.1/",
+            ),
+            (
+                "pkg:docker/library/nginx@1.25",
+                "https://hub.docker.com/r/library/nginx/tags?name=1.25",
+            ),
+            (
+                "pkg:github/pallets/click@8.1.3",
+                "https://github.com/pallets/click/tree/8.1.3",
+            ),
+        ):
+            with self.subTest(purl=purl):
+                self.assertEqual(url, get_url(purl))
+
+    def test_get_url_fails_due_to_missing_namespace(self):
+        with LogCapture() as log:
+            self.assertEqual("", get_url("pkg:maven/commons-lang3@3.12.0"))
+            log.check(
+                (
+                    "MdBOM",
+                    "WARNING",
+                    "No valid purl: pkg:maven/commons-lang3@3.12.0 provided, "
+                    "returning empty URL",
+                )
+            )
+
+    def test_pattern_resolver_rejects_unknown_fields(self):
+        with self.assertRaises(ValueError):
+            PatternResolver("https://example.com/{name}/{release}")
+        resolver = PatternResolver("https://example.com/{type}/{name}")
+        self.assertEqual(("type", "name"), resolver.fields)
+        self.assertEqual(
+            "https://example.com/conda/numpy",
+            resolver(parse_purl("pkg:conda/numpy")),
+        )
+
+    def test_resolve_urls_resolves_each_purl_once(self):
+        resolver = MagicMock(return_value="https://example.com/a")
+        with patch.dict(resolvers, {"custom": resolver}):
+            with LogCapture() as log:
+                urls = resolve_urls(
+                    [
+                        "pkg:custom/a@1",
+                        self.valid_pypi_purl,
+                        "pkg:custom/a@1",
+                        self.unsupported_purl_type,
+                        self.unsupported_purl_type,
+                    ]
+                )
+                log.check(
+                    (
+                        "MdBOM",
+                        "WARNING",
+                        "Package type: mypackage not supported, "
+                        "returning empty URL",
+                    )
+                )
+        self.assertEqual(
+            [
+                "https://example.com/a",
+                "https://pypi.org/project/django/1.11.1",
+                "https://example.com/a",
+                "",
+                "",
+            ],
+            urls,
+        )
+        resolver.assert_called_once_with(parse_purl("pkg:custom/a@1"))
+
+    def test_register_resolver(self):
+        with patch.dict(resolvers):
+            register_resolver("conda", "https://anaconda.org/{name}/{version}")
+            register_resolver("custom", lambda purl: "https://example.com")
+            self.assertEqual(
+                "https://anaconda.org/numpy/1.24",
+                get_url("pkg:conda/numpy@1.24"),
+            )
+            self.assertEqual("https://example.com", get_url("pkg:custom/a"))
+        self.assertNotIn("conda", resolvers)
+
+    def test_load_resolvers(self):
+        with tempfile.TemporaryDirectory() as dir, patch.dict(resolvers):
+            config = os.path.join(dir, "resolvers.json")
+            with open(config, "w") as write_file:
+                json.dump(
+                    {"pypi": "https://pypi.example.com/{name}/{version}"},
+                    write_file,
+                )
+            load_resolvers(config)
+            self.assertEqual(
+                "https://pypi.example.com/django/1.11.1",
+                get_url(self.valid_pypi_purl),
+            )
+            for content, message in (
+                ("{", "Invalid URL resolvers"),
+                ("[]", "URL resolvers must map purl types to patterns"),
+                ('{"a": 1}', "Invalid URL resolver for a"),
+                ('{"a": "{release}"}', "Unknown fields in URL pattern"),
+            ):
+                with open(config, "w") as write_file:
+                    write_file.write(content)
+                with self.assertRaises(ProcessingError) as pe:
+                    load_resolvers(config)
+                self.assertIn(message, str(pe.exception))
+            with self.assertRaises(ProcessingError) as pe:
+                load_resolvers(os.path.join(dir, "missing.json"))
+            self.assertIn("Cannot read URL resolvers", str(pe.exception))
+
+    @patch("mdbom.bom.urls._get_entry_points")
+    def test_configure_resolvers(self, entry_points_patch):
+        entry_point = MagicMock()
+        entry_point.name = "conda"
+        entry_point.dist.version = "1.0"
+        entry_point.load.return_value = "https://anaconda.org/{name}"
+        entry_points_patch.return_value = [entry_point]
+        with tempfile.TemporaryDirectory() as dir, patch.dict(resolvers):
+            config = os.path.join(dir, "resolvers.json")
+            with open(config, "w") as write_file:
+                json.dump({"cargo": "https://lib.rs/crates/{name}"}, write_file)
+            configure_resolvers.cache_clear()
+            try:
+                with patch.dict(os.environ, {RESOLVERS_ENV: config}):
+                    self.assertEqual(
+                        "https://anaconda.org/numpy",
+                        get_url("pkg:conda/numpy"),
+                    )
+                    self.assertEqual(
+                        "https://lib.rs/crates/serde",
+                        get_url("pkg:cargo/serde@1"),
+                    )
+                entry_point.load.assert_called_once_with()
+            finally:
+                configure_resolvers.cache_clear()
+
+    def test_describe_resolvers(self):
+        def resolve(purl):
+            return ""
+
+        description = dict(describe_resolvers())
+        self.assertEqual(
+            "https://crates.io/crates/{name}/{version}", description["cargo"]
+        )
+        with patch.dict(resolvers):
+            register_resolver("custom", resolve)
+            register_resolver("cargo", "https://lib.rs/crates/{name}")
+            changed = dict(describe_resolvers())
+        self.assertEqual("https://lib.rs/crates/{name}", changed["cargo"])
+        self.assertEqual(
+            "{0}.{1}".format(__name__, resolve.__qualname__), changed["custom"]
+        )
@@ -1,9 +1,18 @@
 import os
 import pathlib
 import tempfile
+from concurrent.futures import ThreadPoolExecutor
 from unittest import TestCase
+from unittest.mock import patch
+from jinja2 import DictLoader, Environment
 from mdbom.bom.bom import Package
-from mdbom.md.md import GeneratingError, generate_markdown
+from mdbom.md.md import (
+    GeneratingError,
+    generate_markdown,
+    generate_markdown_files,
+    get_template_files,
+    load_template,
+)
 
 
 class TestGenerator(TestCase):
@@ -51,3 +60,169 @@ class TestGenerator(TestCase):
             self.assertIn(
                 "| test | 0.1.0 | MIT | lib | https://some.url |", content
             )
+
+    def test_generate_success_from_iterator(self):
+        template = self.input_dir / "template.md.jinja"
+        packages = (
+            Package(
+                "test{0}".format(index),
+                "0.1.0",
+                "lib",
+                "MIT",
+                "pkg:pypi/some-package_1.2.3",
+                "https://some.url",
+            )
+            for index in range(3)
+        )
+
+        with tempfile.TemporaryDirectory() as dir:
+            file_name = os.path.join(dir, "3rdParty.md")
+            generate_markdown(
+                template=template, file_name=file_name, packages=packages
+            )
+            with open(file_name, "r") as result:
+                content = result.read()
+            self.assertIn(
+                "| test2 | 0.1.0 | MIT | lib | https://some.url |", content
+            )
+
+    def test_generate_fails_due_to_template_not_existing(self):
+        with tempfile.TemporaryDirectory() as dir:
+            with self.assertRaises(GeneratingError) as ge:
+                generate_markdown(
+                    template=os.path.join(dir, "missing.md.jinja"),
+                    file_name=os.path.join(dir, "3rdParty.md"),
+                    packages=[],
+                    cache_dir="",
+                )
+        self.assertEqual("Provided template does not exist.", str(ge.exception))
+
+    def test_generate_success_with_include_and_cache(self):
+        with tempfile.TemporaryDirectory() as dir:
+            template = os.path.join(dir, "main.md.jinja")
+            with open(os.path.join(dir, "row.md.jinja"), "w") as row:
+                row.write("- {{ package.name }}")
+            with open(template, "w") as main:
+                main.write(
+                    "{% for package in packages %}"
+                    "{% include 'row.md.jinja' %}\n{% endfor %}"
+                )
+            cache_dir = os.path.join(dir, "cache")
+            file_name = os.path.join(dir, "3rdParty.md")
+            packages = [Package("test", "0.1.0", "lib", "MIT", "", "")]
+            generate_markdown(
+                template=template,
+                file_name=file_name,
+                packages=packages,
+                cache_dir=cache_dir,
+            )
+            with open(file_name, "r") as result:
+                self.assertEqual("- test\n", result.read())
+            self.assertEqual(
+                2, len(os.listdir(os.path.join(cache_dir, "templates")))
+            )
+            self.assertIs(
+                load_template(template, cache_dir=cache_dir),
+                load_template(template, cache_dir=cache_dir),
+            )
+
+    def test_generate_success_with_views(self):
+        with tempfile.TemporaryDirectory() as dir:
+            template = os.path.join(dir, "views.md.jinja")
+            with open(template, "w") as write_file:
+                write_file.write(
+                    "{% for kind, pkgs in packages_by_type.items() %}"
+                    "{{ kind }}:{% for p in pkgs %} {{ p.name }}{% endfor %}\n"
+                    "{% endfor %}"
+                    "{{ packages_sorted | map(attribute='name') | join(',') }}"
+                )
+            file_name = os.path.join(dir, "3rdParty.md")
+            generate_markdown(
+                template=template,
+                file_name=file_name,
+                packages=[
+                    Package("b", "1", "lib", "MIT", "pkg:npm/b@1", ""),
+                    Package("c", "1", "lib", "MIT", "pkg:pypi/c@1", ""),
+                    Package("a", "1", "lib", "MIT", "pkg:npm/a@1", ""),
+                ],
+                cache_dir="",
+            )
+            with open(file_name, "r") as result:
+                self.assertEqual("npm: a b\npypi: c\na,b,c", result.read())
+
+    def test_generate_markdown_files_success(self):
+        template = self.input_dir / "template.md.jinja"
+        packages = [Package("test", "0.1.0", "lib", "MIT", "", "")]
+        with tempfile.TemporaryDirectory() as dir:
+            file_names = [
+                os.path.join(dir, "{0}.md".format(index)) for index in range(4)
+            ]
+            generated_files = generate_markdown_files(
+                targets=[
+                    (template, file_name, packages) for file_name in file_names
+                ],
+                cache_dir="",
+            )
+            self.assertEqual(file_names, generated_files)
+            for file_name in file_names:
+                with open(file_name, "r") as result:
+                    self.assertIn("| test | 0.1.0 | MIT | lib |", result.read())
+
+    def test_generate_markdown_files_uses_thread_per_target(self):
+        template = self.input_dir / "template.md.jinja"
+        with tempfile.TemporaryDirectory() as dir, patch(
+            "mdbom.md.md.ThreadPoolExecutor",
+            wraps=ThreadPoolExecutor,
+        ) as executor:
+            generate_markdown_files(
+                targets=[
+                    (template, os.path.join(dir, "{0}.md".format(index)), [])
+                    for index in range(3)
+                ],
+                cache_dir="",
+            )
+        executor.assert_called_once_with(max_workers=3)
+
+    def test_generate_markdown_files_fails_due_to_empty_file_name(self):
+        with self.assertRaises(GeneratingError) as ge:
+            generate_markdown_files(
+                targets=[
+                    (self.input_dir / "template.md.jinja", "", []),
+                    ("", "test.md", []),
+                ]
+            )
+        self.assertEqual(
+            "No valid output file name provided.", str(ge.exception)
+        )
+
+    def test_get_template_files_follows_references(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for name, content in (
+                ("main.md.jinja", "{% extends 'base.md.jinja' %}"),
+                ("base.md.jinja", "{% include 'row.md.jinja' %}"),
+                ("row.md.jinja", "{% include 'base.md.jinja' %}"),
+                ("dynamic.md.jinja", "{% include package.kind %}"),
+            ):
+                with open(os.path.join(dir, name), "w") as template:
+                    template.write(content)
+            self.assertEqual(
+                sorted(
+                    os.path.join(dir, name)
+                    for name in (
+                        "main.md.jinja",
+                        "base.md.jinja",
+                        "row.md.jinja",
+                    )
+                ),
+                get_template_files(os.path.join(dir, "main.md.jinja")),
+            )
+            self.assertIsNone(
+                get_template_files(os.path.join(dir, "dynamic.md.jinja"))
+            )
+
+    def test_get_template_files_without_file(self):
+        with patch(
+            "mdbom.md.md.get_environment",
+            return_value=Environment(loader=DictLoader({"main.md.jinja": ""})),
+        ):
+            self.assertIsNone(get_template_files("main.md.jinja"))
@@ -0,0 +1,66 @@
+from unittest import TestCase
+from unittest.mock import patch
+from mdbom.bom.bom import Package
+from mdbom.bom.store import PackageStore
+from mdbom.md.views import create_context
+
+
+class TestViews(TestCase):
+
+    packages = [
+        Package("zlib", "1.0", "library", "MIT", "pkg:npm/zlib@1.0", ""),
+        Package("Django", "4.0", "library", "BSD", "pkg:pypi/django@4.0", ""),
+        Package("attrs", "2.0", "library", "MIT", "pkg:pypi/attrs@2.0", ""),
+        Package("attrs", "1.0", "library", "", "pkg:pypi/attrs@1.0", ""),
+    ]
+
+    def test_packages_sorted(self):
+        context = create_context(self.packages)
+        self.assertIs(self.packages, context["packages"])
+        self.assertEqual(
+            [("attrs", "1.0"), ("attrs", "2.0"), ("Django", "4.0")],
+            [(p.name, p.version) for p in context["packages_sorted"][:3]],
+        )
+        self.assertEqual(4, len(context["packages_sorted"]))
+
+    def test_packages_grouped(self):
+        context = create_context(self.packages)
+        by_type = context["packages_by_type"]
+        self.assertEqual(["npm", "pypi"], list(by_type))
+        self.assertEqual(
+            ["attrs", "attrs", "Django"],
+            [package.name for package in by_type["pypi"]],
+        )
+        by_license = context["packages_by_license"]
+        self.assertEqual(["", "BSD", "MIT"], list(by_license))
+        self.assertEqual(
+            ["attrs", "zlib"],
+            [package.name for package in by_license["MIT"]],
+        )
+        self.assertNotIn("maven", by_type)
+        self.assertEqual(["BSD", "MIT"], context["license_index"].keys())
+
+    def test_views_are_built_once_on_access(self):
+        with patch("mdbom.md.views.sorted", create=True) as sorted_patch:
+            sorted_patch.side_effect = sorted
+            context = create_context(self.packages)
+            self.assertEqual(0, sorted_patch.call_count)
+            for _ in range(3):
+                list(context["packages_sorted"])
+                list(context["packages_by_type"].items())
+            self.assertEqual(2, sorted_patch.call_count)
+
+    def test_views_share_packages_of_iterator(self):
+        context = create_context(iter(self.packages))
+        self.assertEqual(4, len(context["packages_sorted"]))
+        self.assertEqual(2, len(context["packages_by_type"]))
+
+    def test_views_of_package_store(self):
+        context = create_context(PackageStore.from_packages(self.packages))
+        self.assertEqual(
+            ["attrs", "attrs", "Django", "zlib"],
+            [package.name for package in context["packages_sorted"]],
+        )
+        self.assertEqual(
+            ["zlib"], [p.name for p in context["packages_by_type"]["npm"]]
+        )
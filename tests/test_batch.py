@@ -0,0 +1,199 @@
+import json
+import os
+import pathlib
+import tempfile
+from testfixtures import LogCapture
+from unittest import TestCase
+from unittest.mock import patch
+from mdbom.batch import (
+    BatchJob,
+    JobResult,
+    format_result,
+    format_summary,
+    load_manifest,
+    run_jobs,
+)
+from mdbom.bom.bom import ProcessingError
+
+
+class TestBatch(TestCase):
+
+    input_dir = pathlib.Path.cwd() / "tests" / "inputs"
+    examples_dir = pathlib.Path.cwd() / "examples"
+
+    def write_manifest(self, dir, content, name="manifest.json"):
+        manifest = os.path.join(dir, name)
+        with open(manifest, "w") as write_file:
+            if isinstance(content, str):
+                write_file.write(content)
+            else:
+                json.dump(content, write_file)
+        return manifest
+
+    def test_load_manifest_resolves_relative_paths(self):
+        with tempfile.TemporaryDirectory() as dir:
+            manifest = self.write_manifest(
+                dir,
+                {
+                    "jobs": [
+                        {
+                            "input": "bom.json",
+                            "template": "/templates/t.jinja",
+                            "output": "out/a.md",
+                            "type": ["pypi", "npm"],
+                            "deduplicate": True,
+                        }
+                    ]
+                },
+            )
+            self.assertEqual(
+                [
+                    BatchJob(
+                        os.path.join(dir, "bom.json"),
+                        "/templates/t.jinja",
+                        os.path.join(dir, "out/a.md"),
+                        "pypi,npm",
+                        True,
+                    )
+                ],
+                load_manifest(manifest),
+            )
+
+    def test_load_yaml_manifest(self):
+        with tempfile.TemporaryDirectory() as dir:
+            manifest = self.write_manifest(
+                dir,
+                "- input: bom.json\n"
+                "  template: t.jinja\n"
+                "  output: a.md\n"
+                "  type: pypi\n",
+                name="manifest.yaml",
+            )
+            try:
+                jobs = load_manifest(manifest)
+            except ProcessingError as pe:
+                self.skipTest(str(pe))
+        self.assertEqual(1, len(jobs))
+        self.assertEqual("pypi", jobs[0].package_type)
+
+    def test_load_manifest_fails_for_invalid_manifests(self):
+        with tempfile.TemporaryDirectory() as dir:
+            for content, message in (
+                ("{", "Invalid manifest"),
+                ({"other": []}, "Manifest contains no jobs"),
+                (["a.json"], "Job 1 is not a mapping"),
+                (
+                    [{"input": "a.json", "output": "a.md", "kind": "x"}],
+                    "Job 1 has no template and unknown keys kind",
+                ),
+                (
+                    [
+                        {
+                            "input": "a.json",
+                            "template": "t.jinja",
+                            "output": "a.md",
+                            "deduplicate": "false",
+                        }
+                    ],
+                    "Job 1 has a non-boolean deduplicate",
+                ),
+            ):
+                manifest = self.write_manifest(dir, content)
+                with self.assertRaises(ProcessingError) as pe:
+                    load_manifest(manifest)
+                self.assertIn(message, str(pe.exception))
+            with self.assertRaises(ProcessingError) as pe:
+                load_manifest(os.path.join(dir, "missing.json"))
+            self.assertIn("Cannot read manifest", str(pe.exception))
+
+    def test_run_jobs_continues_after_failed_job(self):
+        template = str(self.examples_dir / "template.md.jinja")
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                with tempfile.TemporaryDirectory() as dir:
+                    jobs = [
+                        BatchJob(
+                            str(self.input_dir / "missing.json"),
+                            template,
+                            os.path.join(dir, "a.md"),
+                        ),
+                        BatchJob(
+                            str(self.input_dir),
+                            template,
+                            os.path.join(dir, "b.md"),
+                            "npm",
+                        ),
+                    ]
+                    results = list(run_jobs(jobs, workers=workers))
+                    self.assertEqual(jobs, [result.job for result in results])
+                    self.assertEqual(
+                        [True, False], [result.failed for result in results]
+                    )
+                    self.assertFalse(os.path.exists(jobs[0].output))
+                    with open(jobs[1].output, "r") as read_file:
+                        content = read_file.read()
+                    self.assertIn("eslint", content)
+                    self.assertNotIn("argcomplete", content)
+
+    def test_run_jobs_reports_template_errors(self):
+        with tempfile.TemporaryDirectory() as dir:
+            template = os.path.join(dir, "broken.jinja")
+            with open(template, "w") as write_file:
+                write_file.write("{% for %}")
+            job = BatchJob(
+                str(self.input_dir / "bom-npm.json"),
+                template,
+                os.path.join(dir, "a.md"),
+            )
+            [result] = run_jobs([job])
+        self.assertTrue(result.failed)
+
+    def test_format_results(self):
+        job = BatchJob("bom.json", "t.jinja", "a.md")
+        self.assertEqual(
+            "OK     a.md (1.50s), skipped 2 BOM file(s)",
+            format_result(JobResult(job, "", 2, 1.5)),
+        )
+        self.assertEqual(
+            "FAILED a.md (0.00s): No file",
+            format_result(JobResult(job, "No file")),
+        )
+        self.assertEqual(
+            "1 of 2 jobs succeeded, 1 failed",
+            format_summary([JobResult(job), JobResult(job, "No file")]),
+        )
+
+    @patch("mdbom.batch.get_packages_from_bom")
+    def test_run_jobs_in_single_process(self, packages_patch):
+        packages_patch.return_value = []
+        with tempfile.TemporaryDirectory() as dir:
+            job = BatchJob(
+                "bom.json",
+                str(self.examples_dir / "template.md.jinja"),
+                os.path.join(dir, "a.md"),
+            )
+            results = list(run_jobs([job, job], workers=1))
+        self.assertEqual(2, packages_patch.call_count)
+        self.assertEqual([False, False], [r.failed for r in results])
+
+    @patch("mdbom.batch.get_packages_from_bom")
+    def test_run_jobs_continues_after_unexpected_error(self, packages_patch):
+        packages_patch.side_effect = [RuntimeError("unexpected"), []]
+        with tempfile.TemporaryDirectory() as dir:
+            jobs = [
+                BatchJob(
+                    "bom.json",
+                    str(self.examples_dir / "template.md.jinja"),
+                    os.path.join(dir, name),
+                )
+                for name in ("a.md", "b.md")
+            ]
+            with LogCapture() as log:
+                results = list(run_jobs(jobs, workers=1))
+            self.assertEqual([True, False], [r.failed for r in results])
+            self.assertIn("unexpected", results[0].error)
+            self.assertTrue(os.path.isfile(jobs[1].output))
+        self.assertIn(
+            "Job for {0} failed".format(jobs[0].output),
+            log.records[0].getMessage(),
+        )
@@ -0,0 +1,90 @@
+import json
+import os
+import tempfile
+from unittest import TestCase
+from benchmarks.run import (
+    StageResult,
+    compare,
+    get_startup_imports,
+    normalize,
+    run_benchmarks,
+    run_reference,
+    run_startup_benchmark,
+)
+from benchmarks.synthetic import generate_bom, write_bom
+from mdbom.bom.processor import get_packages_from_bom
+
+
+class TestBenchmarks(TestCase):
+    def test_write_bom_matches_generate_bom(self):
+        with tempfile.TemporaryDirectory() as dir:
+            bom_file = os.path.join(dir, "bom.json")
+            write_bom(bom_file, components=20)
+            with open(bom_file, "r") as read_file:
+                self.assertEqual(generate_bom(20), json.load(read_file))
+            packages = get_packages_from_bom(filepath=bom_file)
+        self.assertEqual(20, len(packages))
+        self.assertTrue(
+            {"npm", "pypi"} <= {package.purl_type for package in packages}
+        )
+
+    def test_run_benchmarks_covers_all_stages(self):
+        results = run_benchmarks(components=10, repeat=1)
+        self.assertEqual(
+            ["load", "extract", "urls", "filter", "render"], list(results)
+        )
+        for result in results.values():
+            self.assertGreater(result.seconds, 0)
+            self.assertGreater(result.peak_bytes, 0)
+
+    def test_compare_detects_regressions(self):
+        baseline = {"10": {"load": {"relative": 1.0, "peak_bytes": 100}}}
+        self.assertEqual(
+            [],
+            compare(
+                {"10": {"load": {"relative": 1.2, "peak_bytes": 100}}},
+                baseline,
+                0.5,
+            ),
+        )
+        self.assertEqual(
+            ["10 components, load: peak_bytes 200 > 100"],
+            compare(
+                {"10": {"load": {"relative": 1.0, "peak_bytes": 200}}},
+                baseline,
+                0.5,
+            ),
+        )
+        self.assertEqual(
+            [],
+            compare({"10": {"load": {"seconds": 2.0}}}, baseline, 0.5),
+        )
+
+    def test_normalize_relates_timings_to_reference(self):
+        self.assertEqual(
+            {"10": {"load": {"relative": 4.0, "peak_bytes": 100}}},
+            normalize({"10": {"load": StageResult(2.0, 100)}}, 0.5),
+        )
+
+    def test_run_reference(self):
+        self.assertGreater(run_reference(repeat=1), 0)
+
+    def test_startup_does_not_import_heavy_modules(self):
+        for arguments in (["--help"], ["info"], ["generate", "--help"]):
+            imports = get_startup_imports(arguments)
+            self.assertIn("mdbom.mdbom", imports)
+            for module in (
+                "jinja2",
+                "asyncio",
+                "mdbom.bom.processor",
+                "mdbom.bom.sources",
+                "mdbom.batch",
+                "mdbom.md.md",
+                "mdbom.server",
+                "mdbom.stats",
+            ):
+                self.assertNotIn(module, imports, arguments)
+
+    def test_run_startup_benchmark(self):
+        result = run_startup_benchmark(repeat=1)["import"]
+        self.assertGreater(result.seconds, 0)
@@ -0,0 +1,54 @@
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from mdbom.bom.bom import Package
+from mdbom.cache import (
+    get_cache_dir,
+    hash_file,
+    hash_values,
+    is_output_cached,
+    load_packages,
+    store_outputs,
+    store_packages,
+)
+
+
+class TestCache(TestCase):
+    def test_get_cache_dir_from_environment(self):
+        with patch.dict(os.environ, {"MDBOM_CACHE_DIR": "/tmp/mdbom"}):
+            self.assertEqual("/tmp/mdbom", get_cache_dir())
+        with patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/xdg"}):
+            os.environ.pop("MDBOM_CACHE_DIR", None)
+            self.assertEqual(os.path.join("/tmp/xdg", "mdbom"), get_cache_dir())
+
+    def test_hash_values_depends_on_order_and_content(self):
+        self.assertEqual(hash_values(["a", 1]), hash_values(["a", 1]))
+        self.assertNotEqual(hash_values(["a", 1]), hash_values([1, "a"]))
+        self.assertNotEqual(hash_values(["ab"]), hash_values(["a", "b"]))
+
+    def test_output_cache_detects_modified_outputs(self):
+        with tempfile.TemporaryDirectory() as dir:
+            output = os.path.join(dir, "3rdParty.md")
+            with open(output, "w") as write_file:
+                write_file.write("content")
+            self.assertFalse(is_output_cached(dir, "key"))
+            store_outputs(dir, "key", [output])
+            self.assertTrue(is_output_cached(dir, "key"))
+            self.assertFalse(is_output_cached(dir, "other"))
+            with open(output, "a") as write_file:
+                write_file.write(" changed")
+            self.assertFalse(is_output_cached(dir, "key"))
+
+    def test_packages_cache_roundtrip(self):
+        packages = [
+            Package("test", "0.1.0", "lib", "MIT", "", "", ("a.json",)),
+        ]
+        with tempfile.TemporaryDirectory() as dir:
+            key = hash_values([hash_file(__file__)])
+            self.assertIsNone(load_packages(dir, key, "b.json"))
+            store_packages(dir, key, packages)
+            self.assertEqual(
+                [packages[0]._replace(sources=("b.json",))],
+                load_packages(dir, key, "b.json"),
+            )
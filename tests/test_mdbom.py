@@ -1,11 +1,17 @@
+import json
 import os
 import pathlib
+import pstats
+import shutil
 import tempfile
 from click.testing import CliRunner
+from testfixtures import LogCapture
 from unittest import TestCase
 from unittest.mock import patch
 from mdbom.bom.processor import ProcessingError, get_packages_from_bom
-from mdbom.mdbom import cli, generate
+from mdbom.bom.urls import register_resolver, resolvers
+from mdbom.mdbom import cli, diff, generate
+from mdbom.server import DEFAULT_CACHE_SIZE
 
 
 class TestCLICommands(TestCase):
@@ -71,6 +77,306 @@ class TestCLICommands(TestCase):
                 content,
             )
 
+    def test_generate_success_stream(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            out_name = os.path.join(dir, "3rdParty.md")
+            template_name = self.examples_dir / "template.md.jinja"
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={file_name}",
+                    f"--output={out_name}",
+                    f"--template={template_name}",
+                    "--stream",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            with open(out_name, "r") as result:
+                content = result.read()
+            self.assertIn(
+                "| eslint | 7.27.0 | MIT | library | https://www.npmjs.com/package/eslint/v/7.27.0 |",
+                content,
+            )
+
+    def test_generate_success_deduplicate(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            bom_dir = os.path.join(dir, "boms")
+            os.mkdir(bom_dir)
+            for name in ("a.json", "b.json"):
+                with open(self.input_dir / "bom-npm.json", "r") as bom:
+                    with open(os.path.join(bom_dir, name), "w") as copy:
+                        copy.write(bom.read())
+            out_name = os.path.join(dir, "3rdParty.md")
+            template_name = self.examples_dir / "template.md.jinja"
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={bom_dir}",
+                    f"--output={out_name}",
+                    f"--template={template_name}",
+                    "--deduplicate",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            with open(out_name, "r") as result:
+                content = result.read()
+            self.assertEqual(1, content.count("| eslint | 7.27.0 |"))
+
+    def test_generate_success_split_by_type(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            out_name = os.path.join(dir, "3rdParty.md")
+            template_name = self.examples_dir / "template.md.jinja"
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={self.input_dir}",
+                    f"--output={out_name}",
+                    f"--template={template_name}",
+                    "--type=npm,pypi",
+                    "--split-by-type",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            self.assertEqual(
+                ["3rdParty-npm.md", "3rdParty-pypi.md"], sorted(os.listdir(dir))
+            )
+            with open(os.path.join(dir, "3rdParty-npm.md"), "r") as result:
+                content = result.read()
+            self.assertIn("| eslint | 7.27.0 |", content)
+            self.assertNotIn("| argcomplete |", content)
+
+    def test_generate_stream_groups_multiple_types(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            contents = []
+            for mode in ([], ["--stream"]):
+                out_name = os.path.join(dir, "3rdParty.md")
+                result = runner.invoke(
+                    generate,
+                    [
+                        f"--input={self.input_dir}",
+                        f"--output={out_name}",
+                        f"--template={self.examples_dir / 'template.md.jinja'}",
+                        "--type=pypi,npm",
+                    ]
+                    + mode,
+                )
+                self.assertEqual(0, result.exit_code, result.output)
+                with open(out_name, "r") as result:
+                    contents.append(result.read())
+        self.assertEqual(contents[0], contents[1])
+        self.assertLess(
+            contents[1].index("| argcomplete |"),
+            contents[1].index("| eslint |"),
+        )
+
+    def test_generate_fails_due_to_json_backend_with_stream(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={self.input_dir / 'bom-npm.json'}",
+                    f"--output={os.path.join(dir, '3rdParty.md')}",
+                    f"--template={self.examples_dir / 'template.md.jinja'}",
+                    "--stream",
+                    "--json-backend=json",
+                ],
+            )
+            self.assertEqual([], os.listdir(dir))
+        self.assertEqual(1, result.exit_code)
+        self.assertIn(
+            "The JSON backend cannot be chosen together with --stream.",
+            result.output,
+        )
+
+    def test_generate_success_multiple_outputs(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            list_template = os.path.join(dir, "list.md.jinja")
+            with open(list_template, "w") as template:
+                template.write(
+                    "{% for package in packages %}- {{ package.name }}\n"
+                    "{% endfor %}"
+                )
+            table_out = os.path.join(dir, "table.md")
+            list_out = os.path.join(dir, "list.md")
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={file_name}",
+                    f"--template={self.examples_dir / 'template.md.jinja'}",
+                    f"--output={table_out}",
+                    f"--template={list_template}",
+                    f"--output={list_out}",
+                    "--stream",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            with open(table_out, "r") as result:
+                self.assertIn("| eslint | 7.27.0 |", result.read())
+            with open(list_out, "r") as result:
+                self.assertEqual("- eslint\n", result.read())
+
+    def test_generate_fails_due_to_missing_output(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        result = runner.invoke(
+            generate,
+            [
+                f"--input={file_name}",
+                "--template=a.md.jinja",
+                "--template=b.md.jinja",
+                "--output=a.md",
+            ],
+        )
+        self.assertEqual(1, result.exit_code)
+        self.assertEqual(
+            result.output,
+            "Error: Each template requires exactly one output file.\n",
+        )
+
+    def test_generate_success_incremental(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            template_name = os.path.join(dir, "template.md.jinja")
+            with open(self.examples_dir / "template.md.jinja", "r") as source:
+                with open(template_name, "w") as template:
+                    template.write(source.read())
+            out_name = os.path.join(dir, "3rdParty.md")
+            arguments = [
+                f"--input={file_name}",
+                f"--output={out_name}",
+                f"--template={template_name}",
+                "--incremental",
+            ]
+            cache_env = {"MDBOM_CACHE_DIR": os.path.join(dir, "cache")}
+            with patch.dict(os.environ, cache_env):
+                result = runner.invoke(generate, arguments)
+                self.assertIn("Generated markdown file:", result.output)
+                result = runner.invoke(generate, arguments)
+                self.assertEqual(0, result.exit_code)
+                self.assertEqual(
+                    "Markdown files are up to date.\n", result.output
+                )
+                with open(template_name, "a") as template:
+                    template.write("changed")
+                result = runner.invoke(generate, arguments)
+                self.assertIn("Generated markdown file:", result.output)
+                with patch.dict(resolvers):
+                    register_resolver("npm", "https://npm.example.com/{name}")
+                    result = runner.invoke(generate, arguments)
+                self.assertIn("Generated markdown file:", result.output)
+
+    def test_generate_notice_with_license_texts(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            license_dir = os.path.join(dir, "licenses")
+            os.mkdir(license_dir)
+            with open(os.path.join(license_dir, "MIT.txt"), "w") as text:
+                text.write("MIT License text")
+            template_name = os.path.join(dir, "notice.md.jinja")
+            with open(template_name, "w") as template:
+                template.write(
+                    "{% for license in license_index %}"
+                    "{{ license.key }} ({{ license.packages | length }})\n"
+                    "{{ license.text }}\n{% endfor %}"
+                )
+            out_name = os.path.join(dir, "NOTICE.md")
+            arguments = [
+                f"--input={file_name}",
+                f"--output={out_name}",
+                f"--template={template_name}",
+                f"--license-texts={license_dir}",
+                "--incremental",
+            ]
+            cache_env = {"MDBOM_CACHE_DIR": os.path.join(dir, "cache")}
+            with patch.dict(os.environ, cache_env):
+                result = runner.invoke(generate, arguments)
+                self.assertEqual(0, result.exit_code)
+                with open(out_name, "r") as result_file:
+                    content = result_file.read()
+                self.assertEqual(1, content.count("MIT License text"))
+                self.assertRegex(content, r"MIT \(\d+\)")
+                with open(os.path.join(license_dir, "MIT.txt"), "a") as text:
+                    text.write(" changed")
+                result = runner.invoke(generate, arguments)
+                self.assertIn("Generated markdown file:", result.output)
+            result = runner.invoke(
+                generate,
+                arguments[:3] + [f"--license-texts={dir}/missing"],
+            )
+            self.assertEqual(1, result.exit_code)
+            self.assertIn("Cannot read license texts", result.output)
+
+    def test_generate_success_with_stats_and_profile(self):
+        file_name = self.input_dir / "bom-npm.json"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            stats_name = os.path.join(dir, "stats.json")
+            profile_name = os.path.join(dir, "mdbom.prof")
+            for mode in ("--jobs=1", "--stream"):
+                result = runner.invoke(
+                    generate,
+                    [
+                        f"--input={file_name}",
+                        f"--output={os.path.join(dir, '3rdParty.md')}",
+                        f"--template={self.examples_dir / 'template.md.jinja'}",
+                        "--stats",
+                        f"--stats-file={stats_name}",
+                        f"--profile={profile_name}",
+                        mode,
+                    ],
+                )
+                self.assertEqual(0, result.exit_code)
+                self.assertIn("render", result.output)
+                with open(stats_name, "r") as stats_file:
+                    stats = json.load(stats_file)
+                self.assertEqual(
+                    {
+                        "load",
+                        "extract",
+                        "urls",
+                        "filter",
+                        "compile",
+                        "render",
+                        "write",
+                    },
+                    set(stats["stages"]),
+                )
+                self.assertEqual(1, stats["counters"]["components"])
+                self.assertGreater(stats["counters"]["bytes_written"], 0)
+                self.assertGreater(stats["total"]["wall_seconds"], 0)
+                pstats.Stats(profile_name)
+
+    def test_generate_success_with_include_and_exclude(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            out_name = os.path.join(dir, "3rdParty.md")
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={self.input_dir}",
+                    f"--output={out_name}",
+                    f"--template={self.examples_dir / 'template.md.jinja'}",
+                    "--include=bom-*.json",
+                    "--exclude=bom-pypi.json",
+                    "--exclude=bom-golang.json",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            with open(out_name, "r") as result:
+                content = result.read()
+            self.assertIn("| eslint | 7.27.0 |", content)
+            self.assertNotIn("argcomplete", content)
+
     def test_generate_fails_due_to_input_file_not_existing(self):
         file_name = "bom.json"
         runner = CliRunner()
@@ -127,3 +433,261 @@ class TestCLICommands(TestCase):
             self.assertEqual(
                 result.output, "Error: No valid template provided.\n"
             )
+
+    def test_serve_fails_due_to_missing_template_dir(self):
+        runner = CliRunner()
+        result = runner.invoke(cli, ["serve", "--templates=does-not-exist"])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn("template directory does not exist", result.output)
+
+    @patch("mdbom.server.serve")
+    def test_serve_uses_default_cache_size(self, serve_patch):
+        runner = CliRunner()
+        result = runner.invoke(
+            cli, ["serve", f"--templates={self.examples_dir}"]
+        )
+        self.assertEqual(0, result.exit_code)
+        self.assertEqual(
+            DEFAULT_CACHE_SIZE, serve_patch.call_args[1]["cache_size"]
+        )
+
+    @patch("mdbom.server.serve")
+    def test_serve_passes_options(self, serve_patch):
+        runner = CliRunner()
+        result = runner.invoke(
+            cli,
+            [
+                "serve",
+                f"--templates={self.examples_dir}",
+                "--port=9000",
+                "--cache-size=4",
+            ],
+        )
+        self.assertEqual(0, result.exit_code)
+        kwargs = serve_patch.call_args[1]
+        self.assertEqual(9000, kwargs["port"])
+        self.assertEqual(4, kwargs["cache_size"])
+        self.assertEqual(str(self.examples_dir), kwargs["template_dir"])
+
+    def test_batch_reports_every_job(self):
+        template_name = self.examples_dir / "template.md.jinja"
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            manifest = os.path.join(dir, "manifest.json")
+            with open(manifest, "w") as write_file:
+                json.dump(
+                    [
+                        {
+                            "input": str(self.input_dir / "missing.json"),
+                            "template": str(template_name),
+                            "output": "a.md",
+                        },
+                        {
+                            "input": str(self.input_dir / "bom-pypi.json"),
+                            "template": str(template_name),
+                            "output": "b.md",
+                            "type": "pypi",
+                        },
+                    ],
+                    write_file,
+                )
+            result = runner.invoke(cli, ["batch", manifest, "--jobs=1"])
+            self.assertEqual(1, result.exit_code)
+            self.assertIn("FAILED", result.output)
+            self.assertIn("1 of 2 jobs succeeded, 1 failed", result.output)
+            self.assertIn("Not all jobs succeeded.", result.output)
+            self.assertTrue(os.path.isfile(os.path.join(dir, "b.md")))
+
+    def test_generate_and_batch_report_truncated_bom(self):
+        runner = CliRunner()
+        template = str(self.examples_dir / "template.md.jinja")
+        with tempfile.TemporaryDirectory() as dir:
+            bom_file = os.path.join(dir, "truncated.json")
+            with open(bom_file, "w") as write_file:
+                write_file.write('{"bomFormat": "CycloneDX", "components": [')
+            result = runner.invoke(
+                generate,
+                [
+                    f"--input={bom_file}",
+                    f"--output={os.path.join(dir, 'a.md')}",
+                    f"--template={template}",
+                ],
+            )
+            self.assertEqual(1, result.exit_code)
+            self.assertIn("Invalid BOM", result.output)
+            self.assertNotIsInstance(result.exception, BufferError)
+            manifest = os.path.join(dir, "manifest.json")
+            with open(manifest, "w") as write_file:
+                json.dump(
+                    [
+                        {
+                            "input": bom_file,
+                            "template": template,
+                            "output": "a.md",
+                        },
+                        {
+                            "input": str(self.input_dir / "bom-npm.json"),
+                            "template": template,
+                            "output": "b.md",
+                        },
+                    ],
+                    write_file,
+                )
+            result = runner.invoke(cli, ["batch", manifest, "--jobs=1"])
+            self.assertEqual(1, result.exit_code)
+            self.assertIn("Invalid BOM", result.output)
+            self.assertIn("1 of 2 jobs succeeded, 1 failed", result.output)
+            self.assertTrue(os.path.isfile(os.path.join(dir, "b.md")))
+
+    def test_generate_skips_truncated_bom_in_directory(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            input_dir = os.path.join(dir, "boms")
+            os.mkdir(input_dir)
+            shutil.copy(self.input_dir / "bom-npm.json", input_dir)
+            truncated_file = os.path.join(input_dir, "truncated.json")
+            with open(truncated_file, "w") as write_file:
+                write_file.write('{"bomFormat": "CycloneDX", "components": [')
+            for mode in ([], ["--stream"]):
+                out_name = os.path.join(dir, "3rdParty.md")
+                with LogCapture("MdBOM") as log:
+                    result = runner.invoke(
+                        generate,
+                        [
+                            f"--input={input_dir}",
+                            f"--output={out_name}",
+                            f"--template={self.examples_dir / 'template.md.jinja'}",
+                        ]
+                        + mode,
+                    )
+                self.assertEqual(0, result.exit_code, result.output)
+                self.assertIn(
+                    "Skipped {0}: Invalid BOM".format(truncated_file),
+                    str(log),
+                )
+                with open(out_name, "r") as result_file:
+                    self.assertIn("| eslint | 7.27.0 |", result_file.read())
+
+    def test_batch_fails_due_to_invalid_manifest(self):
+        runner = CliRunner()
+        result = runner.invoke(cli, ["batch", "does-not-exist.json"])
+        self.assertEqual(1, result.exit_code)
+        self.assertIn("Cannot read manifest", result.output)
+
+    def test_generate_summarizes_purl_issues(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            bom_file = os.path.join(dir, "bom.json")
+            with open(bom_file, "w") as write_file:
+                json.dump(
+                    {
+                        "components": [
+                            {
+                                "name": "lib{0}".format(index),
+                                "version": "1",
+                                "type": "library",
+                                "purl": "pkg:generic/org/lib{0}@1".format(
+                                    index
+                                ),
+                            }
+                            for index in range(20)
+                        ]
+                    },
+                    write_file,
+                )
+            diagnostics_file = os.path.join(dir, "diagnostics.json")
+            result = runner.invoke(
+                cli,
+                [
+                    "generate",
+                    f"--input={bom_file}",
+                    f"--output={os.path.join(dir, 'out.md')}",
+                    f"--template={self.examples_dir / 'template.md.jinja'}",
+                    f"--diagnostics-file={diagnostics_file}",
+                ],
+            )
+            self.assertEqual(0, result.exit_code)
+            self.assertIn("20 purl issue(s):", result.output)
+            self.assertIn(
+                "20 purl type without URL support (generic)", result.output
+            )
+            with open(diagnostics_file, "r") as read_file:
+                report = json.load(read_file)
+        self.assertEqual(20, report["total"])
+        self.assertEqual(20, len(report["issues"][0]["purls"]))
+
+    def test_diff(self):
+        runner = CliRunner()
+        with tempfile.TemporaryDirectory() as dir:
+            boms = {}
+            for release, components in (
+                (
+                    "old",
+                    [
+                        ("lodash", "4.17.20", "MIT"),
+                        ("left-pad", "1.0", "WTFPL"),
+                    ],
+                ),
+                (
+                    "new",
+                    [("lodash", "4.17.21", "MIT"), ("react", "18.0", "MIT")],
+                ),
+            ):
+                boms[release] = os.path.join(dir, release + ".json")
+                with open(boms[release], "w") as write_file:
+                    json.dump(
+                        {
+                            "components": [
+                                {
+                                    "name": name,
+                                    "version": version,
+                                    "type": "library",
+                                    "licenses": [{"license": {"id": license}}],
+                                    "purl": "pkg:npm/{0}@{1}".format(
+                                        name, version
+                                    ),
+                                }
+                                for name, version, license in components
+                            ]
+                        },
+                        write_file,
+                    )
+            out_name = os.path.join(dir, "changes.md")
+            for mode in ([], ["--stream"]):
+                arguments = [
+                    f"--old={boms['old']}",
+                    f"--new={boms['new']}",
+                    f"--output={out_name}",
+                    f"--template={self.examples_dir / 'changes.md.jinja'}",
+                ]
+                result = runner.invoke(diff, arguments + mode)
+                self.assertEqual(0, result.exit_code, result.output)
+                self.assertIn("1 added, 1 removed, 1 changed", result.output)
+                with open(out_name, "r") as result_file:
+                    content = result_file.read()
+                self.assertIn(
+                    "| react | 18.0 | MIT | https://www.npmjs.com/package/react/v/18.0 |",
+                    content,
+                )
+                self.assertIn("| left-pad | 1.0 | WTFPL |", content)
+                self.assertIn(
+                    "| lodash | 4.17.20 | 4.17.21 | MIT | MIT |", content
+                )
+            result = runner.invoke(
+                diff,
+                [
+                    f"--old={os.path.join(dir, 'missing.json')}",
+                    f"--new={boms['new']}",
+                    f"--output={out_name}",
+                    f"--template={self.examples_dir / 'changes.md.jinja'}",
+                ],
+            )
+            self.assertEqual(1, result.exit_code)
+            result = runner.invoke(
+                diff, arguments + ["--stream", "--json-backend=json"]
+            )
+            self.assertEqual(1, result.exit_code)
+            self.assertIn(
+                "The JSON backend cannot be chosen together with --stream.",
+                result.output,
+            )
@@ -0,0 +1,139 @@
+import asyncio
+import functools
+import os
+import pathlib
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+from mdbom.server import PackageCache, Server
+
+
+class TestPackageCache(TestCase):
+    def test_package_cache_evicts_least_recently_used(self):
+        cache = PackageCache(max_size=2)
+        cache.get("a", lambda: ["a"])
+        cache.get("b", lambda: ["b"])
+        self.assertEqual(["a"], cache.get("a", lambda: ["new a"]))
+        cache.get("c", lambda: ["c"])
+        self.assertEqual(2, len(cache))
+        self.assertEqual(["new b"], cache.get("b", lambda: ["new b"]))
+        self.assertEqual(["c"], cache.get("c", lambda: ["new c"]))
+
+
+def async_test(test):
+    # Runs a coroutine test within the event loop of the test case.
+    @functools.wraps(test)
+    def run(self):
+        return self.loop.run_until_complete(test(self))
+
+    return run
+
+
+class TestServer(TestCase):
+
+    input_dir = pathlib.Path.cwd() / "tests" / "inputs"
+    examples_dir = pathlib.Path.cwd() / "examples"
+
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.server = Server(self.examples_dir)
+        self.listener = self.loop.run_until_complete(self.server.start())
+        self.port = self.listener.sockets[0].getsockname()[1]
+
+    def tearDown(self):
+        self.listener.close()
+        self.loop.run_until_complete(self.listener.wait_closed())
+        self.loop.close()
+
+    async def request(self, target, body=b"", method="POST"):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        writer.write(
+            "{0} {1} HTTP/1.1\r\nContent-Length: {2}\r\n\r\n".format(
+                method, target, len(body)
+            ).encode()
+            + body
+        )
+        await writer.drain()
+        response = await reader.read()
+        writer.close()
+        head, _, content = response.partition(b"\r\n\r\n")
+        return int(head.split()[1]), content.decode()
+
+    @async_test
+    async def test_render_uploaded_bom(self):
+        with open(self.input_dir / "bom-pypi.json", "rb") as read_file:
+            body = read_file.read()
+        status, content = await self.request(
+            "/render?template=template.md.jinja", body
+        )
+        self.assertEqual(200, status)
+        self.assertIn("argcomplete", content)
+        with patch("mdbom.server.get_packages_from_content") as load_patch:
+            status, cached_content = await self.request(
+                "/render?template=template.md.jinja", body
+            )
+            load_patch.assert_not_called()
+        self.assertEqual(content, cached_content)
+
+    @async_test
+    async def test_render_bom_path_filtered_by_type(self):
+        status, content = await self.request(
+            "/render?template=template.md.jinja&type=npm&path={0}".format(
+                self.input_dir
+            )
+        )
+        self.assertEqual(200, status)
+        self.assertIn("eslint", content)
+        self.assertNotIn("argcomplete", content)
+
+    @async_test
+    async def test_render_concurrent_requests(self):
+        responses = await asyncio.gather(
+            *(
+                self.request(
+                    "/render?template=template.md.jinja&path={0}".format(
+                        self.input_dir / name
+                    )
+                )
+                for name in ("bom-pypi.json", "bom-npm.json") * 4
+            )
+        )
+        self.assertEqual([200] * 8, [status for status, _ in responses])
+        self.assertEqual(2, len(self.server.packages))
+
+    @async_test
+    async def test_render_rejects_invalid_requests(self):
+        self.assertEqual(404, (await self.request("/other"))[0])
+        self.assertEqual(405, (await self.request("/render", method="GET"))[0])
+        self.assertEqual(
+            (400, "No template provided"), await self.request("/render")
+        )
+        self.assertEqual(
+            (400, "No BOM provided"),
+            await self.request("/render?template=template.md.jinja"),
+        )
+        self.assertEqual(
+            404,
+            (await self.request("/render?template=../README.md", b"{}"))[0],
+        )
+        status, content = await self.request(
+            "/render?template=template.md.jinja", b"{}"
+        )
+        self.assertEqual(400, status)
+        self.assertIn("Invalid BOM", content)
+
+    @async_test
+    async def test_render_on_unix_socket(self):
+        with tempfile.TemporaryDirectory() as dir:
+            socket_path = os.path.join(dir, "mdbom.sock")
+            listener = await self.server.start(socket_path=socket_path)
+            try:
+                reader, writer = await asyncio.open_unix_connection(socket_path)
+                writer.write(b"POST /render HTTP/1.1\r\n\r\n")
+                await writer.drain()
+                response = await reader.read()
+                writer.close()
+            finally:
+                listener.close()
+                await listener.wait_closed()
+        self.assertTrue(response.startswith(b"HTTP/1.1 400 Bad Request"))
@@ -0,0 +1,73 @@
+import pickle
+import time
+import tracemalloc
+from unittest import TestCase
+from unittest.mock import patch
+from testfixtures import LogCapture
+from mdbom.bom.urls import get_url
+from mdbom.stats import Stats, collect_stats, count, measure
+
+
+class TestStats(TestCase):
+    def test_nested_stages_are_not_accounted_twice(self):
+        stats = Stats()
+        with stats.stage("outer"):
+            with stats.stage("inner"):
+                time.sleep(0.02)
+        self.assertEqual(1, stats.stages["outer"].calls)
+        self.assertGreaterEqual(stats.stages["inner"].wall_seconds, 0.02)
+        self.assertLess(stats.stages["outer"].wall_seconds, 0.02)
+
+    def test_stages_and_counters_are_accumulated(self):
+        stats = Stats()
+        for _ in range(3):
+            with measure(stats, "load"):
+                count(stats, "components", 2)
+        self.assertEqual(3, stats.stages["load"].calls)
+        self.assertEqual({"components": 6}, stats.counters)
+
+    def test_measure_without_stats(self):
+        with measure(None, "load"):
+            count(None, "components")
+
+    def test_merge_pickled_stats(self):
+        worker = Stats()
+        with worker.stage("load"):
+            worker.count("components", 4)
+        stats = Stats()
+        with stats.stage("load"):
+            stats.count("components", 1)
+        stats.merge(pickle.loads(pickle.dumps(worker)))
+        self.assertEqual(2, stats.stages["load"].calls)
+        self.assertEqual({"components": 5}, stats.counters)
+
+    def test_collect_stats_records_total_memory_and_url_warnings(self):
+        stats = Stats()
+        with collect_stats(stats):
+            with stats.stage("urls"):
+                data = [bytearray(1 << 20)]
+                with LogCapture():
+                    get_url("invalid")
+                get_url("pkg:pypi/six@1.16.0")
+        del data
+        report = stats.to_dict()
+        self.assertEqual({"url_warnings": 1}, report["counters"])
+        self.assertGreaterEqual(report["stages"]["urls"]["peak_bytes"], 1 << 20)
+        self.assertEqual(1, report["total"]["calls"])
+        self.assertIn("urls", stats.format())
+
+    @patch("mdbom.stats._CAN_RESET_PEAK", False)
+    def test_stage_peaks_without_reset_peak(self):
+        stats = Stats()
+        tracemalloc.start()
+        try:
+            with stats.stage("large"):
+                data = bytearray(4 << 20)
+            del data
+            with stats.stage("small"):
+                data = bytearray(1 << 10)
+            del data
+        finally:
+            tracemalloc.stop()
+        self.assertGreaterEqual(stats.stages["large"].peak_bytes, 4 << 20)
+        self.assertLess(stats.stages["small"].peak_bytes, 4 << 20)